@@ -0,0 +1,165 @@
+"""
+SQLite concurrency benchmark: default journal vs the tuned connection pragmas.
+
+Runs the same mixed workload twice against a throwaway database file —
+writers that insert and re-status library entries in short transactions
+(like /gaps/analyze and /sync-status) while readers page through the
+library — once with SQLite's defaults and once with database.sqlite_pragmas().
+Every worker is its own process, so the lock contention is the same as
+between uvicorn workers sharing one database file.
+
+    cd backend && python -m benchmarks.db_concurrency [--seconds 5] [--writers 4] [--readers 8]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from database import AutomationLibraryEntry, Base, User, build_engine
+
+SEED_ENTRIES = 20000
+WRITE_BATCH = 50
+
+
+async def _seed(Session) -> int:
+    async with Session() as db:
+        user = User(github_id="bench", username="bench", github_access_token="x")
+        db.add(user)
+        await db.flush()
+        db.add_all([
+            AutomationLibraryEntry(
+                user_id=user.id,
+                jira_ticket_key=f"BENCH-{i}",
+                jira_ticket_url=f"https://bench.atlassian.net/browse/BENCH-{i}",
+                title=f"Entry {i}",
+                manual_description="step",
+                generated_code="pass",
+                jira_status="To Do",
+            )
+            for i in range(SEED_ENTRIES)
+        ])
+        await db.commit()
+        return user.id
+
+
+async def _writer(Session, user_id: int, deadline: float, worker: int) -> dict:
+    counts = {"ok": 0, "locked": 0}
+    n = 0
+    while time.perf_counter() < deadline:
+        try:
+            async with Session() as db:
+                await db.execute(insert(AutomationLibraryEntry), [
+                    {
+                        "user_id": user_id,
+                        "jira_ticket_key": f"W{worker}-{n}-{i}",
+                        "jira_ticket_url": "https://bench.atlassian.net/browse/W",
+                        "title": "written",
+                        "manual_description": "step",
+                        "generated_code": "pass",
+                        "jira_status": "To Do",
+                    }
+                    for i in range(WRITE_BATCH)
+                ])
+                lo = (n * WRITE_BATCH) % SEED_ENTRIES
+                await db.execute(
+                    update(AutomationLibraryEntry)
+                    .where(AutomationLibraryEntry.id.between(lo + 1, lo + WRITE_BATCH))
+                    .values(jira_status="In Progress" if n % 2 else "Done")
+                )
+                await db.commit()
+            counts["ok"] += 1
+        except OperationalError:
+            counts["locked"] += 1
+        n += 1
+    return counts
+
+
+async def _reader(Session, user_id: int, deadline: float, worker: int) -> dict:
+    counts = {"ok": 0, "locked": 0}
+    while time.perf_counter() < deadline:
+        try:
+            async with Session() as db:
+                await db.execute(
+                    select(AutomationLibraryEntry.id, AutomationLibraryEntry.jira_status)
+                    .where(AutomationLibraryEntry.user_id == user_id)
+                    .order_by(AutomationLibraryEntry.created_at.desc())
+                    .limit(100)
+                )
+                # status breakdown scans the table, holding a read lock meanwhile
+                await db.execute(
+                    select(AutomationLibraryEntry.jira_status, func.count())
+                    .group_by(AutomationLibraryEntry.jira_status)
+                )
+            counts["ok"] += 1
+        except OperationalError:
+            counts["locked"] += 1
+    return counts
+
+
+async def _work(path: str, tune_sqlite: bool, role: str, user_id: int, seconds: float, worker: int) -> dict:
+    engine = build_engine(f"sqlite:///{path}", tune_sqlite=tune_sqlite)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        loop = _writer if role == "write" else _reader
+        return await loop(Session, user_id, time.perf_counter() + seconds, worker)
+    finally:
+        await engine.dispose()
+
+
+def _process(args) -> tuple:
+    role = args[2]
+    return role, asyncio.run(_work(*args))
+
+
+async def _prepare(path: str, tune_sqlite: bool) -> int:
+    engine = build_engine(f"sqlite:///{path}", tune_sqlite=tune_sqlite)
+    Session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return await _seed(Session)
+    finally:
+        await engine.dispose()
+
+
+def run(tune_sqlite: bool, seconds: float, writers: int, readers: int) -> dict:
+    """One process per worker, as with several uvicorn workers sharing the file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        user_id = asyncio.run(_prepare(path, tune_sqlite))
+        jobs = [(path, tune_sqlite, "write", user_id, seconds, w) for w in range(writers)]
+        jobs += [(path, tune_sqlite, "read", user_id, seconds, r) for r in range(readers)]
+        totals = {"writes": 0, "reads": 0, "write_errors": 0, "read_errors": 0}
+        with multiprocessing.Pool(len(jobs)) as pool:
+            for role, counts in pool.map(_process, jobs):
+                key = "writes" if role == "write" else "reads"
+                totals[key] += counts["ok"]
+                totals[key[:-1] + "_errors"] += counts["locked"]
+        return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{args.writers} writers / {args.readers} readers, {args.seconds:g}s per run")
+    for label, tune in (("default journal", False), ("WAL + pragmas", True)):
+        c = run(tune, args.seconds, args.writers, args.readers)
+        print(
+            f"{label:>16}: {c['writes'] / args.seconds:8.1f} write txn/s "
+            f"{c['reads'] / args.seconds:8.1f} reads/s  "
+            f"locked: {c['write_errors']} writes, {c['read_errors']} reads"
+        )
+
+
+if __name__ == "__main__":
+    main()
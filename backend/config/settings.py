@@ -20,11 +20,39 @@ class Settings:
 	GITHUB_CLIENT_SECRET = os.getenv("GITHUB_CLIENT_SECRET")
 	# Accept both 3000 and 3001
 	GITHUB_REDIRECT_URI = os.getenv("GITHUB_REDIRECT_URI", "http://localhost:3000/auth/callback")
+	# Max bytes read from a single repository file (prompts only use the head of a file)
+	GITHUB_CONTENT_MAX_BYTES = int(os.getenv("GITHUB_CONTENT_MAX_BYTES", "65536"))
+	# Max bytes shown by the file preview endpoint (reported as truncated beyond that)
+	GITHUB_PREVIEW_MAX_BYTES = int(os.getenv("GITHUB_PREVIEW_MAX_BYTES", "1048576"))
+	# Adaptive GitHub request window per token (grows on success, halves on rate limits)
+	GITHUB_INITIAL_CONCURRENCY = int(os.getenv("GITHUB_INITIAL_CONCURRENCY", "8"))
+	GITHUB_MAX_CONCURRENCY = int(os.getenv("GITHUB_MAX_CONCURRENCY", "32"))
+	# Repository list cache: fresh for TTL seconds, then served stale (and refreshed) up to MAX_STALE
+	GITHUB_REPO_CACHE_TTL = int(os.getenv("GITHUB_REPO_CACHE_TTL", "60"))
+	GITHUB_REPO_CACHE_MAX_STALE = int(os.getenv("GITHUB_REPO_CACHE_MAX_STALE", "900"))
 
 	# Jira OAuth 2.0 (3LO)
 	JIRA_CLIENT_ID = os.getenv("JIRA_CLIENT_ID")
 	JIRA_CLIENT_SECRET = os.getenv("JIRA_CLIENT_SECRET")
 	JIRA_REDIRECT_URI = os.getenv("JIRA_REDIRECT_URI", "http://localhost:8000/api/jira/callback")
+	# Refresh OAuth access tokens in the background once they are this close to expiry
+	JIRA_TOKEN_REFRESH_MARGIN_SECONDS = int(os.getenv("JIRA_TOKEN_REFRESH_MARGIN_SECONDS", "300"))
+	# Seconds a project's grouped issue board is served from cache
+	JIRA_BOARD_CACHE_TTL = int(os.getenv("JIRA_BOARD_CACHE_TTL", "30"))
+	# Shared secret expected as ?secret= on /api/jira/webhook (unset = accept any caller)
+	JIRA_WEBHOOK_SECRET = os.getenv("JIRA_WEBHOOK_SECRET")
+	# Full re-fetch of a project's issues (to drop deleted ones) at most this often
+	JIRA_RECONCILE_INTERVAL_HOURS = int(os.getenv("JIRA_RECONCILE_INTERVAL_HOURS", "24"))
+	# Requests in flight per Jira instance, and retry policy for 429/5xx responses
+	JIRA_MAX_CONCURRENCY = int(os.getenv("JIRA_MAX_CONCURRENCY", "10"))
+	JIRA_MAX_RETRIES = int(os.getenv("JIRA_MAX_RETRIES", "4"))
+	JIRA_BACKOFF_BASE_SECONDS = float(os.getenv("JIRA_BACKOFF_BASE_SECONDS", "0.5"))
+	JIRA_BACKOFF_MAX_SECONDS = float(os.getenv("JIRA_BACKOFF_MAX_SECONDS", "30"))
+	# Stop calling an instance for RESET seconds after THRESHOLD consecutive failures
+	JIRA_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("JIRA_CIRCUIT_FAILURE_THRESHOLD", "5"))
+	JIRA_CIRCUIT_RESET_SECONDS = float(os.getenv("JIRA_CIRCUIT_RESET_SECONDS", "30"))
+	# Jira instances that keep a pooled client; the least recently used idle one is closed beyond that
+	JIRA_MAX_POOLED_INSTANCES = int(os.getenv("JIRA_MAX_POOLED_INSTANCES", "64"))
 
 	# Frontend base URL — used for post-OAuth redirects
 	FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:3000")
@@ -33,9 +61,20 @@ class Settings:
 	JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this")
 	JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 	JWT_ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "43200"))
+	# Seconds a resolved user is served from the in-process auth cache (bounds staleness across workers)
+	AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
 
 	# Database
 	DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./testmate.db")
+	# SQLite connection pragmas (WAL lets readers run alongside the single writer)
+	SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+	SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+	SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+	# Connection pool for server databases (Postgres); ignored for SQLite
+	DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+	DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+	DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+	DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
 
 	# CORS Configuration - Accept BOTH ports
 	CORS_ORIGINS = [
@@ -2,20 +2,76 @@
 Database configuration and models
 """
 import enum
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Enum as SAEnum
+from typing import Iterable, List, Sequence
+from sqlalchemy import event, Column, Integer, String, DateTime, Boolean, Text, LargeBinary, ForeignKey, Index, UniqueConstraint, Enum as SAEnum
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
 from datetime import datetime
 from config.settings import settings
 
+# Async drivers for the plain URLs used in .env files
+ASYNC_DRIVERS = {
+	"sqlite": "sqlite+aiosqlite",
+	"postgresql": "postgresql+asyncpg",
+	"postgres": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+	"""Map sqlite:// / postgresql:// URLs onto their async drivers (explicit drivers are kept)."""
+	scheme, sep, rest = url.partition("://")
+	return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def engine_options(url: str) -> dict:
+	"""create_async_engine kwargs for *url*: thread sharing for SQLite, a sized pre-pinged pool otherwise."""
+	if url.startswith("sqlite"):
+		return {"connect_args": {"check_same_thread": False}}
+	return {
+		"pool_size": settings.DB_POOL_SIZE,
+		"max_overflow": settings.DB_MAX_OVERFLOW,
+		"pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+		"pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+		"pool_pre_ping": True,
+	}
+
+
+def sqlite_pragmas() -> list:
+	"""PRAGMAs run on every new SQLite connection."""
+	return [
+		"PRAGMA journal_mode=WAL",
+		"PRAGMA synchronous=NORMAL",  # durable in WAL mode except on power loss
+		f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+		f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+		f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",  # negative = KiB, not pages
+	]
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+	cursor = dbapi_connection.cursor()
+	try:
+		for pragma in sqlite_pragmas():
+			cursor.execute(pragma)
+	finally:
+		cursor.close()
+
+
+def build_engine(url: str, tune_sqlite: bool = True) -> AsyncEngine:
+	"""Async engine for *url*; SQLite connections get sqlite_pragmas() unless tune_sqlite is False."""
+	async_engine = create_async_engine(async_database_url(url), **engine_options(url))
+	if tune_sqlite and url.startswith("sqlite"):
+		event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+	return async_engine
+
+
 # Create engine
-engine = create_engine(
-	settings.DATABASE_URL,
-	connect_args={"check_same_thread": False}  # Needed for SQLite
-)
+engine = build_engine(settings.DATABASE_URL)
 
-# Create session
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session — objects stay readable after commit (no implicit reload in async code)
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -42,6 +98,7 @@ class User(Base):
 	jira_access_token = Column(String, nullable=True)
 	jira_refresh_token = Column(String, nullable=True)
 	jira_cloud_id = Column(String, nullable=True)
+	jira_token_expires_at = Column(DateTime, nullable=True)  # UTC expiry of jira_access_token
 
 class GapTypeEnum(enum.Enum):
 	not_started    = "not_started"
@@ -61,34 +118,98 @@ class JiraIntegration(Base):
 	project_key     = Column(String, nullable=True)
 	space_cloud_id  = Column(String, nullable=True)
 	created_at   = Column(DateTime, default=datetime.utcnow)
+	# Incremental task sync: newest Jira `updated` seen ("yyyy-MM-dd HH:mm", Jira user's timezone)
+	sync_watermark     = Column(String, nullable=True)
+	last_reconciled_at = Column(DateTime, nullable=True)
 
 
 class JiraTask(Base):
 	__tablename__ = "jira_tasks"
+	__table_args__ = (
+		UniqueConstraint("jira_integration_id", "task_key", name="uq_jira_tasks_integration_key"),
+	)
 
 	id                  = Column(Integer, primary_key=True, index=True)
 	jira_integration_id = Column(Integer, ForeignKey("jira_integrations.id"), nullable=False, index=True)
 	task_key            = Column(String, nullable=False, index=True)
 	summary             = Column(String, nullable=False)
 	status              = Column(String, nullable=True)
+	status_category     = Column(String, nullable=True)
 	acceptance_criteria = Column(Text, nullable=True)
+	acceptance_criteria_list = Column(Text, nullable=True)  # JSON list of individual criteria
+	description_hash    = Column(String, nullable=True)     # sha256 of the description ADF the criteria came from
+	jira_updated        = Column(DateTime, nullable=True)   # issue's `updated` in Jira (UTC)
 	updated_at          = Column(DateTime, default=datetime.utcnow)
 
 
 class ImplementationGap(Base):
 	__tablename__ = "implementation_gaps"
+	__table_args__ = (
+		UniqueConstraint("jira_task_id", name="uq_implementation_gaps_jira_task_id"),  # one gap per task
+	)
 
 	id              = Column(Integer, primary_key=True, index=True)
 	jira_task_id    = Column(Integer, ForeignKey("jira_tasks.id"), nullable=False, index=True)
 	gap_type        = Column(SAEnum(GapTypeEnum), nullable=False)
-	affected_files  = Column(Text, nullable=True)
+	affected_files  = Column(Text, nullable=True)  # legacy JSON; files now live in gap_affected_files
 	generated_tests = Column(Text, nullable=True)
 	created_at      = Column(DateTime, default=datetime.utcnow)
 
 
+class RepoFile(Base):
+	"""A file path in an analyzed repository, stored once and referenced by gaps."""
+	__tablename__ = "repo_files"
+	__table_args__ = (
+		# Also serves path-prefix range scans within a repository
+		UniqueConstraint("repo_owner", "repo_name", "path", name="uq_repo_files_repo_path"),
+	)
+
+	id         = Column(Integer, primary_key=True)
+	repo_owner = Column(String, nullable=False)
+	repo_name  = Column(String, nullable=False)
+	path       = Column(String, nullable=False)
+
+
+class GapAffectedFile(Base):
+	"""Source or test file a gap was matched to."""
+	__tablename__ = "gap_affected_files"
+	__table_args__ = (
+		Index("ix_gap_affected_files_file_gap", "file_id", "gap_id"),  # file → gaps
+	)
+
+	gap_id  = Column(Integer, ForeignKey("implementation_gaps.id"), primary_key=True)
+	file_id = Column(Integer, ForeignKey("repo_files.id"), primary_key=True)
+	role    = Column(String, primary_key=True)  # "source" | "test"
+
+
+class GapAnalysisRun(Base):
+	"""One /gaps/analyze run: stats as columns (for SQL trends), per-task results compressed."""
+	__tablename__ = "gap_analysis_runs"
+	__table_args__ = (
+		Index("ix_gap_analysis_runs_integration_repo_created", "jira_integration_id", "repo_name", "created_at"),
+	)
+
+	id                  = Column(Integer, primary_key=True, index=True)
+	jira_integration_id = Column(Integer, ForeignKey("jira_integrations.id"), nullable=False)
+	repo_owner          = Column(String, nullable=False)
+	repo_name           = Column(String, nullable=False)
+	total               = Column(Integer, nullable=False, default=0)
+	not_started         = Column(Integer, nullable=False, default=0)
+	untested            = Column(Integer, nullable=False, default=0)
+	complete            = Column(Integer, nullable=False, default=0)
+	non_code_task       = Column(Integer, nullable=False, default=0)
+	results             = Column(LargeBinary, nullable=False)  # zlib-compressed JSON, see gap_history_service
+	created_at          = Column(DateTime, default=datetime.utcnow)
+
+
 class AutomationLibraryEntry(Base):
 	"""Tracks Jira tickets created from Level 1 code generation."""
 	__tablename__ = "automation_library_entries"
+	__table_args__ = (
+		# Keyset pages of the library, newest first (all entries / one status)
+		Index("ix_automation_library_entries_user_created_id", "user_id", "created_at", "id"),
+		Index("ix_automation_library_entries_user_status_created_id", "user_id", "jira_status", "created_at", "id"),
+	)
 
 	id                  = Column(Integer, primary_key=True, index=True)
 	user_id             = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -103,14 +224,154 @@ class AutomationLibraryEntry(Base):
 	updated_at          = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
-# Create all tables
-def init_db():
-	Base.metadata.create_all(bind=engine)
+# ── Full-text search ─────────────────────────────────────────────────────────
+# SQLite: an external-content FTS5 table per searchable table, kept in sync
+# by triggers. Postgres: a generated, weighted tsvector column with a GIN
+# index. Created with the tables (create_all) and by migration 0004.
+
+# table -> (FTS5 table, searchable columns in weight order)
+FTS_INDEXES = {
+	"automation_library_entries": ("automation_library_fts", ["title", "manual_description", "generated_code"]),
+	"jira_tasks":                 ("jira_tasks_fts",         ["summary", "acceptance_criteria"]),
+}
+TSVECTOR_COLUMN = "search_vector"
+_TSVECTOR_WEIGHTS = "ABCD"
+
+
+def fts_create_statements(table: str, dialect: str) -> List[str]:
+	"""Idempotent DDL creating the full-text index for *table* on *dialect*."""
+	fts, columns = FTS_INDEXES[table]
+	if dialect == "postgresql":
+		vector = " || ".join(
+			f"setweight(to_tsvector('english', coalesce({col}, '')), '{_TSVECTOR_WEIGHTS[i]}')"
+			for i, col in enumerate(columns)
+		)
+		return [
+			f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {TSVECTOR_COLUMN} tsvector "
+			f"GENERATED ALWAYS AS ({vector}) STORED",
+			f"CREATE INDEX IF NOT EXISTS ix_{table}_{TSVECTOR_COLUMN} ON {table} USING gin ({TSVECTOR_COLUMN})",
+		]
+	if dialect != "sqlite":
+		return []
+	cols     = ", ".join(columns)
+	new_cols = ", ".join(f"new.{c}" for c in columns)
+	old_cols = ", ".join(f"old.{c}" for c in columns)
+	return [
+		f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+		f"{cols}, content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+		f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+		f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+		f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+		f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END",
+		# Only edits of indexed columns touch the index (status syncs don't)
+		f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+		f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+		f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+	]
+
+
+def _create_fts(target, connection, **kw):
+	for stmt in fts_create_statements(target.name, connection.dialect.name):
+		connection.exec_driver_sql(stmt)
+
+
+def _drop_fts(target, connection, **kw):
+	# The triggers go with the table; the FTS5 table has to be dropped explicitly
+	if connection.dialect.name == "sqlite":
+		connection.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_INDEXES[target.name][0]}")
+
+
+for _table in FTS_INDEXES:
+	event.listen(Base.metadata.tables[_table], "after_create", _create_fts)
+	event.listen(Base.metadata.tables[_table], "before_drop", _drop_fts)
+
+
+# Rows per INSERT ... ON CONFLICT statement (well under SQLite's bound-parameter limit)
+UPSERT_CHUNK_SIZE = 500
+
+_DIALECT_INSERTS = {"sqlite": sqlite_insert, "postgresql": pg_insert}
+
+
+async def bulk_upsert(
+	db: AsyncSession,
+	model,
+	rows: Sequence[dict],
+	conflict_columns: Iterable[str],
+	update_columns: Iterable[str],
+	returning: bool = False,
+	chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> List:
+	"""
+	INSERT ... ON CONFLICT (conflict_columns) DO UPDATE SET update_columns for
+	*rows* (dicts with the same keys), one statement per chunk. With
+	returning=True the inserted/updated ORM objects are returned, refreshed
+	in the session's identity map; their order is not guaranteed.
+	"""
+	insert = _DIALECT_INSERTS[db.get_bind().dialect.name]
+	conflict_columns = list(conflict_columns)
+	update_columns   = list(update_columns)
+	results: List = []
+	for start in range(0, len(rows), chunk_size):
+		stmt = insert(model).values(list(rows[start:start + chunk_size]))
+		stmt = stmt.on_conflict_do_update(
+			index_elements=conflict_columns,
+			set_={col: stmt.excluded[col] for col in update_columns},
+		)
+		if returning:
+			results.extend(await db.scalars(
+				stmt.returning(model),
+				execution_options={"populate_existing": True},
+			))
+		else:
+			await db.execute(stmt)
+	return results
+
+
+# Session.info flag: the open transaction has written something (flushes or
+# ORM-executed INSERT/UPDATE/DELETE), so it is not safe to end it early
+WROTE_IN_TRANSACTION = "wrote_in_transaction"
+
+
+@event.listens_for(Session, "after_flush")
+def _flush_wrote(session, flush_context):
+	session.info[WROTE_IN_TRANSACTION] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _statement_writes(orm_execute_state):
+	if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+		orm_execute_state.session.info[WROTE_IN_TRANSACTION] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _transaction_ended(session):
+	session.info.pop(WROTE_IN_TRANSACTION, None)
+
+
+async def release_connection(db: AsyncSession) -> None:
+	"""
+	End a read-only transaction so its connection goes back to the pool
+	before slow non-database work (Jira/GitHub calls, LLM prompts).
+
+	Loaded objects stay usable (expire_on_commit=False); the next query
+	checks a connection out again. Transactions that have written anything
+	(pending, flushed or executed changes) are left alone — those are
+	committed by the handler that made them.
+	"""
+	if not db.in_transaction() or db.new or db.dirty or db.deleted:
+		return
+	if db.sync_session.info.get(WROTE_IN_TRANSACTION):
+		return
+	await db.commit()
+
 
 # Dependency to get DB session
-def get_db():
-	db = SessionLocal()
-	try:
-		yield db
-	finally:
-		db.close()
\ No newline at end of file
+async def get_db():
+	"""
+	Per-request session. It is already lazy: no connection is checked out
+	until the first query, and each commit returns it to the pool, so
+	handlers that never touch the database cost no connection.
+	"""
+	async with SessionLocal() as db:
+		yield db
\ No newline at end of file
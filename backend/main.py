@@ -1,20 +1,41 @@
 """
 TestMate API - Main Application
 """
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from config.settings import settings
 from routes import level0, level1, production, auth, production_v2, jira, level1_jira
-from database import init_db
+from database import engine
+from migrations import pending_migrations
 from services.groq_service import groq_service
-# Initialize database
-init_db()
+from services.jira_service import jira_service, jira_oauth_service
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema changes are applied on deploy (`python -m migrations`), not here
+    pending = await pending_migrations(engine)
+    if pending:
+        logger.warning(
+            "Database has %d unapplied migration(s) (%s) — run `python -m migrations`",
+            len(pending), ", ".join(f"{m.version:04d}_{m.name}" for m in pending),
+        )
+    yield
+    # Close pooled outbound HTTP clients
+    await jira_service.aclose()
+    await jira_oauth_service.aclose()
+    # Close pooled DB connections (aiosqlite keeps a worker thread per connection)
+    await engine.dispose()
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
-    description="AI-Assisted Testing Framework for learning and automation"
+    description="AI-Assisted Testing Framework for learning and automation",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -0,0 +1,92 @@
+"""
+Versioned schema migrations.
+
+Every module in migrations/versions named v<NNNN>_<name>.py is one
+migration: it defines upgrade(conn), which receives a synchronous
+SQLAlchemy Connection. Applied versions are recorded in the
+schema_migrations table, and pending ones run in version order, each in
+its own transaction.
+
+Migrations are applied on deploy, never on app startup:
+
+    cd backend && python -m migrations
+
+SQLite commits most DDL immediately, so a migration that fails halfway
+can leave part of its changes behind. Write upgrade() so that it can be
+re-run (the helpers in migrations.ops skip work that is already done).
+"""
+import importlib
+import logging
+import pkgutil
+import re
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Set
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from migrations import versions
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLE = "schema_migrations"
+_MODULE_NAME  = re.compile(r"^v(\d{4})_(\w+)$")
+
+
+class Migration(NamedTuple):
+    version: int
+    name:    str
+    upgrade: Callable[[Connection], None]
+
+
+def discover() -> List[Migration]:
+    """All migrations in migrations/versions, oldest first."""
+    found: List[Migration] = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        match = _MODULE_NAME.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        found.append(Migration(int(match.group(1)), match.group(2), module.upgrade))
+    found.sort(key=lambda m: m.version)
+    numbers = [m.version for m in found]
+    if len(numbers) != len(set(numbers)):
+        raise RuntimeError(f"Duplicate migration versions in {versions.__name__}: {numbers}")
+    return found
+
+
+def _applied_versions(conn: Connection) -> Set[int]:
+    if not inspect(conn).has_table(VERSION_TABLE):
+        return set()
+    return set(conn.scalars(text(f"SELECT version FROM {VERSION_TABLE}")))
+
+
+async def pending_migrations(engine: AsyncEngine) -> List[Migration]:
+    """Migrations not yet recorded in schema_migrations."""
+    async with engine.connect() as conn:
+        applied = await conn.run_sync(_applied_versions)
+    return [m for m in discover() if m.version not in applied]
+
+
+async def upgrade(engine: AsyncEngine) -> List[Migration]:
+    """Apply every pending migration in order; returns the ones applied."""
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+            " version INTEGER PRIMARY KEY,"
+            " name VARCHAR NOT NULL,"
+            " applied_at TIMESTAMP NOT NULL)"
+        ))
+
+    applied: List[Migration] = []
+    for migration in await pending_migrations(engine):
+        async with engine.begin() as conn:
+            await conn.run_sync(migration.upgrade)
+            await conn.execute(
+                text(f"INSERT INTO {VERSION_TABLE} (version, name, applied_at) VALUES (:v, :n, :at)"),
+                {"v": migration.version, "n": migration.name, "at": datetime.utcnow()},
+            )
+        logger.info("Applied migration %04d_%s", migration.version, migration.name)
+        applied.append(migration)
+    return applied
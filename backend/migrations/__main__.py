@@ -0,0 +1,27 @@
+"""
+Apply pending schema migrations to DATABASE_URL:
+
+    cd backend && python -m migrations
+"""
+import asyncio
+import logging
+
+from database import engine
+from migrations import upgrade
+
+
+async def main() -> None:
+    try:
+        applied = await upgrade(engine)
+    finally:
+        await engine.dispose()
+    if applied:
+        for m in applied:
+            print(f"Applied {m.version:04d}_{m.name}")
+    else:
+        print("Database schema is up to date.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""
+Re-runnable schema operations for migrations (SQLite and Postgres).
+"""
+from typing import Sequence
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+
+def add_column(conn: Connection, table: str, column: str, type_sql: str) -> None:
+    """ALTER TABLE ... ADD COLUMN unless the column exists (or the table doesn't)."""
+    inspector = inspect(conn)
+    if not inspector.has_table(table):
+        return
+    if column in {c["name"] for c in inspector.get_columns(table)}:
+        return
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {type_sql}"))
+
+
+def has_index_on(conn: Connection, table: str, columns: Sequence[str], unique: bool = False) -> bool:
+    """True if an index (or unique constraint, when unique=True) already covers exactly *columns*."""
+    inspector = inspect(conn)
+    columns = list(columns)
+    for index in inspector.get_indexes(table):
+        if index["column_names"] == columns and (index["unique"] or not unique):
+            return True
+    if unique:
+        return any(c["column_names"] == columns for c in inspector.get_unique_constraints(table))
+    return False
+
+
+def create_index(
+    conn: Connection, name: str, table: str, columns: Sequence[str], unique: bool = False
+) -> None:
+    """CREATE [UNIQUE] INDEX unless an equivalent index already exists."""
+    if has_index_on(conn, table, columns, unique):
+        return
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    conn.execute(text(f"CREATE {kind} {name} ON {table} ({', '.join(columns)})"))
+
+
+def delete_duplicates(conn: Connection, table: str, columns: Sequence[str]) -> None:
+    """Keep only the newest row (highest id) for each combination of *columns*."""
+    conn.execute(text(
+        f"DELETE FROM {table} WHERE id NOT IN ("
+        f" SELECT MAX(id) FROM {table} GROUP BY {', '.join(columns)})"
+    ))
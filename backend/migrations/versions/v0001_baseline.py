@@ -0,0 +1,114 @@
+"""
+Baseline: the tables as they were when migrations were introduced, plus the
+columns run_migration.py used to ALTER into older databases.
+
+The schema is spelled out here rather than taken from database.py, so this
+migration keeps creating the same tables as the models move on. The
+unique keys and composite indexes of that time come from 0002.
+"""
+from sqlalchemy import (
+    Boolean, Column, DateTime, Enum, ForeignKey, Integer, MetaData, String, Table, Text,
+)
+from sqlalchemy.engine import Connection
+
+from migrations.ops import add_column
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("github_id", String, unique=True, index=True, nullable=False),
+    Column("username", String, nullable=False),
+    Column("email", String),
+    Column("avatar_url", String),
+    Column("github_access_token", String, nullable=False),
+    Column("created_at", DateTime),
+    Column("last_login", DateTime),
+    Column("is_active", Boolean),
+    Column("level0_completed", Boolean),
+    Column("level1_completed", Boolean),
+    Column("jira_access_token", String),
+    Column("jira_refresh_token", String),
+    Column("jira_cloud_id", String),
+    Column("jira_token_expires_at", DateTime),
+)
+
+Table(
+    "jira_integrations", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False, index=True),
+    Column("instance_url", String, nullable=False),
+    Column("email", String, nullable=False),
+    Column("api_token", String, nullable=False),
+    Column("project_key", String),
+    Column("space_cloud_id", String),
+    Column("created_at", DateTime),
+    Column("sync_watermark", String),
+    Column("last_reconciled_at", DateTime),
+)
+
+Table(
+    "jira_tasks", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("jira_integration_id", Integer, ForeignKey("jira_integrations.id"), nullable=False, index=True),
+    Column("task_key", String, nullable=False, index=True),
+    Column("summary", String, nullable=False),
+    Column("status", String),
+    Column("status_category", String),
+    Column("acceptance_criteria", Text),
+    Column("acceptance_criteria_list", Text),
+    Column("description_hash", String),
+    Column("jira_updated", DateTime),
+    Column("updated_at", DateTime),
+)
+
+Table(
+    "implementation_gaps", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("jira_task_id", Integer, ForeignKey("jira_tasks.id"), nullable=False, index=True),
+    Column(
+        "gap_type",
+        Enum("not_started", "untested", "complete", "non_code_task", name="gaptypeenum"),
+        nullable=False,
+    ),
+    Column("affected_files", Text),
+    Column("generated_tests", Text),
+    Column("created_at", DateTime),
+)
+
+Table(
+    "automation_library_entries", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("user_id", Integer, ForeignKey("users.id"), nullable=False, index=True),
+    Column("jira_integration_id", Integer, ForeignKey("jira_integrations.id")),
+    Column("jira_ticket_key", String, nullable=False),
+    Column("jira_ticket_url", String, nullable=False),
+    Column("title", String, nullable=False),
+    Column("manual_description", Text),
+    Column("generated_code", Text),
+    Column("jira_status", String),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+)
+
+LEGACY_COLUMNS = [
+    ("users",             "jira_access_token",        "TEXT"),
+    ("users",             "jira_refresh_token",       "TEXT"),
+    ("users",             "jira_cloud_id",            "TEXT"),
+    ("users",             "jira_token_expires_at",    "DATETIME"),
+    ("jira_integrations", "space_cloud_id",           "TEXT"),
+    ("jira_integrations", "sync_watermark",           "TEXT"),
+    ("jira_integrations", "last_reconciled_at",       "DATETIME"),
+    ("jira_tasks",        "status_category",          "TEXT"),
+    ("jira_tasks",        "jira_updated",             "DATETIME"),
+    ("jira_tasks",        "acceptance_criteria_list", "TEXT"),
+    ("jira_tasks",        "description_hash",         "TEXT"),
+]
+
+
+def upgrade(conn: Connection) -> None:
+    # Only creates the tables that are missing
+    metadata.create_all(conn)
+    for table, column, type_sql in LEGACY_COLUMNS:
+        add_column(conn, table, column, type_sql)
@@ -0,0 +1,39 @@
+"""
+Indexes for the hot queries, and the unique keys the bulk upserts rely on:
+- jira_tasks (jira_integration_id, task_key): per-task lookups and upserts
+- implementation_gaps (jira_task_id): one gap per task
+- automation_library_entries (user_id, created_at): newest-first library
+
+Older databases may hold duplicate tasks or gaps; the newest row is kept.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from migrations.ops import create_index, delete_duplicates, has_index_on
+
+
+def upgrade(conn: Connection) -> None:
+    if not has_index_on(conn, "jira_tasks", ["jira_integration_id", "task_key"], unique=True):
+        # Gaps of the duplicate tasks go first (foreign key)
+        conn.execute(text(
+            "DELETE FROM implementation_gaps WHERE jira_task_id IN ("
+            " SELECT id FROM jira_tasks WHERE id NOT IN ("
+            "  SELECT MAX(id) FROM jira_tasks GROUP BY jira_integration_id, task_key))"
+        ))
+        delete_duplicates(conn, "jira_tasks", ["jira_integration_id", "task_key"])
+        create_index(
+            conn, "uq_jira_tasks_integration_key", "jira_tasks",
+            ["jira_integration_id", "task_key"], unique=True,
+        )
+
+    if not has_index_on(conn, "implementation_gaps", ["jira_task_id"], unique=True):
+        delete_duplicates(conn, "implementation_gaps", ["jira_task_id"])
+        create_index(
+            conn, "uq_implementation_gaps_jira_task_id", "implementation_gaps",
+            ["jira_task_id"], unique=True,
+        )
+
+    create_index(
+        conn, "ix_automation_library_entries_user_created", "automation_library_entries",
+        ["user_id", "created_at"],
+    )
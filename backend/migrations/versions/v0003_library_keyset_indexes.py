@@ -0,0 +1,22 @@
+"""
+Library pages are read by keyset on (created_at, id), optionally for one
+status. The id tie-breaker is part of the indexes so Postgres can walk them
+in order too (SQLite appends the rowid implicitly). They replace the
+(user_id, created_at) index from 0002.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from migrations.ops import create_index
+
+
+def upgrade(conn: Connection) -> None:
+    create_index(
+        conn, "ix_automation_library_entries_user_created_id", "automation_library_entries",
+        ["user_id", "created_at", "id"],
+    )
+    create_index(
+        conn, "ix_automation_library_entries_user_status_created_id", "automation_library_entries",
+        ["user_id", "jira_status", "created_at", "id"],
+    )
+    conn.execute(text("DROP INDEX IF EXISTS ix_automation_library_entries_user_created"))
@@ -0,0 +1,60 @@
+"""
+Full-text indexes over the automation library and Jira tasks, backfilled
+from the existing rows: external-content FTS5 tables kept in sync by
+triggers on SQLite, a generated weighted tsvector column with a GIN index
+on Postgres. database.fts_create_statements creates the same objects for
+fresh model-built schemas; the DDL is repeated here so this migration does
+not change when that code does.
+"""
+from typing import List
+
+from sqlalchemy.engine import Connection
+
+# table -> (FTS5 table, searchable columns in weight order)
+FTS_INDEXES = {
+    "automation_library_entries": ("automation_library_fts", ["title", "manual_description", "generated_code"]),
+    "jira_tasks":                 ("jira_tasks_fts",         ["summary", "acceptance_criteria"]),
+}
+WEIGHTS = "ABCD"
+
+
+def _postgres_statements(table: str, columns: List[str]) -> List[str]:
+    vector = " || ".join(
+        f"setweight(to_tsvector('english', coalesce({col}, '')), '{WEIGHTS[i]}')"
+        for i, col in enumerate(columns)
+    )
+    return [
+        f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({vector}) STORED",
+        f"CREATE INDEX IF NOT EXISTS ix_{table}_search_vector ON {table} USING gin (search_vector)",
+    ]
+
+
+def _sqlite_statements(table: str, fts: str, columns: List[str]) -> List[str]:
+    cols     = ", ".join(columns)
+    new_cols = ", ".join(f"new.{c}" for c in columns)
+    old_cols = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+    ]
+
+
+def upgrade(conn: Connection) -> None:
+    dialect = conn.dialect.name
+    for table, (fts, columns) in FTS_INDEXES.items():
+        if dialect == "postgresql":
+            # Postgres fills the generated column itself
+            for stmt in _postgres_statements(table, columns):
+                conn.exec_driver_sql(stmt)
+        elif dialect == "sqlite":
+            for stmt in _sqlite_statements(table, fts, columns):
+                conn.exec_driver_sql(stmt)
+            conn.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
@@ -0,0 +1,31 @@
+"""
+gap_analysis_runs: one row per /gaps/analyze run — stats as columns, the
+per-task results as a zlib-compressed JSON blob.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, LargeBinary, MetaData, String, Table
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+# Referenced only; never created here
+Table("jira_integrations", metadata, Column("id", Integer, primary_key=True))
+
+gap_analysis_runs = Table(
+    "gap_analysis_runs", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("jira_integration_id", Integer, ForeignKey("jira_integrations.id"), nullable=False),
+    Column("repo_owner", String, nullable=False),
+    Column("repo_name", String, nullable=False),
+    Column("total", Integer, nullable=False),
+    Column("not_started", Integer, nullable=False),
+    Column("untested", Integer, nullable=False),
+    Column("complete", Integer, nullable=False),
+    Column("non_code_task", Integer, nullable=False),
+    Column("results", LargeBinary, nullable=False),
+    Column("created_at", DateTime),
+    Index("ix_gap_analysis_runs_integration_repo_created", "jira_integration_id", "repo_name", "created_at"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    gap_analysis_runs.create(conn, checkfirst=True)
@@ -0,0 +1,35 @@
+"""
+repo_files / gap_affected_files replace the implementation_gaps.affected_files
+JSON text. Existing gaps get their links on the next analysis of their
+repository (the JSON never recorded which repository it came from); the
+old column is cleared then.
+"""
+from sqlalchemy import Column, ForeignKey, Index, Integer, MetaData, String, Table, UniqueConstraint
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+# Referenced only; never created here
+Table("implementation_gaps", metadata, Column("id", Integer, primary_key=True))
+
+repo_files = Table(
+    "repo_files", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("repo_owner", String, nullable=False),
+    Column("repo_name", String, nullable=False),
+    Column("path", String, nullable=False),
+    UniqueConstraint("repo_owner", "repo_name", "path", name="uq_repo_files_repo_path"),
+)
+
+gap_affected_files = Table(
+    "gap_affected_files", metadata,
+    Column("gap_id", Integer, ForeignKey("implementation_gaps.id"), primary_key=True),
+    Column("file_id", Integer, ForeignKey("repo_files.id"), primary_key=True),
+    Column("role", String, primary_key=True),
+    Index("ix_gap_affected_files_file_gap", "file_id", "gap_id"),
+)
+
+
+def upgrade(conn: Connection) -> None:
+    repo_files.create(conn, checkfirst=True)
+    gap_affected_files.create(conn, checkfirst=True)
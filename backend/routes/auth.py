@@ -3,7 +3,7 @@ Authentication Routes - GitHub OAuth and JWT
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
 from database import get_db, User
@@ -62,7 +62,7 @@ async def github_login(new_account: bool = False, login_hint: Optional[str] = No
 	return {"auth_url": auth_url}
 
 @router.get("/github/callback")
-async def github_callback(code: str, request: Request, db: Session = Depends(get_db)):
+async def github_callback(code: str, request: Request, db: AsyncSession = Depends(get_db)):
 	"""
 	GitHub OAuth callback - exchange code for token and create/update user
 	"""
@@ -74,7 +74,7 @@ async def github_callback(code: str, request: Request, db: Session = Depends(get
 		github_user = await auth_service.get_github_user(access_token)
 
 		# Create or update user in database
-		user = auth_service.create_or_update_user(db, github_user, access_token)
+		user = await auth_service.create_or_update_user(db, github_user, access_token)
 
 		# Create JWT token
 		jwt_token = auth_service.create_jwt_token(user.id)
@@ -105,11 +105,11 @@ async def github_callback(code: str, request: Request, db: Session = Depends(get
 		)
 
 @router.post("/verify")
-async def verify_token(token: str, db: Session = Depends(get_db)):
+async def verify_token(token: str, db: AsyncSession = Depends(get_db)):
 	"""
 	Verify JWT token and return user info
 	"""
-	user = auth_service.get_current_user(db, token)
+	user = await auth_service.get_current_user(db, token)
 
 	return UserResponse(
 		id=user.id,
@@ -121,11 +121,11 @@ async def verify_token(token: str, db: Session = Depends(get_db)):
 	)
 
 @router.get("/me")
-async def get_current_user_info(token: str, db: Session = Depends(get_db)):
+async def get_current_user_info(token: str, db: AsyncSession = Depends(get_db)):
 	"""
 	Get current authenticated user info
 	"""
-	user = auth_service.get_current_user(db, token)
+	user = await auth_service.get_current_user(db, token)
 
 	return UserResponse(
 		id=user.id,
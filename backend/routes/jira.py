@@ -1,54 +1,31 @@
 """
-Jira OAuth 2.0 (3LO) routes — connect, callback, projects, issues.
+Jira OAuth 2.0 (3LO) routes — connect, callback, projects, issues, webhook.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.settings import settings
-from database import get_db, User, JiraIntegration
+from database import get_db, JiraIntegration
 from services.auth_service import auth_service
 from services.jira_service import jira_oauth_service
 
 router = APIRouter(prefix="/api/jira", tags=["Jira"])
 
 
-def _require_jira(user: User) -> None:
-    if not user.jira_access_token or not user.jira_cloud_id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Jira account not connected. Visit /api/jira/connect first.",
-        )
-
-
-async def _with_token_refresh(user: User, db: Session, coro):
-    """
-    Await *coro*. If a 401 is raised and a refresh token exists, refresh and retry once.
-    The caller must pass an awaitable (coroutine), not a coroutine function.
-    """
-    try:
-        return await coro
-    except HTTPException as exc:
-        if exc.status_code != status.HTTP_401_UNAUTHORIZED or not user.jira_refresh_token:
-            raise
-        token_data = await jira_oauth_service.refresh_access_token(user.jira_refresh_token)
-        user.jira_access_token = token_data["access_token"]
-        if token_data.get("refresh_token"):
-            user.jira_refresh_token = token_data["refresh_token"]
-        db.commit()
-        raise  # caller must retry with new token after commit
-
-
 # ── GET /api/jira/connect ─────────────────────────────────────────────────────
 
 @router.get("/connect")
-async def jira_connect(token: str = Query(...), db: Session = Depends(get_db)):
+async def jira_connect(token: str = Query(...), db: AsyncSession = Depends(get_db)):
     """
     Redirect the authenticated user to Atlassian's OAuth consent page.
     The JWT token is threaded through via the `state` parameter so the
     callback can identify the user without a separate session store.
     """
-    auth_service.get_current_user(db, token)  # validates token before redirecting
+    await auth_service.get_current_user(db, token)  # validates token before redirecting
     url = jira_oauth_service.get_oauth_url(state=token)
     return RedirectResponse(url=url)
 
@@ -59,7 +36,7 @@ async def jira_connect(token: str = Query(...), db: Session = Depends(get_db)):
 async def jira_callback(
     code: str = Query(...),
     state: str = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Atlassian redirects here after user consent.
@@ -68,7 +45,7 @@ async def jira_callback(
     print(">>> JIRA CALLBACK HIT", flush=True)
 
     try:
-        user = auth_service.get_current_user(db, state)
+        user = await auth_service.get_current_user(db, state)
         print(f">>> JIRA CALLBACK: user id={user.id}", flush=True)
     except HTTPException as e:
         print(f">>> JIRA CALLBACK: auth failed: {e.detail}", flush=True)
@@ -86,10 +63,10 @@ async def jira_callback(
         cloud_id = await jira_oauth_service.get_cloud_id(access_token)
 
         # Persist OAuth tokens immediately so a later failure doesn't lose them
-        user.jira_access_token  = access_token
-        user.jira_refresh_token = refresh_token
-        user.jira_cloud_id      = cloud_id
-        db.commit()
+        jira_oauth_service.store_tokens(user, token_data)
+        user.jira_cloud_id = cloud_id
+        await db.commit()
+        auth_service.invalidate_user(user.id)
         print(f">>> JIRA CALLBACK: tokens saved. access={bool(access_token)} refresh={bool(refresh_token)} cloud={bool(cloud_id)}", flush=True)
 
         # Try to fetch the user's email — not critical if it fails
@@ -100,9 +77,9 @@ async def jira_callback(
         except Exception:
             pass
 
-        integration = db.query(JiraIntegration).filter(
+        integration = await db.scalar(select(JiraIntegration).where(
             JiraIntegration.user_id == user.id
-        ).first()
+        ))
         if not integration:
             integration = JiraIntegration(
                 user_id=user.id,
@@ -114,7 +91,7 @@ async def jira_callback(
         else:
             integration.api_token = access_token
             integration.email     = jira_email
-        db.commit()
+        await db.commit()
 
     except Exception as e:
         print(f">>> JIRA CALLBACK ERROR: {type(e).__name__}: {e}", flush=True)
@@ -131,23 +108,12 @@ async def jira_callback(
 # ── GET /api/jira/projects ────────────────────────────────────────────────────
 
 @router.get("/projects")
-async def get_jira_projects(token: str = Query(...), db: Session = Depends(get_db)):
+async def get_jira_projects(token: str = Query(...), db: AsyncSession = Depends(get_db)):
     """Return all Jira projects accessible to the connected account."""
-    user = auth_service.get_current_user(db, token)
-    _require_jira(user)
-
-    try:
-        projects = await jira_oauth_service.get_projects(user.jira_access_token, user.jira_cloud_id)
-    except HTTPException as exc:
-        if exc.status_code == status.HTTP_401_UNAUTHORIZED and user.jira_refresh_token:
-            token_data = await jira_oauth_service.refresh_access_token(user.jira_refresh_token)
-            user.jira_access_token = token_data["access_token"]
-            if token_data.get("refresh_token"):
-                user.jira_refresh_token = token_data["refresh_token"]
-            db.commit()
-            projects = await jira_oauth_service.get_projects(user.jira_access_token, user.jira_cloud_id)
-        else:
-            raise
+    user = await auth_service.get_current_user(db, token)
+    projects = await jira_oauth_service.call_with_token(
+        user, lambda access_token: jira_oauth_service.get_projects(access_token, user.jira_cloud_id)
+    )
 
     return {"projects": projects}
 
@@ -158,30 +124,42 @@ async def get_jira_projects(token: str = Query(...), db: Session = Depends(get_d
 async def get_project_issues(
     project_key: str,
     token: str = Query(...),
-    db: Session = Depends(get_db),
+    refresh: bool = Query(False),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Return all issues for *project_key* grouped by status:
     { todo, in_progress, in_review, done }
+    Served from a short-lived cache unless refresh=true.
     """
-    user = auth_service.get_current_user(db, token)
-    _require_jira(user)
-
-    try:
-        grouped = await jira_oauth_service.get_project_issues_grouped(
-            user.jira_access_token, user.jira_cloud_id, project_key
-        )
-    except HTTPException as exc:
-        if exc.status_code == status.HTTP_401_UNAUTHORIZED and user.jira_refresh_token:
-            token_data = await jira_oauth_service.refresh_access_token(user.jira_refresh_token)
-            user.jira_access_token = token_data["access_token"]
-            if token_data.get("refresh_token"):
-                user.jira_refresh_token = token_data["refresh_token"]
-            db.commit()
-            grouped = await jira_oauth_service.get_project_issues_grouped(
-                user.jira_access_token, user.jira_cloud_id, project_key
-            )
-        else:
-            raise
+    user = await auth_service.get_current_user(db, token)
+    grouped = await jira_oauth_service.call_with_token(
+        user,
+        lambda access_token: jira_oauth_service.get_project_issues_grouped(
+            access_token, user.jira_cloud_id, project_key, user.id, refresh=refresh
+        ),
+    )
 
     return grouped
+
+
+# ── POST /api/jira/webhook ────────────────────────────────────────────────────
+
+@router.post("/webhook")
+async def jira_webhook(payload: dict = Body(...), secret: Optional[str] = Query(None)):
+    """
+    Jira issue/project webhook. Drops the cached board of the affected
+    project so the next load reflects the change.
+    """
+    if settings.JIRA_WEBHOOK_SECRET and secret != settings.JIRA_WEBHOOK_SECRET:
+        raise HTTPException(status_code=403, detail="Invalid webhook secret.")
+
+    issue = payload.get("issue") or {}
+    project_key = (
+        ((issue.get("fields") or {}).get("project") or {}).get("key")
+        or (payload.get("project") or {}).get("key")
+        or (issue.get("key") or "").rpartition("-")[0]
+    )
+    if project_key:
+        jira_oauth_service.invalidate_project(project_key)
+    return {"invalidated": project_key or None}
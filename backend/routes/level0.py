@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from services.groq_service import groq_service as llama_service
 from database import get_db, User
 from services.auth_service import auth_service
@@ -43,20 +43,21 @@ async def ask_question(req: AskRequest):
 async def complete_scenario(
 	req: ScenarioCompleteRequest,
 	token: Optional[str] = Query(None),
-	db: Session = Depends(get_db),
+	db: AsyncSession = Depends(get_db),
 ):
 	"""Mark a manual test scenario as complete and optionally mark Level 0 done."""
 	try:
 		if not token:
 			return {"scenario_id": req.scenario_id, "level0_completed": False}
 
-		user = auth_service.get_current_user(db, token)
+		user = await auth_service.get_current_user(db, token)
 		if not user:
 			return {"scenario_id": req.scenario_id, "level0_completed": False}
 
 		if req.mark_level0_complete:
 			user.level0_completed = True
-			db.commit()
+			await db.commit()
+			auth_service.invalidate_user(user.id)
 
 		return {
 			"scenario_id": req.scenario_id,
@@ -1,35 +1,43 @@
 """
 Level 1 Jira Integration Routes
-Handles creating automation-library Jira tickets from generated Selenium code
-and fetching the user's automation library.
+Handles creating automation-library Jira tickets (singly or in bulk) from generated Selenium code
+and fetching (cursor-paginated) or searching the user's automation library.
 """
+import base64
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db, AutomationLibraryEntry, JiraIntegration
+from database import get_db, release_connection, AutomationLibraryEntry, JiraIntegration
 from services.auth_service import auth_service
 from services.jira_service import jira_service
+from services.search_service import search_service
 
 router = APIRouter(prefix="/api/level1/jira", tags=["Level1 Jira"])
 
 
 # ── helpers ──────────────────────────────────────────────────────────────────
 
-def _get_user(authorization: str, db: Session):
+async def _get_user(authorization: str, db: AsyncSession):
     token = authorization.removeprefix("Bearer ").strip()
-    return auth_service.get_current_user(db, token)
+    return await auth_service.get_current_user(db, token)
 
 
-def _get_jira_integration(user_id: int, db: Session) -> Optional[JiraIntegration]:
-    return (
-        db.query(JiraIntegration)
-        .filter(JiraIntegration.user_id == user_id)
+def _ticket_title(title: str) -> str:
+    # Derive a clean title: truncate to 120 chars
+    return title.strip()[:120] or "Automation Test"
+
+
+async def _get_jira_integration(user_id: int, db: AsyncSession) -> Optional[JiraIntegration]:
+    return await db.scalar(
+        select(JiraIntegration)
+        .where(JiraIntegration.user_id == user_id)
         .order_by(JiraIntegration.created_at.desc())
-        .first()
+        .limit(1)
     )
 
 
@@ -42,6 +50,17 @@ class CreateTicketRequest(BaseModel):
     project_key: Optional[str] = None  # override the saved project key
 
 
+class TicketItem(BaseModel):
+    title: str
+    manual_description: str
+    generated_code: str
+
+
+class CreateTicketsRequest(BaseModel):
+    tickets: list[TicketItem]
+    project_key: Optional[str] = None  # override the saved project key
+
+
 class SyncStatusRequest(BaseModel):
     entry_ids: list[int]  # which library entries to sync
 
@@ -51,14 +70,14 @@ class SyncStatusRequest(BaseModel):
 @router.get("/config-status")
 async def get_config_status(
     authorization: str = Header(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Return whether the user has a Jira integration configured and the
     saved project key (if any), so the frontend can decide what to show.
     """
-    user = _get_user(authorization, db)
-    integration = _get_jira_integration(user.id, db)
+    user = await _get_user(authorization, db)
+    integration = await _get_jira_integration(user.id, db)
     if not integration:
         return {"configured": False, "project_key": None, "email": None}
     return {
@@ -75,14 +94,14 @@ async def get_config_status(
 async def create_ticket(
     req: CreateTicketRequest,
     authorization: str = Header(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Create a Jira Task tagged 'automation-library' containing the manual test
     description and generated Selenium code, then persist to our DB.
     """
-    user = _get_user(authorization, db)
-    integration = _get_jira_integration(user.id, db)
+    user = await _get_user(authorization, db)
+    integration = await _get_jira_integration(user.id, db)
 
     if not integration:
         raise HTTPException(
@@ -97,11 +116,11 @@ async def create_ticket(
             detail="No project key set. Please update your Jira integration with a project key.",
         )
 
-    # Derive a clean title: truncate to 120 chars
-    title = req.title.strip()[:120] or "Automation Test"
+    title = _ticket_title(req.title)
+    await release_connection(db)
 
     # Create the issue in Jira
-    result = jira_service.create_issue(
+    result = await jira_service.create_issue(
         instance_url=integration.instance_url,
         email=integration.email,
         api_token=integration.api_token,
@@ -123,8 +142,8 @@ async def create_ticket(
         jira_status="To Do",
     )
     db.add(entry)
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
 
     return {
         "id": entry.id,
@@ -136,23 +155,179 @@ async def create_ticket(
     }
 
 
+# ── POST /create-tickets ──────────────────────────────────────────────────────
+
+MAX_BULK_TICKETS = 500
+
+
+@router.post("/create-tickets")
+async def create_tickets(
+    req: CreateTicketsRequest,
+    authorization: str = Header(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Batch version of /create-ticket: creates the Tasks through Jira's bulk
+    API (50 per request) and stores every created entry in one transaction.
+    Returns one result per submitted ticket, in order; failures carry an
+    `error` instead of the ticket fields.
+    """
+    user = await _get_user(authorization, db)
+    integration = await _get_jira_integration(user.id, db)
+
+    if not integration:
+        raise HTTPException(
+            status_code=400,
+            detail="No Jira integration configured. Connect Jira first.",
+        )
+
+    project_key = req.project_key or integration.project_key
+    if not project_key:
+        raise HTTPException(
+            status_code=400,
+            detail="No project key set. Please update your Jira integration with a project key.",
+        )
+    if not req.tickets:
+        raise HTTPException(status_code=400, detail="No tickets to create.")
+    if len(req.tickets) > MAX_BULK_TICKETS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BULK_TICKETS} tickets can be created per request.",
+        )
+
+    items = [
+        {
+            "title": _ticket_title(t.title),
+            "manual_description": t.manual_description,
+            "generated_code": t.generated_code,
+        }
+        for t in req.tickets
+    ]
+    await release_connection(db)
+    created = await jira_service.create_issues_bulk(
+        instance_url=integration.instance_url,
+        email=integration.email,
+        api_token=integration.api_token,
+        project_key=project_key,
+        items=items,
+    )
+
+    entries = {
+        index: AutomationLibraryEntry(
+            user_id=user.id,
+            jira_integration_id=integration.id,
+            jira_ticket_key=result["key"],
+            jira_ticket_url=result["url"],
+            title=item["title"],
+            manual_description=item["manual_description"],
+            generated_code=item["generated_code"],
+            jira_status="To Do",
+        )
+        for index, (item, result) in enumerate(zip(items, created))
+        if "error" not in result
+    }
+    db.add_all(entries.values())
+    await db.flush()
+
+    results = []
+    for index, (item, result) in enumerate(zip(items, created)):
+        entry = entries.get(index)
+        if entry is None:
+            results.append({"index": index, "title": item["title"], "error": result["error"]})
+            continue
+        results.append({
+            "index": index,
+            "id": entry.id,
+            "ticket_key": result["key"],
+            "ticket_url": result["url"],
+            "title": item["title"],
+            "status": "To Do",
+            "created_at": entry.created_at.isoformat(),
+        })
+    await db.commit()
+
+    return {
+        "results": results,
+        "created": len(entries),
+        "failed": len(results) - len(entries),
+    }
+
+
 # ── GET /library ──────────────────────────────────────────────────────────────
 
+LIBRARY_PAGE_SIZE     = 50
+MAX_LIBRARY_PAGE_SIZE = 200
+
+# List view columns only — manual_description / generated_code stay in the DB
+LIBRARY_COLUMNS = (
+    AutomationLibraryEntry.id,
+    AutomationLibraryEntry.jira_ticket_key,
+    AutomationLibraryEntry.jira_ticket_url,
+    AutomationLibraryEntry.title,
+    AutomationLibraryEntry.jira_status,
+    AutomationLibraryEntry.created_at,
+    AutomationLibraryEntry.updated_at,
+)
+
+
+def _encode_cursor(created_at: datetime, entry_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{entry_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, entry_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(entry_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+def _library_filters(user_id: int, status: Optional[str], q: Optional[str]) -> list:
+    filters = [AutomationLibraryEntry.user_id == user_id]
+    if status:
+        filters.append(AutomationLibraryEntry.jira_status == status)
+    if q and q.strip():
+        filters.append(or_(
+            AutomationLibraryEntry.title.icontains(q.strip(), autoescape=True),
+            AutomationLibraryEntry.jira_ticket_key.icontains(q.strip(), autoescape=True),
+        ))
+    return filters
+
+
 @router.get("/library")
 async def get_library(
     authorization: str = Header(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(LIBRARY_PAGE_SIZE, ge=1, le=MAX_LIBRARY_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    q: Optional[str] = None,
 ):
-    """Return all automation library entries for the authenticated user."""
-    user = _get_user(authorization, db)
-
-    entries = (
-        db.query(AutomationLibraryEntry)
-        .filter(AutomationLibraryEntry.user_id == user.id)
-        .order_by(AutomationLibraryEntry.created_at.desc())
-        .all()
-    )
+    """
+    One page of the user's automation library, newest first. Pass the
+    returned `next_cursor` back as `cursor` for the following page; it is
+    null on the last page. `status` filters by Jira status and `q` matches
+    the title or ticket key.
+    """
+    user = await _get_user(authorization, db)
+
+    stmt = select(*LIBRARY_COLUMNS).where(*_library_filters(user.id, status, q))
+    if cursor:
+        # Keyset: continue strictly after the last row of the previous page
+        created_at, entry_id = _decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(AutomationLibraryEntry.created_at, AutomationLibraryEntry.id)
+            < tuple_(created_at, entry_id)
+        )
+    rows = (await db.execute(
+        stmt.order_by(AutomationLibraryEntry.created_at.desc(), AutomationLibraryEntry.id.desc())
+        .limit(limit + 1)
+    )).all()
 
+    has_more = len(rows) > limit
+    rows = rows[:limit]
     return {
         "entries": [
             {
@@ -164,9 +339,63 @@ async def get_library(
                 "created_at": e.created_at.isoformat(),
                 "updated_at": e.updated_at.isoformat() if e.updated_at else None,
             }
-            for e in entries
+            for e in rows
+        ],
+        "next_cursor": _encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None,
+    }
+
+
+# ── GET /library/count ────────────────────────────────────────────────────────
+
+@router.get("/library/count")
+async def get_library_count(
+    authorization: str = Header(...),
+    db: AsyncSession = Depends(get_db),
+    q: Optional[str] = None,
+):
+    """Number of library entries per Jira status (and in total), optionally matching `q`."""
+    user = await _get_user(authorization, db)
+
+    by_status = {
+        status: count
+        for status, count in (await db.execute(
+            select(AutomationLibraryEntry.jira_status, func.count())
+            .where(*_library_filters(user.id, None, q))
+            .group_by(AutomationLibraryEntry.jira_status)
+        )).all()
+    }
+    return {"total": sum(by_status.values()), "by_status": by_status}
+
+
+# ── GET /library/search ───────────────────────────────────────────────────────
+
+@router.get("/library/search")
+async def search_library(
+    q: str,
+    authorization: str = Header(...),
+    db: AsyncSession = Depends(get_db),
+    limit: int = Query(20, ge=1, le=50),
+):
+    """
+    Full-text search over the user's library (title, manual steps and
+    generated code), best match first. Each result carries an HTML
+    `snippet` with the matched words in <mark>.
+    """
+    user = await _get_user(authorization, db)
+    results = await search_service.search_library(db, user.id, q, limit)
+    return {
+        "results": [
+            {
+                "id": r["id"],
+                "ticket_key": r["jira_ticket_key"],
+                "ticket_url": r["jira_ticket_url"],
+                "title": r["title"],
+                "jira_status": r["jira_status"],
+                "created_at": r["created_at"].isoformat(),
+                "snippet": r["snippet"],
+            }
+            for r in results
         ],
-        "total": len(entries),
     }
 
 
@@ -175,38 +404,48 @@ async def get_library(
 @router.post("/sync-status")
 async def sync_status(
     authorization: str = Header(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Re-fetch the current Jira status for all of the user's library entries
     and update the local DB. Returns the updated entries.
     """
-    user = _get_user(authorization, db)
-    integration = _get_jira_integration(user.id, db)
+    user = await _get_user(authorization, db)
+    integration = await _get_jira_integration(user.id, db)
     if not integration:
         raise HTTPException(status_code=400, detail="No Jira integration configured.")
 
-    entries = (
-        db.query(AutomationLibraryEntry)
-        .filter(AutomationLibraryEntry.user_id == user.id)
-        .all()
+    entries = (await db.execute(
+        select(
+            AutomationLibraryEntry.id,
+            AutomationLibraryEntry.jira_ticket_key,
+            AutomationLibraryEntry.jira_status,
+        )
+        .where(AutomationLibraryEntry.user_id == user.id)
+    )).all()
+
+    # One chunked `key in (...)` search instead of one request per ticket.
+    # Tickets Jira can't resolve keep their last known status.
+    await release_connection(db)
+    statuses = await jira_service.get_issue_statuses(
+        instance_url=integration.instance_url,
+        email=integration.email,
+        api_token=integration.api_token,
+        issue_keys=[e.jira_ticket_key for e in entries],
     )
 
-    updated = []
-    for entry in entries:
-        try:
-            status = jira_service.get_issue_current_status(
-                instance_url=integration.instance_url,
-                email=integration.email,
-                api_token=integration.api_token,
-                issue_key=entry.jira_ticket_key,
-            )
-            entry.jira_status = status
-            entry.updated_at  = datetime.utcnow()
-            updated.append({"id": entry.id, "ticket_key": entry.jira_ticket_key, "jira_status": status})
-        except Exception:
-            # Don't fail the whole sync if one ticket errors
-            updated.append({"id": entry.id, "ticket_key": entry.jira_ticket_key, "jira_status": entry.jira_status})
-
-    db.commit()
+    now = datetime.utcnow()
+    changes = [
+        {"id": e.id, "jira_status": statuses[e.jira_ticket_key], "updated_at": now}
+        for e in entries
+        if e.jira_ticket_key in statuses
+    ]
+    if changes:
+        await db.execute(update(AutomationLibraryEntry), changes)
+    await db.commit()
+
+    updated = [
+        {"id": e.id, "ticket_key": e.jira_ticket_key, "jira_status": statuses.get(e.jira_ticket_key, e.jira_status)}
+        for e in entries
+    ]
     return {"synced": len(updated), "entries": updated}
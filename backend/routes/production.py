@@ -3,7 +3,7 @@ Production Routes — SSE streaming via Groq for all AI actions.
 """
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
 from database import get_db
@@ -77,19 +77,21 @@ def _resp(prompt: str, max_tokens: int = 2048):
 # ── Repository endpoints ──────────────────────────────────────────────────────
 
 @router.get("/repositories")
-async def get_user_repositories(token: str, db: Session = Depends(get_db)):
+async def get_user_repositories(token: str, include_orgs: bool = False, refresh: bool = False,
+                                db: AsyncSession = Depends(get_db)):
 	try:
-		user  = auth_service.get_current_user(db, token)
-		repos = await github_service.get_user_repositories(user.github_access_token)
+		user  = await auth_service.get_current_user(db, token)
+		repos = await github_service.get_user_repositories(
+			user.github_access_token, include_orgs=include_orgs, refresh=refresh)
 		return {"repositories": repos, "count": len(repos)}
 	except HTTPException: raise
 	except Exception as e: raise HTTPException(500, str(e))
 
 @router.get("/repository/{owner}/{repo}/structure")
 async def get_repo_structure(owner: str, repo: str, path: str = "",
-                             token: str = None, db: Session = Depends(get_db)):
+                             token: str = None, db: AsyncSession = Depends(get_db)):
 	try:
-		user = auth_service.get_current_user(db, token)
+		user = await auth_service.get_current_user(db, token)
 		return {"structure": await github_service.get_repository_structure(
 			user.github_access_token, owner, repo, path)}
 	except HTTPException: raise
@@ -97,33 +99,22 @@ async def get_repo_structure(owner: str, repo: str, path: str = "",
 
 @router.get("/repository/{owner}/{repo}/file")
 async def get_file_content(owner: str, repo: str, path: str,
-                           token: str = None, db: Session = Depends(get_db)):
+                           token: str = None, db: AsyncSession = Depends(get_db)):
 	try:
-		user = auth_service.get_current_user(db, token)
-		return {"content": await github_service.get_file_content(
-			user.github_access_token, owner, repo, path), "path": path}
+		user = await auth_service.get_current_user(db, token)
+		preview = await github_service.get_file_preview(
+			user.github_access_token, owner, repo, path)
+		return {**preview, "path": path}
 	except HTTPException: raise
 	except Exception as e: raise HTTPException(500, str(e))
 
 @router.get("/repository/{owner}/{repo}/tree")
-async def get_repo_tree(owner: str, repo: str,
-                        token: str = None, db: Session = Depends(get_db)):
+async def get_repo_tree(owner: str, repo: str, path: str = "", max_depth: Optional[int] = None,
+                        token: str = None, db: AsyncSession = Depends(get_db)):
 	try:
-		user = auth_service.get_current_user(db, token)
-		async def build(path=""):
-			s = await github_service.get_repository_structure(
-				user.github_access_token, owner, repo, path)
-			if isinstance(s, dict): s = [s]
-			tree = []
-			for item in s:
-				node = {k: item[k] for k in ("name", "path", "type")}
-				node["size"] = item.get("size", 0)
-				if item["type"] == "dir":
-					try: node["children"] = await build(item["path"])
-					except: node["children"] = []
-				tree.append(node)
-			return tree
-		return {"tree": await build()}
+		user = await auth_service.get_current_user(db, token)
+		return await github_service.get_repository_tree(
+			user.github_access_token, owner, repo, path, max_depth)
 	except HTTPException: raise
 	except Exception as e: raise HTTPException(500, str(e))
 
@@ -1,7 +1,7 @@
 """
 Production V2 Routes — Jira integration and gap detection.
 """
-import json
+import httpx
 import asyncio
 import logging
 from datetime import datetime
@@ -9,16 +9,24 @@ from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
-from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-
-from database import get_db, JiraIntegration, JiraTask, ImplementationGap, GapTypeEnum
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from database import (
+    get_db, bulk_upsert, UPSERT_CHUNK_SIZE,
+    JiraIntegration, JiraTask, ImplementationGap, GapTypeEnum, GapAffectedFile, RepoFile,
+)
 from services.auth_service import auth_service
 from services.github_service import github_service
-from services.jira_service import jira_service
+from services.jira_service import jira_oauth_service, jira_service
+from services.jira_sync_service import jira_sync_service
 from services.gap_detection_service import gap_detection_service
+from services.gap_history_service import gap_history_service
 from services.groq_service import groq_service
+from services.search_service import search_service
 
 router = APIRouter(prefix="/api/production/v2", tags=["ProductionV2"])
 
@@ -63,24 +71,21 @@ class UpdateProjectKeyRequest(BaseModel):
 @router.post("/jira/connect")
 async def connect_jira(
     request: JiraConnectRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     authorization: str = Header(...),
 ):
     token = authorization.removeprefix("Bearer ").strip()
-    user = auth_service.get_current_user(db, token)
+    user = await auth_service.get_current_user(db, token)
 
-    loop = asyncio.get_running_loop()
-    myself = await loop.run_in_executor(
-        None,
-        jira_service.verify_connection,
+    myself = await jira_service.verify_connection(
         request.instance_url,
         request.email,
         request.api_token,
     )
 
-    integration = db.query(JiraIntegration).filter(
+    integration = await db.scalar(select(JiraIntegration).where(
         JiraIntegration.user_id == user.id
-    ).first()
+    ))
 
     if integration:
         integration.instance_url = request.instance_url
@@ -88,6 +93,7 @@ async def connect_jira(
         integration.api_token    = request.api_token
         if request.project_key:
             integration.project_key = request.project_key
+        jira_sync_service.reset(integration)
     else:
         integration = JiraIntegration(
             user_id      = user.id,
@@ -98,8 +104,8 @@ async def connect_jira(
         )
         db.add(integration)
 
-    db.commit()
-    db.refresh(integration)
+    await db.commit()
+    await db.refresh(integration)
 
     return {
         "status":       "connected",
@@ -112,14 +118,14 @@ async def connect_jira(
 # ── /jira/status ──────────────────────────────────────────────────────────────
 
 @router.get("/jira/status")
-async def jira_status(db: Session = Depends(get_db), authorization: str = Header(...)):
+async def jira_status(db: AsyncSession = Depends(get_db), authorization: str = Header(...)):
     token = authorization.removeprefix("Bearer ").strip()
-    user = auth_service.get_current_user(db, token)
+    user = await auth_service.get_current_user(db, token)
 
     oauth_connected = bool(user.jira_access_token and user.jira_cloud_id)
-    integration = db.query(JiraIntegration).filter(
+    integration = await db.scalar(select(JiraIntegration).where(
         JiraIntegration.user_id == user.id
-    ).first()
+    ))
 
     if not integration and not oauth_connected:
         return {"connected": False}
@@ -137,18 +143,21 @@ async def jira_status(db: Session = Depends(get_db), authorization: str = Header
 # ── /jira/disconnect ──────────────────────────────────────────────────────────
 
 @router.delete("/jira/disconnect")
-async def disconnect_jira(db: Session = Depends(get_db), authorization: str = Header(...)):
+async def disconnect_jira(db: AsyncSession = Depends(get_db), authorization: str = Header(...)):
     token = authorization.removeprefix("Bearer ").strip()
-    user = auth_service.get_current_user(db, token)
-    integration = db.query(JiraIntegration).filter(
+    user = await auth_service.get_current_user(db, token)
+    integration = await db.scalar(select(JiraIntegration).where(
         JiraIntegration.user_id == user.id
-    ).first()
+    ))
     if integration:
-        db.delete(integration)
+        await db.delete(integration)
     user.jira_access_token  = None
     user.jira_refresh_token = None
     user.jira_cloud_id      = None
-    db.commit()
+    user.jira_token_expires_at = None
+    await db.commit()
+    auth_service.invalidate_user(user.id)
+    jira_oauth_service.invalidate_viewer(user.id)
     return {"disconnected": True}
 
 
@@ -157,18 +166,18 @@ async def disconnect_jira(db: Session = Depends(get_db), authorization: str = He
 @router.patch("/jira/project-key")
 async def update_project_key(
     request: UpdateProjectKeyRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     authorization: str = Header(...),
 ):
     token = authorization.removeprefix("Bearer ").strip()
-    user = auth_service.get_current_user(db, token)
+    user = await auth_service.get_current_user(db, token)
 
     if not request.project_key or not request.project_key.strip():
         raise HTTPException(status_code=400, detail="project_key is required (e.g. SCRUM).")
 
-    integration = db.query(JiraIntegration).filter(
+    integration = await db.scalar(select(JiraIntegration).where(
         JiraIntegration.user_id == user.id
-    ).first()
+    ))
     if not integration:
         raise HTTPException(status_code=404, detail="No Jira account connected.")
 
@@ -177,25 +186,120 @@ async def update_project_key(
         integration.instance_url = request.space_url.strip().rstrip("/")
     if request.cloud_id:
         integration.space_cloud_id = request.cloud_id.strip()
-    db.commit()
+    jira_sync_service.reset(integration)
+    await db.commit()
 
     return {"status": "updated", "project_key": integration.project_key}
 
 
 # ── /gaps/analyze ─────────────────────────────────────────────────────────────
 
+async def _load_repo_context(access_token: str, owner: str, repo: str):
+    """Return (repo file list, {test file path: content}) for gap detection."""
+    # Full repo file list via the Git Trees API (cached per commit SHA)
+    repo_files = await github_service.get_flat_file_list(access_token, owner, repo)
+
+    # Content of test files for content-based matching (cap at 40 to limit API calls)
+    test_file_paths = [f for f in repo_files if gap_detection_service._is_test_file(f)][:40]
+    if not test_file_paths:
+        return repo_files, {}
+
+    # Concurrency is bounded by the per-token adaptive window in github_scheduler
+    async def _fetch_test_content(client: httpx.AsyncClient, fpath: str):
+        try:
+            content = await github_service.get_file_content(
+                access_token, owner, repo, fpath, client=client,
+            )
+            return fpath, content or ""
+        except Exception:
+            return fpath, ""
+
+    async with httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=settings.GITHUB_MAX_CONCURRENCY)
+    ) as shared_client:
+        fetch_results = await asyncio.gather(
+            *[_fetch_test_content(shared_client, p) for p in test_file_paths]
+        )
+    test_file_contents = {k: v for k, v in fetch_results if v}
+    logger.info("Fetched content for %d/%d test files", len(test_file_contents), len(test_file_paths))
+    return repo_files, test_file_contents
+
+
+async def _persist_gaps(
+    db: AsyncSession,
+    repo_owner: str,
+    repo_name: str,
+    gaps: List[dict],
+    task_key_to_id: dict,
+) -> None:
+    """
+    Upsert one ImplementationGap per task and replace its affected-file links.
+    Paths are stored once per repository in repo_files; every step is a
+    bulk statement of up to 500 rows.
+    """
+    gaps = [g for g in gaps if g["task_key"] in task_key_to_id]
+    if not gaps:
+        return
+
+    upserted = await bulk_upsert(
+        db, ImplementationGap,
+        [
+            {
+                "jira_task_id":   task_key_to_id[g["task_key"]],
+                "gap_type":       GapTypeEnum(g["gap_type"]),
+                "affected_files": None,  # legacy JSON column, superseded by gap_affected_files
+            }
+            for g in gaps
+        ],
+        conflict_columns=["jira_task_id"],
+        update_columns=["gap_type", "affected_files"],
+        returning=True,
+    )
+    gap_ids = {gap.jira_task_id: gap.id for gap in upserted}
+
+    paths = sorted({p for g in gaps for p in g["source_files"] + g["test_files"]})
+    file_ids = {}
+    if paths:
+        # No-op update so RETURNING also yields the paths that already exist
+        files = await bulk_upsert(
+            db, RepoFile,
+            [{"repo_owner": repo_owner, "repo_name": repo_name, "path": p} for p in paths],
+            conflict_columns=["repo_owner", "repo_name", "path"],
+            update_columns=["path"],
+            returning=True,
+        )
+        file_ids = {f.path: f.id for f in files}
+
+    ids = list(gap_ids.values())
+    for start in range(0, len(ids), UPSERT_CHUNK_SIZE):
+        await db.execute(
+            delete(GapAffectedFile).where(GapAffectedFile.gap_id.in_(ids[start:start + UPSERT_CHUNK_SIZE]))
+        )
+    links = {
+        (gap_ids[task_key_to_id[g["task_key"]]], file_ids[path], role)
+        for g in gaps
+        for role, key in (("source", "source_files"), ("test", "test_files"))
+        for path in g[key]
+    }
+    if links:
+        await db.execute(insert(GapAffectedFile), [
+            {"gap_id": gap_id, "file_id": file_id, "role": role}
+            for gap_id, file_id, role in sorted(links)
+        ])
+
+
 @router.post("/gaps/analyze")
 async def analyze_gaps(
     request: AnalyzeGapsRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     authorization: str = Header(...),
 ):
     token = authorization.removeprefix("Bearer ").strip()
-    user = auth_service.get_current_user(db, token)
+    user = await auth_service.get_current_user(db, token)
 
-    integration = db.query(JiraIntegration).filter(
+    integration = await db.scalar(select(JiraIntegration).where(
         JiraIntegration.user_id == user.id
-    ).first()
+    ))
     if not integration:
         logger.error("gaps/analyze 400: no JiraIntegration row for user_id=%s", user.id)
         raise HTTPException(status_code=400, detail="No Jira integration configured. Connect first.")
@@ -206,116 +310,76 @@ async def analyze_gaps(
         )
     logger.info("gaps/analyze: project=%s instance=%s", integration.project_key, integration.instance_url)
 
-    # 1. Fetch Jira issues (all pages concurrently)
-    logger.info("Fetching issues for project %s", integration.project_key)
+    # 1. Repository context (file list + test file contents) loads in the
+    #    background while Jira pages stream in below
+    repo_context = asyncio.create_task(
+        _load_repo_context(user.github_access_token, request.repo_owner, request.repo_name)
+    )
+
+    # 2. Sync Jira issues into JiraTask page by page — only issues changed since
+    #    the last sync are fetched; a periodic full reconcile drops deleted ones.
+    #    Each page is classified as soon as the repo context is ready; pages that
+    #    arrive earlier wait in a backlog.
+    logger.info("Syncing issues for project %s", integration.project_key)
+    tasks_for_detection: List[dict] = []
+    gaps:    List[dict] = []
+    backlog: List[dict] = []
     try:
-        raw_issues = await jira_service.get_project_issues_async(
-            integration.instance_url,
-            integration.email,
-            integration.api_token,
-            integration.project_key,
-        )
+        async for batch in jira_sync_service.iter_sync_batches(db, integration):
+            rows = [
+                {
+                    "task_key":            t.task_key,
+                    "summary":             t.summary,
+                    "status":              t.status or "",
+                    "status_category":     t.status_category or "new",
+                    "acceptance_criteria": t.acceptance_criteria or "",
+                    "jira_updated":        t.jira_updated,
+                    "_db_id":              t.id,
+                }
+                for t in batch
+            ]
+            tasks_for_detection.extend(rows)
+            if repo_context.done() and repo_context.exception() is None:
+                repo_files, test_file_contents = repo_context.result()
+                gaps.extend(
+                    gap_detection_service.classify_task(r, repo_files, test_file_contents)
+                    for r in backlog + rows
+                )
+                backlog = []
+            else:
+                backlog.extend(rows)
     except HTTPException as exc:
+        repo_context.cancel()
         logger.error("Jira API error fetching issues: %s", exc.detail)
         raise
     except Exception as exc:
+        repo_context.cancel()
         logger.error("Unexpected error fetching Jira issues: %s", exc)
         raise HTTPException(status_code=500, detail=f"Failed to fetch Jira issues: {exc}")
 
-    # 2. Process issues — extract AC, upsert JiraTask rows
-    # Preload all existing tasks in one query to avoid N+1
-    existing_tasks: dict = {
-        t.task_key: t
-        for t in db.query(JiraTask).filter(
-            JiraTask.jira_integration_id == integration.id
-        ).all()
-    }
-
-    tasks_for_detection: List[dict] = []
-    for issue in raw_issues:
-        issue_key = issue["key"]
-        fields    = issue.get("fields", {})
-        summary   = fields.get("summary", "")
-        status_obj      = fields.get("status", {})
-        status          = status_obj.get("name", "")
-        status_category = status_obj.get("statusCategory", {}).get("key", "new")
-        ac_text         = jira_service._extract_acceptance_criteria(fields.get("description"))
-
-        db_task = existing_tasks.get(issue_key)
-        if db_task:
-            db_task.summary             = summary
-            db_task.status              = status
-            db_task.acceptance_criteria = ac_text
-            db_task.updated_at          = datetime.utcnow()
-        else:
-            db_task = JiraTask(
-                jira_integration_id = integration.id,
-                task_key            = issue_key,
-                summary             = summary,
-                status              = status,
-                acceptance_criteria = ac_text,
-            )
-            db.add(db_task)
-            db.flush()  # get db_task.id within the transaction
-
-        tasks_for_detection.append({
-            "task_key":            issue_key,
-            "summary":             summary,
-            "status":              status,
-            "status_category":     status_category,
-            "acceptance_criteria": ac_text,
-            "_db_id":              db_task.id,
-        })
-
     # NOTE: do NOT commit here — we defer to a single commit after all steps
     # succeed so that a GitHub failure doesn't leave orphaned JiraTask rows.
 
-    # 3. Fetch full repo file list via Git Trees API (single call, no recursion)
+    # 3. Wait for the repo context and classify whatever is still queued
     try:
-        repo_files = await github_service.get_flat_file_list(
-            user.github_access_token, request.repo_owner, request.repo_name
-        )
+        repo_files, test_file_contents = await repo_context
     except Exception as exc:
         logger.error("Failed to fetch repo files for %s/%s: %s", request.repo_owner, request.repo_name, exc)
         raise HTTPException(status_code=500, detail=f"Failed to fetch repository files: {exc}")
-
-    # 3b. Fetch content of test files for content-based matching (cap at 40 to limit API calls)
-    test_file_paths = [f for f in repo_files if gap_detection_service._is_test_file(f)]
-    test_file_contents: dict = {}
-
-    if test_file_paths:
-        semaphore = asyncio.Semaphore(8)  # max 8 concurrent GitHub requests
-
-        async def _fetch_test_content(client: "httpx.AsyncClient", fpath: str):
-            async with semaphore:
-                try:
-                    content = await github_service.get_file_content(
-                        user.github_access_token, request.repo_owner, request.repo_name, fpath,
-                        client=client,
-                    )
-                    return fpath, content or ""
-                except Exception:
-                    return fpath, ""
-
-        import httpx as _httpx
-        async with _httpx.AsyncClient() as _shared_client:
-            fetch_results = await asyncio.gather(
-                *[_fetch_test_content(_shared_client, p) for p in test_file_paths[:40]]
-            )
-        test_file_contents = {k: v for k, v in fetch_results if v}
-        logger.info(
-            "Fetched content for %d/%d test files",
-            len(test_file_contents), len(test_file_paths[:40]),
-        )
-
-    # 4. Run gap detection (filename + content-based for test files)
-    result = gap_detection_service.analyze_gaps(
-        jira_tasks    = tasks_for_detection,
-        repo_files    = repo_files,
-        repo_name     = request.repo_name,
-        file_contents = test_file_contents,
+    gaps.extend(
+        gap_detection_service.classify_task(r, repo_files, test_file_contents)
+        for r in backlog
     )
 
+    # 4. Most recently updated in Jira first, as the full-list sync returned them
+    updated_by_key = {t["task_key"]: t["jira_updated"] for t in tasks_for_detection}
+    gaps.sort(key=lambda g: updated_by_key.get(g["task_key"]) or datetime.min, reverse=True)
+    result = {
+        "repo_name": request.repo_name,
+        "gaps":      gaps,
+        "stats":     gap_detection_service.compute_stats(gaps),
+    }
+
     # 4b. Groq verification — confirm "complete" tasks actually have tests covering the AC
     if groq_service.check_availability() and test_file_contents:
         loop = asyncio.get_running_loop()
@@ -357,60 +421,20 @@ async def analyze_gaps(
 
         # Recalculate stats if any gaps were downgraded
         if downgraded:
-            gaps = result["gaps"]
-            total = len(gaps)
-
-            def _count(t: str) -> int:
-                return sum(1 for g in gaps if g["gap_type"] == t)
-
-            def _pct(n: int) -> float:
-                return round(n / total * 100, 1) if total else 0.0
-
-            ns  = _count("not_started")
-            ut  = _count("untested")
-            cmp = _count("complete")
-            nct = _count("non_code_task")
-            result["stats"] = {
-                "total":           total,
-                "not_started":     ns,  "not_started_pct":   _pct(ns),
-                "untested":        ut,  "untested_pct":      _pct(ut),
-                "complete":        cmp, "complete_pct":      _pct(cmp),
-                "non_code_task":   nct, "non_code_task_pct": _pct(nct),
-            }
+            result["stats"] = gap_detection_service.compute_stats(result["gaps"])
 
-    # 5. Persist ImplementationGap rows
-    task_key_to_row = {t["task_key"]: t for t in tasks_for_detection}
-    task_db_ids     = [t["_db_id"] for t in tasks_for_detection if t.get("_db_id")]
-    existing_gaps   = {
-        g.jira_task_id: g
-        for g in db.query(ImplementationGap).filter(
-            ImplementationGap.jira_task_id.in_(task_db_ids)
-        ).all()
-    }
+    # 5. Persist ImplementationGap rows and their affected files in bulk
+    task_key_to_id = {t["task_key"]: t["_db_id"] for t in tasks_for_detection if t.get("_db_id")}
+    await _persist_gaps(db, request.repo_owner, request.repo_name, result["gaps"], task_key_to_id)
 
-    for gap_item in result["gaps"]:
-        task_row = task_key_to_row.get(gap_item["task_key"])
-        if not task_row or not task_row.get("_db_id"):
-            continue
-
-        gap_enum = GapTypeEnum(gap_item["gap_type"])
-        affected = json.dumps({
-            "source": gap_item["source_files"],
-            "tests":  gap_item["test_files"],
-        })
+    # 6. History snapshot of this run (stats + compressed per-task results)
+    run = gap_history_service.record_run(
+        db, integration.id, request.repo_owner, request.repo_name, result["gaps"], result["stats"],
+    )
+    await db.flush()
+    result["run_id"] = run.id
 
-        existing_gap = existing_gaps.get(task_row["_db_id"])
-        if existing_gap:
-            existing_gap.gap_type       = gap_enum
-            existing_gap.affected_files = affected
-        else:
-            db.add(ImplementationGap(
-                jira_task_id   = task_row["_db_id"],
-                gap_type       = gap_enum,
-                affected_files = affected,
-            ))
-
-    db.commit()
+    await db.commit()
     return result
 
 
@@ -419,11 +443,11 @@ async def analyze_gaps(
 @router.post("/gaps/simulate-tests")
 async def simulate_tests_for_gap(
     request: SimulateTestsRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     authorization: str = Header(...),
 ):
     token = authorization.removeprefix("Bearer ").strip()
-    user = auth_service.get_current_user(db, token)
+    user = await auth_service.get_current_user(db, token)
 
     async def _fetch(path: str) -> dict:
         try:
@@ -460,11 +484,11 @@ async def simulate_tests_for_gap(
 @router.post("/gaps/generate-tests")
 async def generate_tests_for_gap(
     request: SimulateTestsRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     authorization: str = Header(...),
 ):
     token = authorization.removeprefix("Bearer ").strip()
-    user = auth_service.get_current_user(db, token)
+    user = await auth_service.get_current_user(db, token)
 
     async def _fetch(path: str) -> dict:
         try:
@@ -500,34 +524,161 @@ async def generate_tests_for_gap(
     return result
 
 
+# ── /gaps/runs, /gaps/trend ───────────────────────────────────────────────────
+
+async def _require_integration(db: AsyncSession, authorization: str) -> JiraIntegration:
+    token = authorization.removeprefix("Bearer ").strip()
+    user  = await auth_service.get_current_user(db, token)
+    integration = await db.scalar(select(JiraIntegration).where(
+        JiraIntegration.user_id == user.id
+    ))
+    if not integration:
+        raise HTTPException(status_code=404, detail="No Jira integration found.")
+    return integration
+
+
+@router.get("/gaps/runs")
+async def list_gap_runs(
+    repo_name: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """Past /gaps/analyze runs, newest first (stats only)."""
+    integration = await _require_integration(db, authorization)
+    return {"runs": await gap_history_service.list_runs(db, integration.id, repo_name, limit)}
+
+
+@router.get("/gaps/runs/{run_id}")
+async def get_gap_run(
+    run_id: int,
+    db: AsyncSession = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """One past run with its per-task gap types."""
+    integration = await _require_integration(db, authorization)
+    run = await gap_history_service.get_run(db, integration.id, run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Analysis run {run_id} not found.")
+    return run
+
+
+@router.get("/gaps/trend")
+async def gap_trend(
+    repo_name: str,
+    days: int = Query(30, ge=1, le=365),
+    db: AsyncSession = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """
+    Coverage over time for one repository: a point per day with runs (the
+    day's last run), plus the change between the first and last point.
+    """
+    integration = await _require_integration(db, authorization)
+    points = await gap_history_service.trend(db, integration.id, repo_name, days)
+    change = None
+    if len(points) >= 2:
+        first, last = points[0], points[-1]
+        change = {
+            key: round(last[key] - first[key], 1)
+            for key in last
+            if key not in ("date", "runs")
+        }
+    return {"repo_name": repo_name, "days": days, "points": points, "change": change}
+
+
+# ── /gaps/files ───────────────────────────────────────────────────────────────
+
+@router.get("/gaps/files")
+async def gaps_by_file(
+    repo_owner: str,
+    repo_name: str,
+    prefix: str = "",
+    role: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+    authorization: str = Header(...),
+):
+    """
+    Tasks whose gaps touch files under `prefix` (e.g. `auth/`) in a
+    repository, with the matching files. `role` narrows to "source" or
+    "test" files.
+    """
+    integration = await _require_integration(db, authorization)
+
+    stmt = (
+        select(JiraTask.task_key, JiraTask.summary, ImplementationGap.gap_type, RepoFile.path, GapAffectedFile.role)
+        .join(GapAffectedFile, GapAffectedFile.file_id == RepoFile.id)
+        .join(ImplementationGap, ImplementationGap.id == GapAffectedFile.gap_id)
+        .join(JiraTask, JiraTask.id == ImplementationGap.jira_task_id)
+        .where(
+            RepoFile.repo_owner == repo_owner,
+            RepoFile.repo_name  == repo_name,
+            JiraTask.jira_integration_id == integration.id,
+        )
+    )
+    if prefix:
+        # Range on the (repo_owner, repo_name, path) index instead of LIKE
+        stmt = stmt.where(RepoFile.path >= prefix, RepoFile.path < prefix + "\U0010ffff")
+    if role:
+        stmt = stmt.where(GapAffectedFile.role == role)
+    rows = (await db.execute(stmt.order_by(JiraTask.task_key, RepoFile.path).limit(limit))).all()
+
+    tasks: dict = {}
+    for r in rows:
+        task = tasks.setdefault(r.task_key, {
+            "task_key": r.task_key,
+            "summary":  r.summary,
+            "gap_type": r.gap_type.value,
+            "files":    [],
+        })
+        task["files"].append({"path": r.path, "role": r.role})
+    return {"tasks": list(tasks.values())}
+
+
+# ── /tasks/search ─────────────────────────────────────────────────────────────
+
+@router.get("/tasks/search")
+async def search_tasks(
+    q: str,
+    db: AsyncSession = Depends(get_db),
+    authorization: str = Header(...),
+    limit: int = Query(20, ge=1, le=50),
+):
+    """Full-text search over the synced Jira tasks (summary and acceptance criteria)."""
+    integration = await _require_integration(db, authorization)
+    results = await search_service.search_tasks(db, integration.id, q, limit)
+    return {"results": [{k: v for k, v in r.items() if k != "id"} for r in results]}
+
+
 # ── /gaps/{task_key}/type ─────────────────────────────────────────────────────
 
 @router.put("/gaps/{task_key}/type")
 async def update_gap_type(
     task_key: str,
     body: UpdateGapTypeRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     authorization: str = Header(...),
 ):
     token = authorization.removeprefix("Bearer ").strip()
-    user  = auth_service.get_current_user(db, token)
+    user  = await auth_service.get_current_user(db, token)
 
-    integration = db.query(JiraIntegration).filter(
+    integration = await db.scalar(select(JiraIntegration).where(
         JiraIntegration.user_id == user.id
-    ).first()
+    ))
     if not integration:
         raise HTTPException(status_code=404, detail="No Jira integration found.")
 
-    task = db.query(JiraTask).filter(
+    task = await db.scalar(select(JiraTask).where(
         JiraTask.jira_integration_id == integration.id,
         JiraTask.task_key            == task_key,
-    ).first()
+    ))
     if not task:
         raise HTTPException(status_code=404, detail=f"Task {task_key} not found.")
 
-    gap = db.query(ImplementationGap).filter(
+    gap = await db.scalar(select(ImplementationGap).where(
         ImplementationGap.jira_task_id == task.id
-    ).first()
+    ))
     if not gap:
         raise HTTPException(status_code=404, detail=f"No gap record for task {task_key}.")
 
@@ -540,5 +691,5 @@ async def update_gap_type(
                    f"Valid values: not_started, untested, complete, non_code_task.",
         )
 
-    db.commit()
+    await db.commit()
     return {"task_key": task_key, "gap_type": body.gap_type}
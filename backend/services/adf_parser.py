@@ -0,0 +1,126 @@
+"""
+ADF Parser — plain text and acceptance criteria from Jira descriptions.
+
+Jira Cloud returns issue descriptions as Atlassian Document Format (ADF):
+a JSON tree of block nodes (paragraph, heading, bulletList, ...) whose
+leaves are text and inline nodes. The tree is walked with an explicit
+stack and text is collected into a list that is joined once, so large
+descriptions are handled in linear time.
+"""
+import hashlib
+import json
+import re
+from typing import Any, List
+
+# Inline nodes that carry their text in attrs rather than in a text child
+INLINE_ATTR_TEXT = {
+    "mention":    "text",
+    "emoji":      "text",
+    "status":     "text",
+    "inlineCard": "url",
+}
+
+# Containers whose children are separate criteria
+LIST_TYPES = {"bulletList", "orderedList", "taskList"}
+LIST_ITEM_TYPES = {"listItem", "taskItem"}
+
+# Blocks that end a line of text
+BLOCK_TYPES = {
+    "paragraph", "heading", "blockquote", "codeBlock", "panel",
+    "listItem", "taskItem", "tableCell", "tableHeader", "rule",
+} | LIST_TYPES
+
+AC_HEADING = "acceptance criteria"
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)]|\[[ xX]?\])\s+")
+
+
+def description_hash(description: Any) -> str:
+    """Stable hash of a description's JSON (None included) for change detection."""
+    canonical = json.dumps(description, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def adf_text(node: Any) -> str:
+    """All text under *node*, one line per block node."""
+    parts: List[str] = []
+    stack: List[Any] = [node]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):           # line break queued after a block
+            parts.append(item)
+            continue
+        if not isinstance(item, dict):
+            continue
+        node_type = item.get("type")
+        if node_type == "text":
+            parts.append(item.get("text", ""))
+            continue
+        if node_type == "hardBreak":
+            parts.append("\n")
+            continue
+        attr = INLINE_ATTR_TEXT.get(node_type)
+        if attr:
+            parts.append((item.get("attrs") or {}).get(attr, ""))
+            continue
+        if node_type in BLOCK_TYPES:
+            stack.append("\n")
+        stack.extend(reversed(item.get("content") or []))
+    return "".join(parts)
+
+
+def _clean(line: str) -> str:
+    return " ".join(_LIST_MARKER.sub("", line).split())
+
+
+def _block_criteria(node: dict) -> List[str]:
+    """Criteria in one top-level block: one per list item, else one per non-empty line."""
+    if node.get("type") in LIST_TYPES:
+        items = [
+            child for child in node.get("content") or []
+            if child.get("type") in LIST_ITEM_TYPES
+        ]
+        criteria = [_clean(adf_text(item)) for item in items]
+    else:
+        criteria = [_clean(line) for line in adf_text(node).splitlines()]
+    return [c for c in criteria if c]
+
+
+def _is_ac_heading(node: dict) -> bool:
+    if node.get("type") == "heading":
+        return AC_HEADING in adf_text(node).lower()
+    # "Acceptance Criteria:" typed as its own (often bold) paragraph
+    if node.get("type") == "paragraph":
+        text = adf_text(node).strip().lower().rstrip(":").strip()
+        return text == AC_HEADING
+    return False
+
+
+def extract_acceptance_criteria(description: Any) -> List[str]:
+    """
+    Criteria listed under an 'Acceptance Criteria' heading, in order.
+    The section ends at the next heading. Without such a heading every
+    block of the description is used.
+    """
+    if not description or not isinstance(description, dict):
+        return []
+
+    blocks = [n for n in description.get("content") or [] if isinstance(n, dict)]
+    criteria: List[str] = []
+    inside_ac = False
+    for node in blocks:
+        if _is_ac_heading(node):
+            inside_ac = True
+            continue
+        if node.get("type") == "heading":
+            if inside_ac:
+                break
+            continue
+        if inside_ac:
+            criteria.extend(_block_criteria(node))
+
+    # Fallback: extract all text if no AC heading found
+    if not criteria:
+        for node in blocks:
+            if node.get("type") != "heading":
+                criteria.extend(_block_criteria(node))
+    return criteria
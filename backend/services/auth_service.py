@@ -1,13 +1,33 @@
 """
 Authentication Service - Handles GitHub OAuth and JWT
+
+Resolving a request's user is cached in-process: verified tokens map to
+their user id, and user ids to a snapshot of the user's columns. A cache
+hit attaches the snapshot to the request's session without a SELECT, so
+routes still get a regular User they can modify and commit. Whoever
+commits a change to a user calls invalidate_user(); other processes see
+it after AUTH_USER_CACHE_TTL at the latest.
 """
+import time
+from typing import Any, Dict
+
 import httpx
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 from fastapi import HTTPException, status
 from config.settings import settings
-from database import User
+from database import User, release_connection
+from services.cache import TTLCache
+
+USER_COLUMNS = tuple(attr.key for attr in inspect(User).column_attrs)
+
+
+def user_snapshot(user: User) -> Dict[str, Any]:
+	"""Plain copy of a user's column values, safe to share between sessions."""
+	return {key: getattr(user, key) for key in USER_COLUMNS}
 
 
 class AuthService:
@@ -17,6 +37,21 @@ class AuthService:
 		self.github_redirect_uri = settings.GITHUB_REDIRECT_URI
 		self.jwt_secret = settings.JWT_SECRET_KEY
 		self.jwt_algorithm = settings.JWT_ALGORITHM
+		# token -> (user_id, exp); user_id -> user_snapshot()
+		self._token_cache = TTLCache(maxsize=4096)
+		self._user_cache = TTLCache(maxsize=1024, ttl=settings.AUTH_USER_CACHE_TTL)
+		# Bumped on every invalidation so a lookup that raced with one is not cached
+		self._invalidations = 0
+
+	def invalidate_user(self, user_id: int) -> None:
+		"""Drop the cached snapshot of *user_id*; call after committing a change to the user."""
+		self._user_cache.pop(user_id)
+		self._invalidations += 1
+
+	def clear_caches(self) -> None:
+		self._token_cache.clear()
+		self._user_cache.clear()
+		self._invalidations += 1
 
 	def get_github_oauth_url(self, new_account: bool = False, login_hint: str | None = None) -> str:
 		"""
@@ -91,12 +126,12 @@ class AuthService:
 
 			return response.json()
 
-	def create_or_update_user(self, db: Session, github_user: dict, access_token: str) -> User:
+	async def create_or_update_user(self, db: AsyncSession, github_user: dict, access_token: str) -> User:
 		"""
 		Create new user or update existing user in database
 		"""
 		# Check if user exists
-		user = db.query(User).filter(User.github_id == str(github_user["id"])).first()
+		user = await db.scalar(select(User).where(User.github_id == str(github_user["id"])))
 
 		if user:
 			# Update existing user
@@ -118,8 +153,9 @@ class AuthService:
 			)
 			db.add(user)
 
-		db.commit()
-		db.refresh(user)
+		await db.commit()
+		await db.refresh(user)
+		self.invalidate_user(user.id)
 		return user
 
 	def create_jwt_token(self, user_id: int) -> str:
@@ -138,6 +174,9 @@ class AuthService:
 		"""
 		Verify JWT token and return user_id
 		"""
+		cached = self._token_cache.get(token)
+		if cached is not None and time.time() < cached[1]:
+			return cached[0]
 		try:
 			payload = jwt.decode(token, self.jwt_secret, algorithms=[self.jwt_algorithm])
 			user_id: int = int(payload.get("sub"))
@@ -146,6 +185,9 @@ class AuthService:
 					status_code=status.HTTP_401_UNAUTHORIZED,
 					detail="Invalid authentication credentials"
 				)
+			# Tokens without an expiry are still re-checked every so often
+			expires = payload.get("exp") or time.time() + settings.AUTH_USER_CACHE_TTL
+			self._token_cache.set(token, (user_id, expires))
 			return user_id
 		except JWTError:
 			raise HTTPException(
@@ -153,12 +195,23 @@ class AuthService:
 				detail="Invalid authentication credentials"
 			)
 
-	def get_current_user(self, db: Session, token: str) -> User:
+	async def get_current_user(self, db: AsyncSession, token: str) -> User:
 		"""
 		Get current user from JWT token
 		"""
 		user_id = self.verify_jwt_token(token)
-		user = db.query(User).filter(User.id == user_id).first()
+		snapshot = self._user_cache.get(user_id)
+		if snapshot is not None:
+			cached = User(**snapshot)
+			make_transient_to_detached(cached)
+			return await db.merge(cached, load=False)
+
+		invalidations = self._invalidations
+		in_transaction = db.in_transaction()
+		user = await db.get(User, user_id)
+		if not in_transaction:
+			# Don't hold the connection through whatever slow work the route does next
+			await release_connection(db)
 
 		if not user:
 			raise HTTPException(
@@ -166,6 +219,8 @@ class AuthService:
 				detail="User not found"
 			)
 
+		if invalidations == self._invalidations:
+			self._user_cache.set(user_id, user_snapshot(user))
 		return user
 
 # Singleton
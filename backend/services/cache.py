@@ -0,0 +1,58 @@
+"""
+In-process caches shared by the service singletons.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+
+
+class TTLCache:
+	"""
+	Small LRU cache with optional per-entry expiry.
+
+	ttl=None keeps entries until they are evicted by size (useful for
+	content-addressed data such as trees keyed by commit SHA).
+	"""
+
+	def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+	def get(self, key: Hashable, default: Any = None) -> Any:
+		value, age = self.get_with_age(key)
+		if value is None or (self.ttl is not None and age > self.ttl):
+			return default
+		return value
+
+	def get_with_age(self, key: Hashable) -> Tuple[Any, float]:
+		"""Return (value, seconds since stored) even if expired, or (None, inf)."""
+		entry = self._data.get(key)
+		if entry is None:
+			return None, float("inf")
+		self._data.move_to_end(key)
+		stored_at, value = entry
+		return value, time.monotonic() - stored_at
+
+	def set(self, key: Hashable, value: Any) -> None:
+		self._data[key] = (time.monotonic(), value)
+		self._data.move_to_end(key)
+		while len(self._data) > self.maxsize:
+			self._data.popitem(last=False)
+
+	def pop(self, key: Hashable) -> Any:
+		entry = self._data.pop(key, None)
+		return entry[1] if entry else None
+
+	def keys(self) -> List[Hashable]:
+		"""Snapshot of the stored keys (expired entries included)."""
+		return list(self._data)
+
+	def clear(self) -> None:
+		self._data.clear()
+
+	def __contains__(self, key: Hashable) -> bool:
+		return self.get(key) is not None
+
+	def __len__(self) -> int:
+		return len(self._data)
@@ -343,92 +343,87 @@ class GapDetectionService:
 
         return {"source": source_matches, "tests": test_matches}
 
-    def analyze_gaps(
+    def classify_task(
         self,
-        jira_tasks: List[Dict[str, Any]],
+        task: Dict[str, Any],
         repo_files: List[str],
-        repo_name: str,
         file_contents: Dict[str, str] = None,
     ) -> Dict[str, Any]:
-        gaps: List[Dict[str, Any]] = []
-
-        for task in jira_tasks:
-            status  = task.get("status", "")
-            summary = task.get("summary", "")
-
-            # 1. Non-code detection — before keyword extraction
-            status_category = task.get("status_category", "new")
-
-            if self._is_non_code_task(summary):
-                gaps.append({
-                    "task_key":            task["task_key"],
-                    "summary":             summary,
-                    "status":              status,
-                    "status_category":     status_category,
-                    "acceptance_criteria": task.get("acceptance_criteria", ""),
-                    "gap_type":            GAP_NON_CODE_TASK,
-                    "keywords":            [],
-                    "source_files":        [],
-                    "test_files":          [],
-                })
-                continue
-
-            keywords = self._extract_keywords(
-                summary,
-                task.get("acceptance_criteria", ""),
-            )
-
-            # 2. Empty keywords after filtering → nothing technical to search for
-            if not keywords:
-                gaps.append({
-                    "task_key":            task["task_key"],
-                    "summary":             summary,
-                    "status":              status,
-                    "status_category":     status_category,
-                    "acceptance_criteria": task.get("acceptance_criteria", ""),
-                    "gap_type":            GAP_NON_CODE_TASK,
-                    "keywords":            [],
-                    "source_files":        [],
-                    "test_files":          [],
-                })
-                continue
+        status  = task.get("status", "")
+        summary = task.get("summary", "")
 
-            # 3. File matching (path-based + optional content-based for test files)
-            related = self._find_related_files(keywords, repo_files, file_contents)
-            source  = related["source"]
-            tests   = related["tests"]
-
-            # Jira status constrains the maximum possible gap type.
-            # A "To Do" task cannot have complete code+tests by definition;
-            # an "In Progress" task may have code but should not be marked done.
-            status_category = task.get("status_category", "done")
-            if status_category == "new":
-                # Not started in Jira → treat as not_started regardless of file matches
-                gap_type = GAP_NOT_STARTED
-            elif status_category == "indeterminate":
-                # In progress → code may exist but not fully tested
-                gap_type = GAP_UNTESTED if source else GAP_NOT_STARTED
-            else:
-                # Done (or unknown) → use file evidence to determine completeness
-                if source and tests:
-                    gap_type = GAP_COMPLETE
-                elif source:
-                    gap_type = GAP_UNTESTED
-                else:
-                    gap_type = GAP_NOT_STARTED
+        # 1. Non-code detection — before keyword extraction
+        status_category = task.get("status_category", "new")
 
-            gaps.append({
+        if self._is_non_code_task(summary):
+            return {
+                "task_key":            task["task_key"],
+                "summary":             summary,
+                "status":              status,
+                "status_category":     status_category,
+                "acceptance_criteria": task.get("acceptance_criteria", ""),
+                "gap_type":            GAP_NON_CODE_TASK,
+                "keywords":            [],
+                "source_files":        [],
+                "test_files":          [],
+            }
+
+        keywords = self._extract_keywords(
+            summary,
+            task.get("acceptance_criteria", ""),
+        )
+
+        # 2. Empty keywords after filtering → nothing technical to search for
+        if not keywords:
+            return {
                 "task_key":            task["task_key"],
                 "summary":             summary,
                 "status":              status,
                 "status_category":     status_category,
                 "acceptance_criteria": task.get("acceptance_criteria", ""),
-                "gap_type":            gap_type,
-                "keywords":            keywords,
-                "source_files":        source,
-                "test_files":          tests,
-            })
+                "gap_type":            GAP_NON_CODE_TASK,
+                "keywords":            [],
+                "source_files":        [],
+                "test_files":          [],
+            }
+
+        # 3. File matching (path-based + optional content-based for test files)
+        related = self._find_related_files(keywords, repo_files, file_contents)
+        source  = related["source"]
+        tests   = related["tests"]
+
+        # Jira status constrains the maximum possible gap type.
+        # A "To Do" task cannot have complete code+tests by definition;
+        # an "In Progress" task may have code but should not be marked done.
+        status_category = task.get("status_category", "done")
+        if status_category == "new":
+            # Not started in Jira → treat as not_started regardless of file matches
+            gap_type = GAP_NOT_STARTED
+        elif status_category == "indeterminate":
+            # In progress → code may exist but not fully tested
+            gap_type = GAP_UNTESTED if source else GAP_NOT_STARTED
+        else:
+            # Done (or unknown) → use file evidence to determine completeness
+            if source and tests:
+                gap_type = GAP_COMPLETE
+            elif source:
+                gap_type = GAP_UNTESTED
+            else:
+                gap_type = GAP_NOT_STARTED
+
+        return {
+            "task_key":            task["task_key"],
+            "summary":             summary,
+            "status":              status,
+            "status_category":     status_category,
+            "acceptance_criteria": task.get("acceptance_criteria", ""),
+            "gap_type":            gap_type,
+            "keywords":            keywords,
+            "source_files":        source,
+            "test_files":          tests,
+        }
 
+    def compute_stats(self, gaps: List[Dict[str, Any]]) -> Dict[str, Any]:
         total = len(gaps)
 
         def count(t: str) -> int:
@@ -442,16 +437,26 @@ class GapDetectionService:
         cmp = count(GAP_COMPLETE)
         nct = count(GAP_NON_CODE_TASK)
 
+        return {
+            "total":           total,
+            "not_started":     ns,  "not_started_pct":   pct(ns),
+            "untested":        ut,  "untested_pct":      pct(ut),
+            "complete":        cmp, "complete_pct":      pct(cmp),
+            "non_code_task":   nct, "non_code_task_pct": pct(nct),
+        }
+
+    def analyze_gaps(
+        self,
+        jira_tasks: List[Dict[str, Any]],
+        repo_files: List[str],
+        repo_name: str,
+        file_contents: Dict[str, str] = None,
+    ) -> Dict[str, Any]:
+        gaps = [self.classify_task(task, repo_files, file_contents) for task in jira_tasks]
         return {
             "repo_name": repo_name,
             "gaps": gaps,
-            "stats": {
-                "total":           total,
-                "not_started":     ns,  "not_started_pct":   pct(ns),
-                "untested":        ut,  "untested_pct":      pct(ut),
-                "complete":        cmp, "complete_pct":      pct(cmp),
-                "non_code_task":   nct, "non_code_task_pct": pct(nct),
-            },
+            "stats": self.compute_stats(gaps),
         }
 
 
@@ -0,0 +1,151 @@
+"""
+Gap analysis history — every /gaps/analyze run is kept as a GapAnalysisRun.
+
+The run's stats are plain integer columns, so trends are aggregated in SQL
+without touching the per-task results. Those are stored as one
+zlib-compressed JSON blob of [task_key, gap_type] pairs and are only
+unpacked when a single run is opened.
+"""
+import json
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import GapAnalysisRun
+
+GAP_TYPES = ("not_started", "untested", "complete", "non_code_task")
+PAYLOAD_VERSION = 1
+
+# Stat columns only — selecting these never loads the results blob
+RUN_STAT_COLUMNS = (
+    GapAnalysisRun.id,
+    GapAnalysisRun.repo_owner,
+    GapAnalysisRun.repo_name,
+    GapAnalysisRun.created_at,
+    GapAnalysisRun.total,
+    *(getattr(GapAnalysisRun, t) for t in GAP_TYPES),
+)
+
+
+def pack_results(gaps: List[Dict[str, Any]]) -> bytes:
+    payload = {"v": PAYLOAD_VERSION, "tasks": [[g["task_key"], g["gap_type"]] for g in gaps]}
+    return zlib.compress(json.dumps(payload, separators=(",", ":")).encode(), 9)
+
+
+def unpack_results(blob: bytes) -> List[Dict[str, str]]:
+    payload = json.loads(zlib.decompress(blob))
+    return [{"task_key": key, "gap_type": gap_type} for key, gap_type in payload["tasks"]]
+
+
+def run_stats(row) -> Dict[str, Any]:
+    """compute_stats-shaped dict (counts and percentages) from a run's stat columns."""
+    total = row.total
+
+    def pct(n: int) -> float:
+        return round(n / total * 100, 1) if total else 0.0
+
+    stats: Dict[str, Any] = {"total": total}
+    for gap_type in GAP_TYPES:
+        count = getattr(row, gap_type)
+        stats[gap_type] = count
+        stats[f"{gap_type}_pct"] = pct(count)
+    return stats
+
+
+class GapHistoryService:
+
+    def record_run(
+        self,
+        db: AsyncSession,
+        integration_id: int,
+        repo_owner: str,
+        repo_name: str,
+        gaps: List[Dict[str, Any]],
+        stats: Dict[str, Any],
+    ) -> GapAnalysisRun:
+        """Add a snapshot of one analysis to the session (not flushed or committed)."""
+        run = GapAnalysisRun(
+            jira_integration_id=integration_id,
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+            total=stats["total"],
+            results=pack_results(gaps),
+            **{t: stats[t] for t in GAP_TYPES},
+        )
+        db.add(run)
+        return run
+
+    async def list_runs(
+        self, db: AsyncSession, integration_id: int, repo_name: Optional[str], limit: int
+    ) -> List[Dict[str, Any]]:
+        """Most recent runs first, stats only."""
+        stmt = select(*RUN_STAT_COLUMNS).where(GapAnalysisRun.jira_integration_id == integration_id)
+        if repo_name:
+            stmt = stmt.where(GapAnalysisRun.repo_name == repo_name)
+        rows = (await db.execute(
+            stmt.order_by(GapAnalysisRun.created_at.desc(), GapAnalysisRun.id.desc()).limit(limit)
+        )).all()
+        return [
+            {
+                "id": r.id,
+                "repo_owner": r.repo_owner,
+                "repo_name": r.repo_name,
+                "created_at": r.created_at.isoformat(),
+                "stats": run_stats(r),
+            }
+            for r in rows
+        ]
+
+    async def get_run(
+        self, db: AsyncSession, integration_id: int, run_id: int
+    ) -> Optional[Dict[str, Any]]:
+        run = await db.scalar(select(GapAnalysisRun).where(
+            GapAnalysisRun.id == run_id,
+            GapAnalysisRun.jira_integration_id == integration_id,
+        ))
+        if run is None:
+            return None
+        return {
+            "id": run.id,
+            "repo_owner": run.repo_owner,
+            "repo_name": run.repo_name,
+            "created_at": run.created_at.isoformat(),
+            "stats": run_stats(run),
+            "gaps": unpack_results(run.results),
+        }
+
+    async def trend(
+        self, db: AsyncSession, integration_id: int, repo_name: str, days: int
+    ) -> List[Dict[str, Any]]:
+        """
+        One point per day with runs in the last *days* days, oldest first:
+        the number of runs that day and the stats of the day's last run.
+        """
+        day = func.date(GapAnalysisRun.created_at)
+        buckets = (
+            select(
+                day.label("day"),
+                func.count().label("runs"),
+                func.max(GapAnalysisRun.id).label("last_id"),
+            )
+            .where(
+                GapAnalysisRun.jira_integration_id == integration_id,
+                GapAnalysisRun.repo_name == repo_name,
+                GapAnalysisRun.created_at >= datetime.utcnow() - timedelta(days=days),
+            )
+            .group_by(day)
+            .subquery()
+        )
+        rows = (await db.execute(
+            select(buckets.c.day, buckets.c.runs, GapAnalysisRun.total,
+                   *(getattr(GapAnalysisRun, t) for t in GAP_TYPES))
+            .join(GapAnalysisRun, GapAnalysisRun.id == buckets.c.last_id)
+            .order_by(buckets.c.day)
+        )).all()
+        return [{"date": str(r.day), "runs": r.runs, **run_stats(r)} for r in rows]
+
+
+gap_history_service = GapHistoryService()
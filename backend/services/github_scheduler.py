@@ -0,0 +1,199 @@
+"""
+GitHub Scheduler - Rate-limit-aware adaptive concurrency for GitHub API calls
+
+Each access token gets its own concurrency window. The window grows by one
+slot per window's worth of successful responses (additive increase) and is
+halved whenever GitHub signals a rate limit (multiplicative decrease).
+Rate-limit responses pause the whole window until Retry-After / reset and
+the request is retried. Pauses longer than MAX_RETRY_WAIT_SECONDS (a spent
+hourly budget) are not waited out: requests go through and the caller gets
+GitHub's 403/429 straight away.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Optional
+
+import httpx
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Never sleep longer than this for a single retry — the caller gets the 403 instead
+MAX_RETRY_WAIT_SECONDS = 60.0
+# GitHub asks clients to wait at least a minute after a secondary limit without Retry-After
+SECONDARY_LIMIT_DEFAULT_WAIT = 60.0
+# Keep this many primary-limit requests in reserve before pausing until reset
+REMAINING_RESERVE = 5
+# Secondary limits can arrive as a plain 403 whose body names them
+SECONDARY_LIMIT_MARKERS = ("secondary rate limit", "abuse detection")
+
+
+class RateLimitWindow:
+	"""AIMD concurrency window for a single GitHub token."""
+
+	def __init__(self, initial: int, maximum: int, minimum: int = 1):
+		self.minimum = minimum
+		self.maximum = maximum
+		self.window = float(initial)
+		self.in_flight = 0
+		self.paused_until = 0.0
+		self._waiters: Deque[asyncio.Future] = deque()
+
+	@property
+	def limit(self) -> int:
+		return max(self.minimum, int(self.window))
+
+	async def acquire(self) -> None:
+		while True:
+			delay = self.paused_until - time.monotonic()
+			# Longer pauses fail fast: GitHub answers the request with the limit error
+			if 0 < delay <= MAX_RETRY_WAIT_SECONDS:
+				await asyncio.sleep(delay)
+				continue
+			if self.in_flight < self.limit:
+				self.in_flight += 1
+				return
+			waiter = asyncio.get_running_loop().create_future()
+			self._waiters.append(waiter)
+			try:
+				await waiter
+			except asyncio.CancelledError:
+				if waiter in self._waiters:
+					self._waiters.remove(waiter)
+				elif waiter.done() and not waiter.cancelled():
+					# Woken just before the cancel: hand the slot to the next waiter
+					self._wake()
+				raise
+
+	def release(self) -> None:
+		self.in_flight -= 1
+		self._wake()
+
+	def _wake(self) -> None:
+		free = self.limit - self.in_flight
+		while free > 0 and self._waiters:
+			waiter = self._waiters.popleft()
+			if not waiter.done():
+				waiter.set_result(None)
+				free -= 1
+
+	def observe(self, response: httpx.Response) -> Optional[float]:
+		"""
+		Update the window from the response headers.
+		Returns the number of seconds to wait before retrying, or None when
+		the response should be handed back to the caller.
+		"""
+		now = time.time()
+		headers = response.headers
+		remaining = _int_header(headers, "x-ratelimit-remaining")
+		reset_at = _int_header(headers, "x-ratelimit-reset")
+		retry_after = _int_header(headers, "retry-after")
+
+		secondary = response.status_code in (403, 429) and _names_secondary_limit(response)
+		limited = response.status_code in (403, 429) and (
+			retry_after is not None or remaining == 0 or secondary
+		)
+		if limited:
+			self.window = max(float(self.minimum), self.window / 2)
+			if retry_after is not None:
+				delay = float(retry_after)
+			elif remaining == 0 and reset_at:
+				delay = max(0.0, reset_at - now)
+			else:
+				delay = SECONDARY_LIMIT_DEFAULT_WAIT
+			if secondary:
+				delay = max(delay, SECONDARY_LIMIT_DEFAULT_WAIT)
+			self.paused_until = max(self.paused_until, time.monotonic() + delay)
+			return delay
+
+		if response.status_code < 400:
+			self.window = min(float(self.maximum), self.window + 1.0 / self.window)
+			self._wake()
+
+		# Primary budget almost spent — stop issuing requests until it resets
+		if remaining is not None and remaining <= REMAINING_RESERVE and reset_at:
+			self.paused_until = max(self.paused_until, time.monotonic() + max(0.0, reset_at - now))
+		return None
+
+
+def _names_secondary_limit(response: httpx.Response) -> bool:
+	try:
+		body = response.text
+	except httpx.ResponseNotRead:
+		return False
+	return any(marker in body.lower() for marker in SECONDARY_LIMIT_MARKERS)
+
+
+def _int_header(headers: httpx.Headers, name: str) -> Optional[int]:
+	value = headers.get(name)
+	if value is None:
+		return None
+	try:
+		return int(float(value))
+	except ValueError:
+		return None
+
+
+class GitHubScheduler:
+	"""Routes every GitHub request through the calling token's RateLimitWindow."""
+
+	def __init__(self, max_tokens: int = 1024):
+		self._windows: "OrderedDict[str, RateLimitWindow]" = OrderedDict()
+		self._max_tokens = max_tokens
+
+	def window_for(self, access_token: str) -> RateLimitWindow:
+		window = self._windows.get(access_token)
+		if window is None:
+			window = RateLimitWindow(
+				initial=settings.GITHUB_INITIAL_CONCURRENCY,
+				maximum=settings.GITHUB_MAX_CONCURRENCY,
+			)
+			self._windows[access_token] = window
+			if len(self._windows) > self._max_tokens:
+				self._windows.popitem(last=False)
+		else:
+			self._windows.move_to_end(access_token)
+		return window
+
+	async def send(
+		self,
+		client: httpx.AsyncClient,
+		access_token: str,
+		method: str,
+		url: str,
+		stream: bool = False,
+		max_retries: int = 3,
+		**kwargs,
+	) -> httpx.Response:
+		"""
+		Send a request inside the token's concurrency window, retrying on
+		rate-limit responses. With stream=True the caller must close the response.
+		"""
+		window = self.window_for(access_token)
+		attempt = 0
+		while True:
+			await window.acquire()
+			try:
+				request = client.build_request(method, url, **kwargs)
+				response = await client.send(request, stream=stream)
+			finally:
+				window.release()
+
+			if stream and response.status_code in (403, 429):
+				await response.aread()  # small error body; needed to spot secondary limits
+			delay = window.observe(response)
+			if delay is None or attempt >= max_retries or delay > MAX_RETRY_WAIT_SECONDS:
+				return response
+
+			attempt += 1
+			logger.warning(
+				"GitHub rate limit on %s (status %s) — window=%d, retrying in %.1fs",
+				url, response.status_code, window.limit, delay,
+			)
+			await response.aclose()
+
+
+# Singleton instance
+github_scheduler = GitHubScheduler()
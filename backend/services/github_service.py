@@ -1,67 +1,132 @@
 """
 GitHub Service - Fetch user repositories and repository data
 """
+import asyncio
+import codecs
+import logging
 import httpx
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
 from fastapi import HTTPException, status
+from config.settings import settings
 from database import User
+from services.cache import TTLCache
+from services.github_scheduler import github_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Same heuristic as git: a NUL byte in the first 8000 bytes means binary
+BINARY_SNIFF_BYTES = 8000
+# Git Trees entry type → contents-API node type
+TREE_ENTRY_TYPES = {"tree": "dir", "blob": "file", "commit": "submodule"}
 
 class GitHubService:
 	def __init__(self):
 		self.github_api_base = "https://api.github.com"
+		# (owner, repo, commit sha) → flat tree entries
+		self._tree_cache = TTLCache(maxsize=64)
+		# (access token, include_orgs) → formatted repository list
+		self._repo_cache = TTLCache(maxsize=512)
+		self._repo_refreshes: Dict[tuple, asyncio.Task] = {}
+
+	def _headers(self, access_token: str, accept: str = "application/vnd.github+json") -> Dict[str, str]:
+		return {
+			"Authorization": f"Bearer {access_token}",
+			"Accept": accept,
+			"X-GitHub-Api-Version": "2022-11-28",
+		}
+
+	async def _get(self, client: httpx.AsyncClient, access_token: str, url: str, **kwargs) -> httpx.Response:
+		"""GET through the per-token rate-limit scheduler."""
+		return await github_scheduler.send(client, access_token, "GET", url, **kwargs)
+
+	def _raise_for_api_error(self, response: httpx.Response) -> None:
+		if response.status_code != 200:
+			try:
+				message = response.json().get("message", response.text)
+			except ValueError:
+				message = response.text
+			raise HTTPException(
+				status_code=status.HTTP_400_BAD_REQUEST,
+				detail=f"GitHub API error {response.status_code}: {message}"
+			)
+
+	async def _get_all_pages(self, client: httpx.AsyncClient, access_token: str, url: str, params: Dict = None) -> List[Dict]:
+		"""
+		Fetch every page of a list endpoint. Page 1 is fetched first; once its
+		`Link: rel="last"` header gives the page count, pages 2..N run concurrently.
+		"""
+		params = {**(params or {}), "per_page": 100}
+		first = await self._get(client, access_token, url, headers=self._headers(access_token), params={**params, "page": 1})
+		self._raise_for_api_error(first)
+		items = list(first.json())
+
+		last_page = _last_page_number(first)
+		if last_page > 1:
+			responses = await asyncio.gather(*[
+				self._get(client, access_token, url, headers=self._headers(access_token), params={**params, "page": page})
+				for page in range(2, last_page + 1)
+			])
+			for response in responses:
+				self._raise_for_api_error(response)
+				items.extend(response.json())
+		return items
 
-	async def get_user_repositories(self, access_token: str) -> List[Dict]:
+	async def get_user_repositories(self, access_token: str, include_orgs: bool = False, refresh: bool = False) -> List[Dict]:
 		"""
 		Fetch all repositories for the authenticated user
 
+		Results are cached per token. Within GITHUB_REPO_CACHE_TTL the cached list
+		is returned as is; after that (up to GITHUB_REPO_CACHE_MAX_STALE) the
+		stale list is returned immediately and refreshed in the background.
+
 		Args:
 			access_token: GitHub access token from database
+			include_orgs: Also list every repository of each of the user's organisations
+			refresh: Bypass the cache
 
 		Returns:
 			List of repository dictionaries
 		"""
+		cache_key = (access_token, include_orgs)
+		cached, age = self._repo_cache.get_with_age(cache_key)
+		if cached is not None and not refresh and age <= settings.GITHUB_REPO_CACHE_MAX_STALE:
+			if age > settings.GITHUB_REPO_CACHE_TTL:
+				self._schedule_repo_refresh(access_token, include_orgs)
+			return cached
+		return await self._load_user_repositories(access_token, include_orgs)
+
+	def _schedule_repo_refresh(self, access_token: str, include_orgs: bool) -> None:
+		cache_key = (access_token, include_orgs)
+		if cache_key in self._repo_refreshes:
+			return
+
+		def _done(task: asyncio.Task) -> None:
+			self._repo_refreshes.pop(cache_key, None)
+			if not task.cancelled() and task.exception():
+				logger.warning("Background repository refresh failed: %s", task.exception())
+
+		task = asyncio.create_task(self._load_user_repositories(access_token, include_orgs))
+		task.add_done_callback(_done)
+		self._repo_refreshes[cache_key] = task
+
+	async def _load_user_repositories(self, access_token: str, include_orgs: bool) -> List[Dict]:
 		try:
 			async with httpx.AsyncClient() as client:
-				response = await client.get(
+				user_repos = self._get_all_pages(
+					client,
+					access_token,
 					f"{self.github_api_base}/user/repos",
-					headers={
-						"Authorization": f"Bearer {access_token}",
-						"Accept": "application/vnd.github+json",
-						"X-GitHub-Api-Version": "2022-11-28"
-					},
 					params={
 						"sort": "updated",
-						"per_page": 100,
 						"type": "all"  # owner, public, private, member
 					}
 				)
-
-				if response.status_code != 200:
-					raise HTTPException(
-						status_code=status.HTTP_400_BAD_REQUEST,
-						detail=f"GitHub API error {response.status_code}: {response.json().get('message', response.text)}"
-					)
-
-				repos = response.json()
-
-				# Format the repository data
-				formatted_repos = []
-				for repo in repos:
-					formatted_repos.append({
-						"id": repo["id"],
-						"name": repo["name"],
-						"full_name": repo["full_name"],
-						"description": repo.get("description", "No description"),
-						"private": repo["private"],
-						"html_url": repo["html_url"],
-						"language": repo.get("language", "Unknown"),
-						"updated_at": repo["updated_at"],
-						"size": repo["size"],
-						"default_branch": repo["default_branch"],
-						"topics": repo.get("topics", [])
-					})
-
-				return formatted_repos
+				if include_orgs:
+					repo_lists = await asyncio.gather(user_repos, self._get_org_repositories(client, access_token))
+					repos = [repo for repo_list in repo_lists for repo in repo_list]
+				else:
+					repos = await user_repos
 
 		except httpx.HTTPError as e:
 			raise HTTPException(
@@ -69,6 +134,45 @@ class GitHubService:
 				detail=f"Error communicating with GitHub API: {str(e)}"
 			)
 
+		# Format the repository data (org fan-out can return a repo twice)
+		formatted_repos = []
+		seen_ids = set()
+		for repo in repos:
+			if repo["id"] in seen_ids:
+				continue
+			seen_ids.add(repo["id"])
+			formatted_repos.append({
+				"id": repo["id"],
+				"name": repo["name"],
+				"full_name": repo["full_name"],
+				"description": repo.get("description", "No description"),
+				"private": repo["private"],
+				"html_url": repo["html_url"],
+				"language": repo.get("language", "Unknown"),
+				"updated_at": repo["updated_at"],
+				"size": repo["size"],
+				"default_branch": repo["default_branch"],
+				"topics": repo.get("topics", [])
+			})
+		formatted_repos.sort(key=lambda r: r["updated_at"] or "", reverse=True)
+
+		self._repo_cache.set((access_token, include_orgs), formatted_repos)
+		return formatted_repos
+
+	async def _get_org_repositories(self, client: httpx.AsyncClient, access_token: str) -> List[Dict]:
+		"""Every repository of every organisation the user belongs to, fetched per org concurrently."""
+		orgs = await self._get_all_pages(client, access_token, f"{self.github_api_base}/user/orgs")
+		repo_lists = await asyncio.gather(*[
+			self._get_all_pages(
+				client,
+				access_token,
+				f"{self.github_api_base}/orgs/{org['login']}/repos",
+				params={"sort": "updated", "type": "all"},
+			)
+			for org in orgs
+		])
+		return [repo for repo_list in repo_lists for repo in repo_list]
+
 	async def get_repository_structure(self, access_token: str, owner: str, repo: str, path: str = "") -> Dict:
 		"""
 		Get the file/folder structure of a repository
@@ -85,14 +189,7 @@ class GitHubService:
 		try:
 			async with httpx.AsyncClient() as client:
 				url = f"{self.github_api_base}/repos/{owner}/{repo}/contents/{path}"
-				response = await client.get(
-					url,
-					headers={
-						"Authorization": f"Bearer {access_token}",
-						"Accept": "application/vnd.github+json",
-						"X-GitHub-Api-Version": "2022-11-28"
-					}
-				)
+				response = await self._get(client, access_token, url, headers=self._headers(access_token))
 
 				if response.status_code != 200:
 					raise HTTPException(
@@ -108,83 +205,239 @@ class GitHubService:
 				detail=f"Error fetching repository structure: {str(e)}"
 			)
 
-	async def _fetch_file_content(self, client: httpx.AsyncClient, access_token: str, owner: str, repo: str, path: str) -> str:
-		"""Fetch file content using a provided httpx client (enables connection reuse)."""
-		import base64
+	async def _read_file(self, client: httpx.AsyncClient, access_token: str, owner: str, repo: str, path: str, limit: int) -> Tuple[str, bool, bool]:
+		"""
+		Stream a file body using the raw media type and keep at most `limit` bytes.
+		Returns (text, truncated, binary); binary files (NUL byte in the head)
+		come back as empty text. Only the kept bytes are decoded; a multi-byte
+		character cut by the cap is dropped.
+		"""
 		url = f"{self.github_api_base}/repos/{owner}/{repo}/contents/{path}"
-		response = await client.get(
+		chunks: List[bytes] = []
+		received = 0
+		truncated = False
+		response = await self._get(
+			client,
+			access_token,
 			url,
-			headers={
-				"Authorization": f"Bearer {access_token}",
-				"Accept": "application/vnd.github+json",
-				"X-GitHub-Api-Version": "2022-11-28",
-			},
+			headers=self._headers(access_token, accept="application/vnd.github.raw+json"),
+			stream=True,
 		)
-		if response.status_code != 200:
-			raise HTTPException(
-				status_code=status.HTTP_400_BAD_REQUEST,
-				detail=f"Failed to fetch file content: {response.text}",
-			)
-		data = response.json()
-		return base64.b64decode(data["content"]).decode("utf-8")
+		try:
+			if response.status_code != 200:
+				await response.aread()
+				raise HTTPException(
+					status_code=status.HTTP_400_BAD_REQUEST,
+					detail=f"Failed to fetch file content: {response.text}",
+				)
+			async for chunk in response.aiter_bytes():
+				if received < BINARY_SNIFF_BYTES and b"\x00" in chunk[:BINARY_SNIFF_BYTES - received]:
+					return "", False, True
+				if received + len(chunk) > limit:
+					truncated = True
+					chunk = chunk[:limit - received]
+				chunks.append(chunk)
+				received += len(chunk)
+				if truncated:
+					break
+		finally:
+			await response.aclose()
+		decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+		return decoder.decode(b"".join(chunks), final=not truncated), truncated, False
 
-	async def get_file_content(self, access_token: str, owner: str, repo: str, path: str, client: httpx.AsyncClient = None) -> str:
+	async def _fetch_file_content(self, client: httpx.AsyncClient, access_token: str, owner: str, repo: str, path: str, max_bytes: int = None) -> str:
 		"""
-		Get the content of a specific file.
+		Head of a file for prompts and gap analysis: at most `max_bytes`
+		(defaults to settings.GITHUB_CONTENT_MAX_BYTES), "" for binary files.
+		"""
+		limit = settings.GITHUB_CONTENT_MAX_BYTES if max_bytes is None else max_bytes
+		text, _, _ = await self._read_file(client, access_token, owner, repo, path, limit)
+		return text
+
+	async def get_file_content(self, access_token: str, owner: str, repo: str, path: str, client: httpx.AsyncClient = None, max_bytes: int = None) -> str:
+		"""
+		Get the content of a specific file, capped at `max_bytes`
+		(defaults to settings.GITHUB_CONTENT_MAX_BYTES).
 		Pass an existing `client` to reuse the connection pool across multiple calls.
 		"""
 		try:
 			if client is not None:
-				return await self._fetch_file_content(client, access_token, owner, repo, path)
+				return await self._fetch_file_content(client, access_token, owner, repo, path, max_bytes)
 			async with httpx.AsyncClient() as _client:
-				return await self._fetch_file_content(_client, access_token, owner, repo, path)
+				return await self._fetch_file_content(_client, access_token, owner, repo, path, max_bytes)
+		except httpx.HTTPError as e:
+			raise HTTPException(
+				status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+				detail=f"Error fetching file content: {str(e)}",
+			)
+
+	async def get_file_preview(self, access_token: str, owner: str, repo: str, path: str) -> Dict:
+		"""
+		File for display: up to settings.GITHUB_PREVIEW_MAX_BYTES, with flags
+		telling the client when it was cut off or is binary (and so empty).
+		"""
+		try:
+			async with httpx.AsyncClient() as client:
+				text, truncated, binary = await self._read_file(
+					client, access_token, owner, repo, path, settings.GITHUB_PREVIEW_MAX_BYTES
+				)
 		except httpx.HTTPError as e:
 			raise HTTPException(
 				status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
 				detail=f"Error fetching file content: {str(e)}",
 			)
+		return {"content": text, "truncated": truncated, "binary": binary}
+
+	async def _resolve_commit_sha(self, client: httpx.AsyncClient, access_token: str, owner: str, repo: str, ref: str = "HEAD") -> str:
+		"""Resolve `ref` (default branch HEAD by default) to a commit SHA in one call."""
+		response = await self._get(
+			client,
+			access_token,
+			f"{self.github_api_base}/repos/{owner}/{repo}/commits/{ref}",
+			headers=self._headers(access_token, accept="application/vnd.github.sha"),
+		)
+		if response.status_code != 200:
+			raise HTTPException(status_code=400, detail="Failed to resolve repository HEAD commit")
+		return response.text.strip()
+
+	async def _fetch_tree(self, client: httpx.AsyncClient, access_token: str, owner: str, repo: str, sha: str, recursive: bool) -> Dict:
+		response = await self._get(
+			client,
+			access_token,
+			f"{self.github_api_base}/repos/{owner}/{repo}/git/trees/{sha}",
+			headers=self._headers(access_token),
+			params={"recursive": "1"} if recursive else None,
+		)
+		if response.status_code != 200:
+			raise HTTPException(status_code=400, detail="Failed to fetch repository tree")
+		return response.json()
+
+	async def _get_tree_items(self, client: httpx.AsyncClient, access_token: str, owner: str, repo: str, sha: str) -> List[Dict]:
+		"""
+		Flat list of every tree entry at commit `sha` ({path, type, size}).
+		Trees are immutable per SHA, so results are cached without expiry.
+		"""
+		cache_key = (owner.lower(), repo.lower(), sha)
+		items = self._tree_cache.get(cache_key)
+		if items is not None:
+			return items
+
+		data = await self._fetch_tree(client, access_token, owner, repo, sha, recursive=True)
+		if data.get("truncated"):
+			logger.info("Git tree for %s/%s@%s is truncated — fetching subtrees", owner, repo, sha)
+			items = await self._collect_truncated_tree(client, access_token, owner, repo, sha)
+		else:
+			items = [_tree_item(entry) for entry in data.get("tree", [])]
+		self._tree_cache.set(cache_key, items)
+		return items
+
+	async def _collect_truncated_tree(self, client: httpx.AsyncClient, access_token: str, owner: str, repo: str, sha: str) -> List[Dict]:
+		"""
+		Rebuild a tree that exceeded GitHub's recursive limit, one level at a time.
+		Every subtree of a level is fetched in parallel (bounded by the per-token
+		scheduler window); subtrees that are small enough come back recursively in
+		one call, only still-truncated ones are expanded further by SHA.
+		"""
+		async def expand(base: str, tree_sha: str, recursive: bool):
+			data = await self._fetch_tree(client, access_token, owner, repo, tree_sha, recursive)
+			if recursive and data.get("truncated"):
+				data = await self._fetch_tree(client, access_token, owner, repo, tree_sha, recursive=False)
+				recursive = False
+			entries = data.get("tree", [])
+			subtrees = [] if recursive else [
+				(f"{base}{entry['path']}/", entry["sha"]) for entry in entries if entry.get("type") == "tree"
+			]
+			return [_tree_item(entry, base) for entry in entries], subtrees
+
+		items, pending = await expand("", sha, recursive=False)
+		while pending:
+			results = await asyncio.gather(*[expand(base, tree_sha, True) for base, tree_sha in pending])
+			pending = []
+			for entries, subtrees in results:
+				items.extend(entries)
+				pending.extend(subtrees)
+		return items
+
+	async def get_repository_tree(self, access_token: str, owner: str, repo: str, path: str = "", max_depth: Optional[int] = None) -> Dict:
+		"""
+		Nested file tree built from a single recursive Git Trees response.
+
+		Args:
+			path: Only return the subtree below this directory (optional)
+			max_depth: Levels to include below `path`; deeper directories are
+				returned without a `children` key (optional)
+
+		Returns:
+			{"sha": commit SHA, "tree": [nodes]}
+		"""
+		try:
+			async with httpx.AsyncClient(timeout=30) as client:
+				sha = await self._resolve_commit_sha(client, access_token, owner, repo)
+				items = await self._get_tree_items(client, access_token, owner, repo, sha)
+		except httpx.HTTPError as e:
+			raise HTTPException(status_code=500, detail=f"Error fetching repo tree: {str(e)}")
+		return {"sha": sha, "tree": build_nested_tree(items, path, max_depth)}
 
 	async def get_flat_file_list(self, access_token: str, owner: str, repo: str) -> List[str]:
 		"""
 		Return every file path in the repo using the Git Trees API (recursive=1).
-		Single API call — avoids the N+1 directory recursion pattern.
+		HEAD SHA + one tree call (cached per SHA) — avoids the N+1 directory recursion pattern.
 		"""
 		try:
 			async with httpx.AsyncClient(timeout=30) as client:
-				# First get default branch
-				repo_resp = await client.get(
-					f"{self.github_api_base}/repos/{owner}/{repo}",
-					headers={
-						"Authorization": f"Bearer {access_token}",
-						"Accept": "application/vnd.github+json",
-						"X-GitHub-Api-Version": "2022-11-28",
-					},
-				)
-				if repo_resp.status_code != 200:
-					raise HTTPException(status_code=400, detail="Failed to fetch repo metadata")
-				default_branch = repo_resp.json().get("default_branch", "main")
-
-				# Fetch full tree recursively in one call
-				tree_resp = await client.get(
-					f"{self.github_api_base}/repos/{owner}/{repo}/git/trees/{default_branch}",
-					headers={
-						"Authorization": f"Bearer {access_token}",
-						"Accept": "application/vnd.github+json",
-						"X-GitHub-Api-Version": "2022-11-28",
-					},
-					params={"recursive": "1"},
-				)
-				if tree_resp.status_code != 200:
-					raise HTTPException(status_code=400, detail="Failed to fetch repository tree")
-
-				data = tree_resp.json()
-				return [
-					item["path"]
-					for item in data.get("tree", [])
-					if item.get("type") == "blob"
-				]
+				sha = await self._resolve_commit_sha(client, access_token, owner, repo)
+				items = await self._get_tree_items(client, access_token, owner, repo, sha)
+				return [item["path"] for item in items if item["type"] == "blob"]
 		except httpx.HTTPError as e:
 			raise HTTPException(status_code=500, detail=f"Error fetching repo tree: {str(e)}")
 
+
+def _last_page_number(response: httpx.Response) -> int:
+	last = response.links.get("last")
+	if not last:
+		return 1
+	page = parse_qs(urlparse(last["url"]).query).get("page", ["1"])[0]
+	return int(page) if page.isdigit() else 1
+
+
+def _tree_item(entry: Dict, base: str = "") -> Dict:
+	return {"path": f"{base}{entry['path']}", "type": entry["type"], "size": entry.get("size", 0)}
+
+
+def build_nested_tree(items: List[Dict], path: str = "", max_depth: Optional[int] = None) -> List[Dict]:
+	"""
+	Turn flat Git Trees entries into the nested {name, path, type, size, children}
+	shape the contents-API walk used to return. Types are mapped to "dir" / "file"
+	(submodules become "submodule").
+	"""
+	root = path.strip("/")
+	prefix = f"{root}/" if root else ""
+	nodes: Dict[str, Dict] = {}
+	for item in items:
+		item_path = item["path"]
+		if not item_path.startswith(prefix):
+			continue
+		depth = item_path.count("/") - prefix.count("/") + 1
+		if max_depth is not None and depth > max_depth:
+			continue
+		node = {
+			"name": item_path.rsplit("/", 1)[-1],
+			"path": item_path,
+			"type": TREE_ENTRY_TYPES.get(item["type"], "file"),
+			"size": item.get("size", 0),
+		}
+		if node["type"] == "dir" and (max_depth is None or depth < max_depth):
+			node["children"] = []
+		nodes[item_path] = node
+
+	tree: List[Dict] = []
+	for item_path, node in nodes.items():
+		parent_path = item_path.rsplit("/", 1)[0] if "/" in item_path else ""
+		if parent_path == root:
+			tree.append(node)
+		elif parent_path in nodes and "children" in nodes[parent_path]:
+			nodes[parent_path]["children"].append(node)
+	return tree
+
 # Singleton instance
 github_service = GitHubService()
\ No newline at end of file
@@ -1,15 +1,39 @@
 import asyncio
 import base64
-import requests
+import logging
 import httpx
 from urllib.parse import urlparse, urlencode
-from typing import List, Dict, Optional, Any
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Any, AsyncIterator, Awaitable, Callable, TypeVar
 from fastapi import HTTPException, status
 from config.settings import settings
+from database import SessionLocal, User
+from services.auth_service import auth_service
+from services.cache import TTLCache
+from services.jira_transport import JiraTransport
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ISSUE_SEARCH_FIELDS = "summary,status,description,issuetype,priority,updated"
+# Listing phase of a task sync — descriptions are fetched separately, only where needed
+ISSUE_LIST_FIELDS   = "summary,status,updated"
 
 
 class JiraService:
 
+    def __init__(self):
+        # Pooled client, concurrency cap, retries and circuit breaker per Jira base URL
+        self._transport = JiraTransport()
+
+    async def _request(self, base: str, method: str, url: str, **kwargs) -> httpx.Response:
+        return await self._transport.request(base, method, url, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close every pooled client (called on application shutdown)."""
+        await self._transport.aclose()
+
     def _normalize_url(self, instance_url: str) -> str:
         """Strip any path from the URL — keep only scheme + host."""
         parsed = urlparse(instance_url.strip())
@@ -25,7 +49,7 @@ class JiraService:
             "Content-Type": "application/json",
         }
 
-    def _jira_error_message(self, resp: requests.Response) -> str:
+    def _jira_error_message(self, resp: httpx.Response) -> str:
         """Extract a human-readable message from a Jira error response."""
         try:
             body = resp.json()
@@ -39,20 +63,22 @@ class JiraService:
             pass
         return f"HTTP {resp.status_code} from Jira"
 
-    def verify_connection(self, instance_url: str, email: str, api_token: str) -> dict:
+    async def verify_connection(self, instance_url: str, email: str, api_token: str) -> dict:
         base = self._normalize_url(instance_url)
         url  = f"{base}/rest/api/3/myself"
         try:
-            resp = requests.get(
+            resp = await self._request(
+                base, "GET",
                 url,
                 headers=self._make_headers(email, api_token),
                 timeout=10,
-                allow_redirects=True,
+                # Fail fast on a mistyped instance URL
+                max_retries=1,
             )
-        except requests.exceptions.ConnectionError:
-            raise HTTPException(status_code=400, detail=f"Cannot reach Jira instance at {base}. Check the URL.")
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise HTTPException(status_code=408, detail="Jira request timed out. Check the instance URL.")
+        except httpx.TransportError:
+            raise HTTPException(status_code=400, detail=f"Cannot reach Jira instance at {base}. Check the URL.")
 
         if resp.status_code == 401:
             raise HTTPException(status_code=401, detail="Jira authentication failed. Check your email and API token.")
@@ -73,61 +99,98 @@ class JiraService:
             )
         return data
 
-    def get_projects(self, instance_url: str, email: str, api_token: str) -> List[Dict]:
+    async def get_projects(self, instance_url: str, email: str, api_token: str) -> List[Dict]:
         base = self._normalize_url(instance_url)
         url  = f"{base}/rest/api/3/project/search"
-        resp = requests.get(
+        resp = await self._request(
+            base, "GET",
             url,
             headers=self._make_headers(email, api_token),
             params={"maxResults": 50},
             timeout=10,
         )
-        if not resp.ok:
+        if not resp.is_success:
             raise HTTPException(status_code=400, detail=self._jira_error_message(resp))
         return resp.json().get("values", [])
 
-    def get_project_issues(
+    def _project_jql(
         self,
-        instance_url: str,
-        email: str,
-        api_token: str,
         project_key: str,
         statuses: Optional[List[str]] = None,
-    ) -> List[Dict]:
+        updated_since: Optional[str] = None,
+        order_by: str = "updated DESC",
+    ) -> str:
+        clauses = [f'project = "{project_key}"']
         # No status filter by default — custom status names cause JQL 400 errors
         if statuses:
             status_jql = ", ".join(f'"{s}"' for s in statuses)
-            jql = f'project = "{project_key}" AND status in ({status_jql}) ORDER BY updated DESC'
-        else:
-            jql = f'project = "{project_key}" ORDER BY updated DESC'
+            clauses.append(f"status in ({status_jql})")
+        if updated_since:
+            clauses.append(f'updated >= "{updated_since}"')
+        return f'{" AND ".join(clauses)} ORDER BY {order_by}'
 
-        base     = self._normalize_url(instance_url)
-        issues: List[Dict] = []
-        start_at = 0
-        page_size = 50
-
-        while True:
-            url = f"{base}/rest/api/3/search/jql"
-            resp = requests.get(
-                url,
-                headers=self._make_headers(email, api_token),
-                params={
-                    "jql": jql,
-                    "startAt": start_at,
-                    "maxResults": page_size,
-                    "fields": "summary,status,description,issuetype,priority",
-                },
-                timeout=15,
-            )
-            if not resp.ok:
+    async def iter_project_issue_pages(
+        self,
+        instance_url: str,
+        email: str,
+        api_token: str,
+        project_key: str,
+        statuses: Optional[List[str]] = None,
+        updated_since: Optional[str] = None,
+        order_by: str = "updated DESC",
+        fields: str = ISSUE_SEARCH_FIELDS,
+        page_size: int = 100,
+    ) -> AsyncIterator[List[Dict]]:
+        """
+        Yield the project's issues one page at a time from /search/jql.
+
+        Follows `nextPageToken` (Jira Cloud); the next page is already being
+        fetched while the caller processes the current one. Instances that
+        still answer with `startAt`/`total` get their remaining pages fetched
+        concurrently. `updated_since` ("yyyy-MM-dd HH:mm" in the Jira user's
+        timezone) limits the search to issues changed at or after that minute.
+        """
+        base    = self._normalize_url(instance_url)
+        url     = f"{base}/rest/api/3/search/jql"
+        headers = self._make_headers(email, api_token)
+        jql     = self._project_jql(project_key, statuses, updated_since, order_by)
+
+        async def _fetch_page(next_page_token: Optional[str] = None, start_at: Optional[int] = None) -> dict:
+            params = {"jql": jql, "maxResults": page_size, "fields": fields}
+            if next_page_token:
+                params["nextPageToken"] = next_page_token
+            if start_at is not None:
+                params["startAt"] = start_at
+            resp = await self._request(base, "GET", url, headers=headers, params=params, timeout=15)
+            if not resp.is_success:
                 raise HTTPException(status_code=400, detail=self._jira_error_message(resp))
-            body = resp.json()
-            issues.extend(body.get("issues", []))
-            if start_at + page_size >= body.get("total", 0):
-                break
-            start_at += page_size
+            return resp.json()
 
-        return issues
+        pending: Optional[asyncio.Task] = asyncio.create_task(_fetch_page())
+        try:
+            while pending is not None:
+                body = await pending
+                pending = None
+                issues = body.get("issues", [])
+                token = body.get("nextPageToken")
+                if token and not body.get("isLast", False):
+                    pending = asyncio.create_task(_fetch_page(next_page_token=token))
+                    yield issues
+                elif "total" in body and len(issues) < body["total"]:
+                    # Legacy offset pagination
+                    yield issues
+                    page_len = len(issues) or page_size
+                    pages = await asyncio.gather(*[
+                        _fetch_page(start_at=start)
+                        for start in range(page_len, body["total"], page_len)
+                    ])
+                    for page in pages:
+                        yield page.get("issues", [])
+                else:
+                    yield issues
+        finally:
+            if pending is not None:
+                pending.cancel()
 
     async def get_project_issues_async(
         self,
@@ -136,125 +199,31 @@ class JiraService:
         api_token: str,
         project_key: str,
         statuses: Optional[List[str]] = None,
+        updated_since: Optional[str] = None,
+        order_by: str = "updated DESC",
     ) -> List[Dict]:
-        """Async version of get_project_issues — fetches all pages concurrently after the first."""
-        if statuses:
-            status_jql = ", ".join(f'"{s}"' for s in statuses)
-            jql = f'project = "{project_key}" AND status in ({status_jql}) ORDER BY updated DESC'
-        else:
-            jql = f'project = "{project_key}" ORDER BY updated DESC'
-
-        base      = self._normalize_url(instance_url)
-        url       = f"{base}/rest/api/3/search/jql"
-        headers   = self._make_headers(email, api_token)
-        page_size = 50
-
-        async def _fetch_page(client: httpx.AsyncClient, start_at: int) -> dict:
-            resp = await client.get(
-                url,
-                headers=headers,
-                params={
-                    "jql":        jql,
-                    "startAt":    start_at,
-                    "maxResults": page_size,
-                    "fields":     "summary,status,description,issuetype,priority",
-                },
-                timeout=15,
-            )
-            if not resp.is_success:
-                raise HTTPException(status_code=400, detail=self._jira_error_message_httpx(resp))
-            return resp.json()
-
-        async with httpx.AsyncClient() as client:
-            first = await _fetch_page(client, 0)
-            total   = first.get("total", 0)
-            issues  = list(first.get("issues", []))
-
-            if total > page_size:
-                start_ats = range(page_size, total, page_size)
-                pages = await asyncio.gather(*[_fetch_page(client, s) for s in start_ats])
-                for page in pages:
-                    issues.extend(page.get("issues", []))
-
+        """Fetch every issue in the project as one list (see iter_project_issue_pages)."""
+        issues: List[Dict] = []
+        async for page in self.iter_project_issue_pages(
+            instance_url, email, api_token, project_key, statuses, updated_since, order_by,
+        ):
+            issues.extend(page)
         return issues
 
-    def _jira_error_message_httpx(self, resp: httpx.Response) -> str:
-        try:
-            body = resp.json()
-            msgs = body.get("errorMessages") or []
-            errs = body.get("errors") or {}
-            if msgs:
-                return "; ".join(msgs)
-            if errs:
-                return "; ".join(f"{k}: {v}" for k, v in errs.items())
-        except Exception:
-            pass
-        return f"HTTP {resp.status_code} from Jira"
-
-    def get_issue_details(
+    async def get_issue_details(
         self, instance_url: str, email: str, api_token: str, issue_key: str
     ) -> Dict:
         base = self._normalize_url(instance_url)
         url  = f"{base}/rest/api/3/issue/{issue_key}"
-        resp = requests.get(url, headers=self._make_headers(email, api_token), timeout=10)
-        if not resp.ok:
+        resp = await self._request(base, "GET", url, headers=self._make_headers(email, api_token), timeout=10)
+        if not resp.is_success:
             raise HTTPException(status_code=400, detail=self._jira_error_message(resp))
         return resp.json()
 
-    def _extract_acceptance_criteria(self, description: Any) -> str:
-        """Parse ADF JSON to extract text under an 'Acceptance Criteria' heading."""
-        if not description or not isinstance(description, dict):
-            return ""
-
-        content_nodes = description.get("content", [])
-        ac_parts: List[str] = []
-        inside_ac = False
-
-        def extract_text(node: dict) -> str:
-            if node.get("type") == "text":
-                return node.get("text", "")
-            result = ""
-            for child in node.get("content", []):
-                result += extract_text(child)
-            return result
-
-        for node in content_nodes:
-            node_type = node.get("type", "")
-            if node_type == "heading":
-                heading_text = extract_text(node).lower()
-                if "acceptance criteria" in heading_text:
-                    inside_ac = True
-                elif inside_ac:
-                    break
-                continue
-            if inside_ac:
-                text = extract_text(node).strip()
-                if text:
-                    ac_parts.append(text)
-
-        # Fallback: extract all text if no AC heading found
-        if not ac_parts:
-            for node in content_nodes:
-                text = extract_text(node).strip()
-                if text:
-                    ac_parts.append(text)
-
-        return "\n".join(ac_parts)
-
-    def create_issue(
-        self,
-        instance_url: str,
-        email: str,
-        api_token: str,
-        project_key: str,
-        title: str,
-        manual_description: str,
-        generated_code: str,
+    def _automation_issue_fields(
+        self, project_key: str, title: str, manual_description: str, generated_code: str
     ) -> dict:
-        """Create a Jira Task tagged automation-library. Returns the new issue key and URL."""
-        base = self._normalize_url(instance_url)
-        url  = f"{base}/rest/api/3/issue"
-
+        """Issue `fields` for an automation-library Task (ADF description with the code block)."""
         # Build Atlassian Document Format description
         adf_description = {
             "version": 1,
@@ -297,29 +266,46 @@ class JiraService:
             ],
         }
 
+        return {
+            "project": {"key": project_key},
+            "summary": title,
+            "description": adf_description,
+            "issuetype": {"name": "Task"},
+            "labels": ["automation-library"],
+        }
+
+    async def create_issue(
+        self,
+        instance_url: str,
+        email: str,
+        api_token: str,
+        project_key: str,
+        title: str,
+        manual_description: str,
+        generated_code: str,
+    ) -> dict:
+        """Create a Jira Task tagged automation-library. Returns the new issue key and URL."""
+        base = self._normalize_url(instance_url)
+        url  = f"{base}/rest/api/3/issue"
+
         payload = {
-            "fields": {
-                "project": {"key": project_key},
-                "summary": title,
-                "description": adf_description,
-                "issuetype": {"name": "Task"},
-                "labels": ["automation-library"],
-            }
+            "fields": self._automation_issue_fields(project_key, title, manual_description, generated_code),
         }
 
         try:
-            resp = requests.post(
+            resp = await self._request(
+                base, "POST",
                 url,
                 headers=self._make_headers(email, api_token),
                 json=payload,
                 timeout=15,
             )
-        except requests.exceptions.ConnectionError:
-            raise HTTPException(status_code=400, detail=f"Cannot reach Jira at {base}.")
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise HTTPException(status_code=408, detail="Jira request timed out.")
+        except httpx.TransportError:
+            raise HTTPException(status_code=400, detail=f"Cannot reach Jira at {base}.")
 
-        if not resp.ok:
+        if not resp.is_success:
             detail = self._jira_error_message(resp)
             raise HTTPException(status_code=resp.status_code, detail=f"Jira issue creation failed: {detail}")
 
@@ -331,7 +317,80 @@ class JiraService:
             "id":  data.get("id", ""),
         }
 
-    def get_issue_current_status(
+    async def create_issues_bulk(
+        self,
+        instance_url: str,
+        email: str,
+        api_token: str,
+        project_key: str,
+        items: List[Dict[str, str]],
+        chunk_size: int = 50,
+    ) -> List[Dict[str, Any]]:
+        """
+        Create many automation-library Tasks via /issue/bulk (Jira accepts at
+        most 50 per call); chunks are sent concurrently. `items` carry title,
+        manual_description and generated_code. Returns one result per item,
+        in order: {"key", "url", "id"} on success or {"error"} on failure.
+        """
+        base    = self._normalize_url(instance_url)
+        url     = f"{base}/rest/api/3/issue/bulk"
+        headers = self._make_headers(email, api_token)
+
+        async def _create_chunk(chunk: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+            payload = {"issueUpdates": [
+                {"fields": self._automation_issue_fields(
+                    project_key, item["title"], item["manual_description"], item["generated_code"],
+                )}
+                for item in chunk
+            ]}
+            try:
+                resp = await self._request(base, "POST", url, headers=headers, json=payload, timeout=30)
+            except httpx.HTTPError as exc:
+                return [{"error": f"Cannot reach Jira at {base}: {exc}"}] * len(chunk)
+            except HTTPException as exc:
+                # Circuit breaker open: other chunks may already have created their
+                # issues, so this one fails on its own instead of failing the batch
+                return [{"error": exc.detail}] * len(chunk)
+
+            try:
+                body = resp.json()
+            except ValueError:
+                body = {}
+            if not isinstance(body, dict):
+                body = {}
+            failed: Dict[int, str] = {}
+            for err in body.get("errors") or []:
+                element = err.get("elementErrors") or {}
+                msgs = list(element.get("errorMessages") or [])
+                msgs += [f"{k}: {v}" for k, v in (element.get("errors") or {}).items()]
+                failed[err.get("failedElementNumber", -1)] = "; ".join(msgs) or f"HTTP {err.get('status')} from Jira"
+            if not resp.is_success and not failed:
+                message = self._jira_error_message(resp)
+                return [{"error": f"Jira issue creation failed: {message}"}] * len(chunk)
+
+            # Created issues come back in request order, skipping the failed elements
+            created = iter(body.get("issues") or [])
+            results: List[Dict[str, Any]] = []
+            for n in range(len(chunk)):
+                if n in failed:
+                    results.append({"error": f"Jira issue creation failed: {failed[n]}"})
+                    continue
+                issue = next(created, None)
+                if issue is None:
+                    results.append({"error": "Jira did not return this issue."})
+                    continue
+                results.append({
+                    "key": issue.get("key", ""),
+                    "url": f"{base}/browse/{issue.get('key', '')}",
+                    "id":  issue.get("id", ""),
+                })
+            return results
+
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        chunk_results = await asyncio.gather(*[_create_chunk(c) for c in chunks])
+        return [result for results in chunk_results for result in results]
+
+    async def get_issue_current_status(
         self,
         instance_url: str,
         email: str,
@@ -339,22 +398,101 @@ class JiraService:
         issue_key: str,
     ) -> str:
         """Fetch current status name for a single issue. Returns 'To Do' on any error."""
-        base = self._normalize_url(instance_url)
-        url  = f"{base}/rest/api/3/issue/{issue_key}"
+        fields = await self._fetch_issue_fields(
+            self._normalize_url(instance_url), self._make_headers(email, api_token), issue_key, "status"
+        )
+        return ((fields or {}).get("status") or {}).get("name") or "To Do"
+
+    async def _fetch_issue_fields(
+        self, base: str, headers: dict, issue_key: str, fields: str
+    ) -> Optional[dict]:
         try:
-            resp = requests.get(
-                url,
-                headers=self._make_headers(email, api_token),
-                params={"fields": "status"},
+            resp = await self._request(
+                base, "GET",
+                f"{base}/rest/api/3/issue/{issue_key}",
+                headers=headers,
+                params={"fields": fields},
                 timeout=10,
             )
-            if resp.ok:
-                return resp.json()["fields"]["status"]["name"]
+            if resp.is_success:
+                return resp.json()["fields"]
         except Exception:
             pass
-        return "To Do"
+        return None
+
+    async def _search_issue_fields(
+        self,
+        instance_url: str,
+        email: str,
+        api_token: str,
+        issue_keys: List[str],
+        fields: str,
+        chunk_size: int = 100,
+    ) -> Dict[str, dict]:
+        """
+        `fields` of many issues via `key in (...)` JQL searches, chunked and
+        run concurrently. Keys Jira cannot resolve are left out of the result.
+        """
+        base    = self._normalize_url(instance_url)
+        url     = f"{base}/rest/api/3/search/jql"
+        headers = self._make_headers(email, api_token)
+        keys    = list(dict.fromkeys(k for k in issue_keys if k))
+
+        async def _fetch_chunk(chunk: List[str]) -> Dict[str, dict]:
+            key_list = ", ".join(f'"{k}"' for k in chunk)
+            try:
+                resp = await self._request(
+                    base, "GET",
+                    url,
+                    headers=headers,
+                    params={"jql": f"key in ({key_list})", "fields": fields, "maxResults": len(chunk)},
+                    timeout=15,
+                )
+            except httpx.HTTPError:
+                resp = None
+            if resp is None or not resp.is_success:
+                # JQL rejects the whole chunk if one key was deleted — look those keys up one by one
+                found = await asyncio.gather(*[self._fetch_issue_fields(base, headers, k, fields) for k in chunk])
+                return {k: f for k, f in zip(chunk, found) if f is not None}
+            return {issue["key"]: issue.get("fields", {}) for issue in resp.json().get("issues", [])}
+
+        chunks = [keys[i:i + chunk_size] for i in range(0, len(keys), chunk_size)]
+        results = await asyncio.gather(*[_fetch_chunk(c) for c in chunks])
+        return {key: f for result in results for key, f in result.items()}
+
+    async def get_issue_statuses(
+        self,
+        instance_url: str,
+        email: str,
+        api_token: str,
+        issue_keys: List[str],
+        chunk_size: int = 100,
+    ) -> Dict[str, str]:
+        """Current status name for many issues (status field only)."""
+        found = await self._search_issue_fields(
+            instance_url, email, api_token, issue_keys, "status", chunk_size,
+        )
+        return {
+            key: f["status"]["name"]
+            for key, f in found.items()
+            if (f.get("status") or {}).get("name")
+        }
 
-    def get_issues_by_label(
+    async def get_issue_descriptions(
+        self,
+        instance_url: str,
+        email: str,
+        api_token: str,
+        issue_keys: List[str],
+        chunk_size: int = 100,
+    ) -> Dict[str, Any]:
+        """Description ADF (or None) for many issues — the second, heavy phase of a sync."""
+        found = await self._search_issue_fields(
+            instance_url, email, api_token, issue_keys, "description", chunk_size,
+        )
+        return {key: f.get("description") for key, f in found.items()}
+
+    async def get_issues_by_label(
         self,
         instance_url: str,
         email: str,
@@ -369,9 +507,11 @@ class JiraService:
         start_at  = 0
         page_size = 50
 
+
         while True:
             url  = f"{base}/rest/api/3/search/jql"
-            resp = requests.get(
+            resp = await self._request(
+                base, "GET",
                 url,
                 headers=self._make_headers(email, api_token),
                 params={
@@ -382,7 +522,7 @@ class JiraService:
                 },
                 timeout=15,
             )
-            if not resp.ok:
+            if not resp.is_success:
                 raise HTTPException(status_code=400, detail=self._jira_error_message(resp))
             body = resp.json()
             issues.extend(body.get("issues", []))
@@ -405,6 +545,18 @@ class JiraOAuthService:
     _API_BASE = "https://api.atlassian.com/ex/jira"
     _SCOPES = "read:issue-details:jira read:project:jira offline_access"
 
+    def __init__(self):
+        # In-flight token refreshes by user id (single-flight)
+        self._refreshes: Dict[int, "asyncio.Task[dict]"] = {}
+        # Pooled, retrying client per cloud site for REST calls
+        self._transport = JiraTransport()
+        # Grouped boards by (cloud_id, project_key)
+        self._board_cache = TTLCache(maxsize=256, ttl=settings.JIRA_BOARD_CACHE_TTL)
+
+    async def aclose(self) -> None:
+        """Close every pooled client (called on application shutdown)."""
+        await self._transport.aclose()
+
     # ── OAuth flow ────────────────────────────────────────────────────────────
 
     def get_oauth_url(self, state: str) -> str:
@@ -502,30 +654,139 @@ class JiraOAuthService:
                 )
             return resources[0]["id"]
 
+    # ── Token management ──────────────────────────────────────────────────────
+
+    def store_tokens(self, user: User, token_data: dict) -> None:
+        """Copy a token-endpoint response onto *user* (caller commits)."""
+        user.jira_access_token = token_data["access_token"]
+        # Atlassian rotates refresh tokens; keep the old one if none was returned
+        if token_data.get("refresh_token"):
+            user.jira_refresh_token = token_data["refresh_token"]
+        expires_in = token_data.get("expires_in")
+        user.jira_token_expires_at = (
+            datetime.utcnow() + timedelta(seconds=int(expires_in)) if expires_in else None
+        )
+
+    async def _persist_tokens(self, user_id: int, token_data: dict) -> None:
+        # Runs in its own session: a background refresh outlives the request that started it
+        async with SessionLocal() as db:
+            user = await db.get(User, user_id)
+            # Skip if the account was disconnected while the refresh was in flight
+            if user is not None and user.jira_refresh_token:
+                self.store_tokens(user, token_data)
+                await db.commit()
+                auth_service.invalidate_user(user_id)
+
+    async def _run_refresh(self, user_id: int, refresh_token: str) -> dict:
+        token_data = await self.refresh_access_token(refresh_token)
+        await self._persist_tokens(user_id, token_data)
+        return token_data
+
+    def _refresh(self, user_id: int, refresh_token: str) -> "asyncio.Task[dict]":
+        """Start a refresh for *user_id*, or join the one already in flight."""
+        task = self._refreshes.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._run_refresh(user_id, refresh_token))
+            self._refreshes[user_id] = task
+
+            def _done(t: "asyncio.Task[dict]") -> None:
+                self._refreshes.pop(user_id, None)
+                if not t.cancelled() and t.exception() is not None:
+                    logger.warning("Jira token refresh failed for user %s: %s", user_id, t.exception())
+
+            task.add_done_callback(_done)
+        return task
+
+    async def _refresh_now(self, user: User) -> str:
+        if not user.jira_refresh_token:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Jira token expired. Please reconnect your Jira account.",
+            )
+        # shield: one caller giving up must not cancel the refresh for the others
+        token_data = await asyncio.shield(self._refresh(user.id, user.jira_refresh_token))
+        self.store_tokens(user, token_data)
+        return user.jira_access_token
+
+    async def get_valid_token(self, user: User) -> str:
+        """
+        Return an access token for *user* that Jira will accept.
+
+        Expired tokens (or ones with no recorded expiry) are refreshed before
+        returning. Tokens within JIRA_TOKEN_REFRESH_MARGIN_SECONDS of expiry
+        are returned as-is while a refresh runs in the background. Concurrent
+        refreshes for the same user share a single token-endpoint call.
+        """
+        if not user.jira_access_token or not user.jira_cloud_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Jira account not connected. Visit /api/jira/connect first.",
+            )
+        expires_at = user.jira_token_expires_at
+        now = datetime.utcnow()
+        if expires_at is not None and now < expires_at:
+            margin = timedelta(seconds=settings.JIRA_TOKEN_REFRESH_MARGIN_SECONDS)
+            if now >= expires_at - margin and user.jira_refresh_token:
+                self._refresh(user.id, user.jira_refresh_token)
+            return user.jira_access_token
+        if not user.jira_refresh_token:
+            return user.jira_access_token
+        return await self._refresh_now(user)
+
+    async def call_with_token(self, user: User, call: Callable[[str], Awaitable[T]]) -> T:
+        """
+        Run `call(access_token)` with a valid token. If Jira still answers 401
+        (token revoked early), refresh once and retry.
+        """
+        access_token = await self.get_valid_token(user)
+        try:
+            return await call(access_token)
+        except HTTPException as exc:
+            if exc.status_code != status.HTTP_401_UNAUTHORIZED or not user.jira_refresh_token:
+                raise
+        return await call(await self._refresh_now(user))
+
     # ── Internal API helper ───────────────────────────────────────────────────
 
     async def _api_get(
         self, access_token: str, cloud_id: str, path: str, params: dict = None
     ) -> dict:
-        url = f"{self._API_BASE}/{cloud_id}/rest/api/3{path}"
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                url,
-                headers={"Authorization": f"Bearer {access_token}", "Accept": "application/json"},
-                params=params or {},
-                timeout=15,
+        base = f"{self._API_BASE}/{cloud_id}"
+        resp = await self._transport.request(
+            base, "GET",
+            f"{base}/rest/api/3{path}",
+            headers={"Authorization": f"Bearer {access_token}", "Accept": "application/json"},
+            params=params or {},
+            timeout=15,
+        )
+        if resp.status_code == 401:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Jira token expired. Please reconnect your Jira account.",
             )
-            if resp.status_code == 401:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Jira token expired. Please reconnect your Jira account.",
-                )
-            if not resp.is_success:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Jira API error: {resp.text}",
-                )
-            return resp.json()
+        if not resp.is_success:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Jira API error: {resp.text}",
+            )
+        return resp.json()
+
+    async def _search_all(
+        self, access_token: str, cloud_id: str, jql: str, fields: str, page_size: int = 50
+    ) -> List[Dict]:
+        """Every issue matching *jql*: the first page, then the remaining pages concurrently."""
+        params = {"jql": jql, "maxResults": page_size, "fields": fields}
+        first  = await self._api_get(access_token, cloud_id, "/search", {**params, "startAt": 0})
+        issues = list(first.get("issues", []))
+        # Jira may cap maxResults below page_size — step by what it actually returned
+        step   = len(issues) or page_size
+        pages  = await asyncio.gather(*[
+            self._api_get(access_token, cloud_id, "/search", {**params, "startAt": start_at})
+            for start_at in range(step, first.get("total", 0), step)
+        ])
+        for page in pages:
+            issues.extend(page.get("issues", []))
+        return issues
 
     # ── Projects ──────────────────────────────────────────────────────────────
 
@@ -535,21 +796,11 @@ class JiraOAuthService:
     async def get_project_issues_flat(
         self, access_token: str, cloud_id: str, project_key: str
     ) -> List[Dict]:
-        jql = f'project = "{project_key}" ORDER BY updated DESC'
-        issues: List[Dict] = []
-        start_at = 0
-        page_size = 50
-        while True:
-            data = await self._api_get(
-                access_token, cloud_id, "/search",
-                {"jql": jql, "startAt": start_at, "maxResults": page_size,
-                 "fields": "summary,status,description,issuetype,priority"},
-            )
-            issues.extend(data.get("issues", []))
-            if start_at + page_size >= data.get("total", 0):
-                break
-            start_at += page_size
-        return issues
+        return await self._search_all(
+            access_token, cloud_id,
+            f'project = "{project_key}" ORDER BY updated DESC',
+            "summary,status,description,issuetype,priority",
+        )
 
     async def get_projects(self, access_token: str, cloud_id: str) -> List[Dict]:
         data = await self._api_get(access_token, cloud_id, "/project/search", {"maxResults": 50})
@@ -576,46 +827,55 @@ class JiraOAuthService:
             return "in_review"
         return "in_progress"
 
+    def invalidate_project(self, project_key: str, cloud_id: Optional[str] = None) -> None:
+        """Drop every user's cached boards for *project_key* (on every cloud site unless *cloud_id* is given)."""
+        for key in self._board_cache.keys():
+            if key[1] == project_key and (cloud_id is None or key[0] == cloud_id):
+                self._board_cache.pop(key)
+
+    def invalidate_viewer(self, user_id: int) -> None:
+        """Drop every board cached for *user_id* (e.g. when their Jira account is disconnected)."""
+        for key in self._board_cache.keys():
+            if key[2] == user_id:
+                self._board_cache.pop(key)
+
     async def get_project_issues_grouped(
-        self, access_token: str, cloud_id: str, project_key: str
+        self, access_token: str, cloud_id: str, project_key: str, user_id: int, refresh: bool = False
     ) -> Dict[str, List[Dict]]:
-        jql = f'project = "{project_key}" ORDER BY updated DESC'
+        """
+        Issues of *project_key* bucketed by status. Cached per (cloud_id,
+        project_key, user_id) for JIRA_BOARD_CACHE_TTL seconds — boards are
+        only ever served to the user whose token fetched them, since Jira
+        permissions differ per account. refresh=True bypasses the cache.
+        """
+        cache_key = (cloud_id, project_key, user_id)
+        if not refresh:
+            cached = self._board_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        issues = await self._search_all(
+            access_token, cloud_id,
+            f'project = "{project_key}" ORDER BY updated DESC',
+            "summary,status,description,issuetype,priority,assignee",
+        )
         groups: Dict[str, List] = {"todo": [], "in_progress": [], "in_review": [], "done": []}
-        start_at = 0
-        page_size = 50
-
-        while True:
-            data = await self._api_get(
-                access_token,
-                cloud_id,
-                "/search",
-                {
-                    "jql": jql,
-                    "startAt": start_at,
-                    "maxResults": page_size,
-                    "fields": "summary,status,description,issuetype,priority,assignee",
-                },
-            )
-            for issue in data.get("issues", []):
-                fields = issue.get("fields", {})
-                status_obj = fields.get("status", {})
-                status_name = status_obj.get("name", "")
-                category_key = status_obj.get("statusCategory", {}).get("key", "new")
-                bucket = self._status_bucket(status_name, category_key)
-                groups[bucket].append({
-                    "key": issue["key"],
-                    "summary": fields.get("summary", ""),
-                    "status": status_name,
-                    "issue_type": fields.get("issuetype", {}).get("name", ""),
-                    "priority": (fields.get("priority") or {}).get("name"),
-                    "assignee": (fields.get("assignee") or {}).get("displayName"),
-                })
-
-            total = data.get("total", 0)
-            if start_at + page_size >= total:
-                break
-            start_at += page_size
-
+        for issue in issues:
+            fields = issue.get("fields", {})
+            status_obj = fields.get("status", {})
+            status_name = status_obj.get("name", "")
+            category_key = status_obj.get("statusCategory", {}).get("key", "new")
+            bucket = self._status_bucket(status_name, category_key)
+            groups[bucket].append({
+                "key": issue["key"],
+                "summary": fields.get("summary", ""),
+                "status": status_name,
+                "issue_type": fields.get("issuetype", {}).get("name", ""),
+                "priority": (fields.get("priority") or {}).get("name"),
+                "assignee": (fields.get("assignee") or {}).get("displayName"),
+            })
+
+        self._board_cache.set(cache_key, groups)
         return groups
 
 
@@ -0,0 +1,210 @@
+"""
+Jira task sync — keeps JiraTask rows for an integration up to date.
+
+The first sync (and one every JIRA_RECONCILE_INTERVAL_HOURS) fetches the
+whole project and removes rows for issues that no longer exist. Every other
+sync only asks Jira for issues updated since the stored watermark.
+
+Issues are listed without their descriptions. Descriptions (the bulk of
+the payload) are fetched in a second request per page, and only for issues
+that are new or changed and not already classified as non-code work.
+"""
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from database import GapAffectedFile, JiraIntegration, JiraTask, ImplementationGap, bulk_upsert
+from services.adf_parser import description_hash, extract_acceptance_criteria
+from services.gap_detection_service import gap_detection_service
+from services.jira_service import ISSUE_LIST_FIELDS, jira_service, jira_oauth_service
+
+logger = logging.getLogger(__name__)
+
+JIRA_TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"   # e.g. 2024-05-01T10:15:30.123+0200
+JQL_MINUTE_FORMAT     = "%Y-%m-%d %H:%M"
+UPSERT_KEY            = ("jira_integration_id", "task_key")
+
+
+def parse_jira_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse Jira's `updated` field into an aware datetime (None if missing/invalid)."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, JIRA_TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def _to_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value else None
+
+
+class JiraSyncService:
+
+    def _needs_reconcile(self, integration: JiraIntegration, now: datetime) -> bool:
+        if not integration.sync_watermark or not integration.last_reconciled_at:
+            return True
+        interval = timedelta(hours=settings.JIRA_RECONCILE_INTERVAL_HOURS)
+        return now - integration.last_reconciled_at >= interval
+
+    def _needs_description(
+        self, db_task: Optional[JiraTask], fields: dict, updated: Optional[datetime]
+    ) -> bool:
+        # Non-code tasks are classified from the summary alone
+        if gap_detection_service._is_non_code_task(fields.get("summary", "")):
+            return False
+        if db_task is None or db_task.description_hash is None:
+            return True
+        # Unchanged since the stored copy (e.g. during a full reconcile)
+        return updated is None or db_task.jira_updated != updated
+
+    def reset(self, integration: JiraIntegration) -> None:
+        """Force the next sync to be a full one (instance or project changed)."""
+        integration.sync_watermark     = None
+        integration.last_reconciled_at = None
+
+    async def iter_sync_batches(
+        self, db: AsyncSession, integration: JiraIntegration
+    ) -> AsyncIterator[List[JiraTask]]:
+        """
+        Upsert changed issues page by page (one statement per page) and yield
+        each page's tasks as soon as they are written, so callers can start
+        working on them while the next page is still in flight. After the last page, tasks that were not
+        part of this sync (unchanged since the watermark) are yielded as one
+        final batch. Does not commit.
+        """
+        now = datetime.utcnow()
+        full_sync = self._needs_reconcile(integration, now)
+        logger.info(
+            "Jira sync for %s: %s",
+            integration.project_key,
+            "full reconcile" if full_sync else f"updated >= {integration.sync_watermark}",
+        )
+
+        existing: Dict[str, JiraTask] = {
+            t.task_key: t
+            for t in (await db.scalars(select(JiraTask).where(
+                JiraTask.jira_integration_id == integration.id
+            ))).all()
+        }
+
+        newest: Optional[datetime] = None
+        seen_keys = set()
+        async for page in jira_service.iter_project_issue_pages(
+            integration.instance_url,
+            integration.email,
+            integration.api_token,
+            integration.project_key,
+            updated_since=None if full_sync else integration.sync_watermark,
+            # key order is stable while issues are edited mid-sync, so no page skips a row
+            order_by="key ASC",
+            fields=ISSUE_LIST_FIELDS,
+        ):
+            # Phase 2: descriptions only for the issues whose criteria may have changed
+            updated_by_key = {
+                issue["key"]: parse_jira_timestamp(issue.get("fields", {}).get("updated"))
+                for issue in page
+            }
+            wanted = [
+                issue["key"] for issue in page
+                if self._needs_description(
+                    existing.get(issue["key"]),
+                    issue.get("fields", {}),
+                    _to_utc_naive(updated_by_key[issue["key"]]),
+                )
+            ]
+            descriptions = await jira_service.get_issue_descriptions(
+                integration.instance_url, integration.email, integration.api_token, wanted,
+            ) if wanted else {}
+
+            rows: List[dict] = []
+            for issue in page:
+                issue_key  = issue["key"]
+                fields     = issue.get("fields", {})
+                status_obj = fields.get("status", {})
+                updated    = updated_by_key[issue_key]
+                if updated and (newest is None or updated > newest):
+                    newest = updated
+                seen_keys.add(issue_key)
+
+                db_task = existing.get(issue_key)
+                row = {
+                    "jira_integration_id":      integration.id,
+                    "task_key":                 issue_key,
+                    "summary":                  fields.get("summary", ""),
+                    "status":                   status_obj.get("name", ""),
+                    "status_category":          status_obj.get("statusCategory", {}).get("key", "new"),
+                    "jira_updated":             _to_utc_naive(updated),
+                    "updated_at":               now,
+                    # Stored criteria are carried over unless the description changed
+                    "acceptance_criteria":      db_task.acceptance_criteria if db_task else None,
+                    "acceptance_criteria_list": db_task.acceptance_criteria_list if db_task else None,
+                    "description_hash":         db_task.description_hash if db_task else None,
+                }
+
+                # Re-parse the description only when its content changed
+                if issue_key in descriptions:
+                    description = descriptions[issue_key]
+                    desc_hash   = description_hash(description)
+                    if row["description_hash"] != desc_hash:
+                        criteria = extract_acceptance_criteria(description)
+                        row["acceptance_criteria"]      = "\n".join(criteria)
+                        row["acceptance_criteria_list"] = json.dumps(criteria)
+                        row["description_hash"]         = desc_hash
+                rows.append(row)
+
+            if rows:
+                # One INSERT ... ON CONFLICT DO UPDATE ... RETURNING per page
+                upserted = await bulk_upsert(
+                    db, JiraTask, rows,
+                    conflict_columns=UPSERT_KEY,
+                    update_columns=[c for c in rows[0] if c not in UPSERT_KEY],
+                    returning=True,
+                )
+                by_key = {t.task_key: t for t in upserted}
+                existing.update(by_key)
+                yield [by_key[row["task_key"]] for row in rows]
+
+        if full_sync:
+            removed = [t for key, t in existing.items() if key not in seen_keys]
+            if removed:
+                removed_ids = [t.id for t in removed]
+                removed_gaps = select(ImplementationGap.id).where(ImplementationGap.jira_task_id.in_(removed_ids))
+                await db.execute(
+                    delete(GapAffectedFile)
+                    .where(GapAffectedFile.gap_id.in_(removed_gaps))
+                    .execution_options(synchronize_session=False)
+                )
+                await db.execute(
+                    delete(ImplementationGap)
+                    .where(ImplementationGap.jira_task_id.in_(removed_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                await db.execute(
+                    delete(JiraTask)
+                    .where(JiraTask.id.in_(removed_ids))
+                    .execution_options(synchronize_session=False)
+                )
+                for t in removed:
+                    existing.pop(t.task_key)
+                logger.info("Jira reconcile removed %d deleted issues", len(removed))
+            integration.last_reconciled_at = now
+
+        # Watermark in the timezone Jira reported, which is the one JQL dates use
+        if newest is not None:
+            integration.sync_watermark = newest.strftime(JQL_MINUTE_FORMAT)
+        await db.flush()
+        if seen_keys:
+            jira_oauth_service.invalidate_project(integration.project_key, integration.space_cloud_id)
+
+        unchanged = [t for key, t in existing.items() if key not in seen_keys]
+        if unchanged:
+            yield unchanged
+
+
+jira_sync_service = JiraSyncService()
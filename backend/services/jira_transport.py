@@ -0,0 +1,255 @@
+"""
+Jira transport — pooled, bounded, retrying HTTP access to Jira instances.
+
+Every Jira base URL gets its own keep-alive client, a semaphore capping the
+requests in flight, and a circuit breaker. 429 and transient 5xx responses
+(and connection errors) are retried with jittered exponential backoff, or
+after the server's Retry-After when it sends one. Requests that are not
+safe to repeat (POSTs creating issues) are only retried when Jira cannot
+have acted on them: a 429, or a connection that was never established.
+After enough consecutive
+failures the breaker opens and calls fail fast with 503 until a probe
+request succeeds.
+
+Instance URLs come from users, so at most JIRA_MAX_POOLED_INSTANCES of them
+keep this state: beyond that the least recently used idle instance is
+dropped and its client closed.
+"""
+import asyncio
+import logging
+import random
+import time
+from email.utils import parsedate_to_datetime
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+import httpx
+from fastapi import HTTPException
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+# Errors raised before the request reached Jira
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parse Retry-After (delta-seconds or HTTP date) into seconds, None if absent/invalid."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (0-based)."""
+    ceiling = min(settings.JIRA_BACKOFF_MAX_SECONDS, settings.JIRA_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed → open → half-open (one probe) → closed."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout     = reset_timeout
+        self.failures          = 0
+        self.opened_at: Optional[float] = None
+        self._probing          = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    @property
+    def is_probing(self) -> bool:
+        return self._probing
+
+    def allow_request(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self._probing or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures  = 0
+        self.opened_at = None
+        self._probing  = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def abandon_probe(self) -> None:
+        """The request ended without an outcome (cancelled, unexpected error): let another probe through."""
+        self._probing = False
+
+
+class JiraTransport:
+
+    def __init__(self):
+        self._clients:    Dict[str, httpx.AsyncClient] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._breakers:   Dict[str, CircuitBreaker]    = {}
+        self._in_flight:  Dict[str, int]               = {}
+        self._recent:     "OrderedDict[str, None]"     = OrderedDict()  # least recently used first
+        self._closing:    Set[asyncio.Task]            = set()
+
+    def _touch(self, base: str) -> None:
+        """Mark *base* as used and drop the least recently used idle instances over the limit."""
+        self._recent[base] = None
+        self._recent.move_to_end(base)
+        excess = len(self._recent) - settings.JIRA_MAX_POOLED_INSTANCES
+        for stale in list(self._recent)[:-1]:
+            if excess <= 0:
+                break
+            if self._in_flight.get(stale):
+                continue
+            self._evict(stale)
+            excess -= 1
+
+    def _evict(self, base: str) -> None:
+        self._recent.pop(base, None)
+        self._semaphores.pop(base, None)
+        self._breakers.pop(base, None)
+        self._in_flight.pop(base, None)
+        client = self._clients.pop(base, None)
+        if client is not None and not client.is_closed:
+            task = asyncio.get_running_loop().create_task(client.aclose())
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    def client(self, base: str) -> httpx.AsyncClient:
+        client = self._clients.get(base)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=15,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=settings.JIRA_MAX_CONCURRENCY,
+                    max_keepalive_connections=settings.JIRA_MAX_CONCURRENCY,
+                ),
+            )
+            self._clients[base] = client
+        return client
+
+    def breaker(self, base: str) -> CircuitBreaker:
+        breaker = self._breakers.get(base)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                settings.JIRA_CIRCUIT_FAILURE_THRESHOLD,
+                settings.JIRA_CIRCUIT_RESET_SECONDS,
+            )
+            self._breakers[base] = breaker
+        return breaker
+
+    def _semaphore(self, base: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(base)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.JIRA_MAX_CONCURRENCY)
+            self._semaphores[base] = semaphore
+        return semaphore
+
+    async def request(
+        self,
+        base: str,
+        method: str,
+        url: str,
+        max_retries: Optional[int] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request to the Jira instance at `base`, retrying 429/5xx and
+        connection errors. Returns the last response (callers check the
+        status); raises the transport error if every attempt failed to connect.
+
+        Methods outside SAFE_METHODS may already have taken effect when a 5xx
+        or a read timeout comes back, so they are retried only on 429 and on
+        errors raised before the request was sent.
+        """
+        self._touch(base)
+        self._in_flight[base] = self._in_flight.get(base, 0) + 1
+        try:
+            return await self._send(base, method, url, max_retries, **kwargs)
+        finally:
+            self._in_flight[base] -= 1  # busy instances are never evicted
+
+    async def _send(
+        self,
+        base: str,
+        method: str,
+        url: str,
+        max_retries: Optional[int],
+        **kwargs,
+    ) -> httpx.Response:
+        if max_retries is None:
+            max_retries = settings.JIRA_MAX_RETRIES
+        safe = method.upper() in SAFE_METHODS
+        breaker = self.breaker(base)
+        attempt = 0
+        while True:
+            if not breaker.allow_request():
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"Jira at {base} is failing repeatedly; retry in a few seconds.",
+                )
+            probe = breaker.is_probing
+
+            try:
+                async with self._semaphore(base):
+                    response = await self.client(base).request(method, url, **kwargs)
+            except httpx.TransportError as exc:
+                breaker.record_failure()
+                if attempt >= max_retries or not (safe or isinstance(exc, NOT_SENT_ERRORS)):
+                    raise
+                delay = backoff_delay(attempt)
+                logger.warning("Jira %s %s failed (%s) — retrying in %.1fs", method, url, exc, delay)
+            except BaseException:
+                # Cancelled or unexpected error: no verdict on Jira's health, but a
+                # half-open breaker must not stay waiting for this probe forever
+                if probe:
+                    breaker.abandon_probe()
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                # 429 means the instance is healthy but throttling us
+                if response.status_code == 429:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+                if attempt >= max_retries or not (safe or response.status_code == 429):
+                    return response
+                delay = retry_after_seconds(response)
+                if delay is None:
+                    delay = backoff_delay(attempt)
+                if delay > settings.JIRA_BACKOFF_MAX_SECONDS:
+                    return response
+                logger.warning(
+                    "Jira %s %s returned %s — retrying in %.1fs",
+                    method, url, response.status_code, delay,
+                )
+
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        """Close every pooled client (called on application shutdown)."""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
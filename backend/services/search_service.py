@@ -0,0 +1,119 @@
+"""
+Full-text search over the automation library and Jira tasks.
+
+Queries go through the indexes declared in database.FTS_INDEXES: FTS5
+MATCH ranked by bm25 on SQLite, tsvector @@ tsquery ranked by ts_rank on
+Postgres. Every word of the query must match; the last one also matches
+as a prefix, so results update while the user is typing.
+
+Snippets come back as HTML: matched terms are wrapped in <mark> and
+everything else is escaped, so they can be rendered as-is.
+"""
+import html
+import re
+from typing import List, Sequence
+
+from sqlalchemy import DateTime, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import FTS_INDEXES, TSVECTOR_COLUMN
+
+MAX_TERMS      = 8
+SNIPPET_TOKENS = 16
+BM25_WEIGHTS   = (10.0, 4.0, 1.0)   # title/summary weigh most, code least
+
+# Match markers the database puts into snippets; swapped for <mark> after escaping
+_START, _STOP = "\x02", "\x03"
+HEADLINE_OPTIONS = f"StartSel={_START}, StopSel={_STOP}, MaxWords=24, MinWords=8, MaxFragments=1"
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query: str) -> List[str]:
+    """Words of a free-text query (punctuation and FTS operators dropped)."""
+    return _TERM.findall(query or "")[:MAX_TERMS]
+
+
+def fts5_query(terms: Sequence[str]) -> str:
+    """FTS5 MATCH expression: all terms as quoted strings, the last one as a prefix."""
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def tsquery(terms: Sequence[str]) -> str:
+    """to_tsquery expression: all terms ANDed, the last one as a prefix."""
+    return " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+
+
+def render_snippet(raw: str) -> str:
+    return html.escape(raw or "").replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+class SearchService:
+
+    async def _search(
+        self,
+        db: AsyncSession,
+        table: str,
+        columns: Sequence[str],
+        scope: str,
+        params: dict,
+        query: str,
+        limit: int,
+    ) -> List[dict]:
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        fts, searchable = FTS_INDEXES[table]
+        select_list = ", ".join(f"t.{c}" for c in columns)
+        if db.get_bind().dialect.name == "postgresql":
+            sql = (
+                f"SELECT {select_list}, ts_headline('english', concat_ws(' ', "
+                f"{', '.join(f't.{c}' for c in searchable)}), q, :headline) AS snippet "
+                f"FROM {table} t, to_tsquery('english', :query) q "
+                f"WHERE t.{TSVECTOR_COLUMN} @@ q AND {scope} "
+                f"ORDER BY ts_rank(t.{TSVECTOR_COLUMN}, q) DESC LIMIT :limit"
+            )
+            match = tsquery(terms)
+        else:
+            weights = ", ".join(str(w) for w in BM25_WEIGHTS[:len(searchable)])
+            sql = (
+                f"SELECT {select_list}, snippet({fts}, -1, :start, :stop, '…', {SNIPPET_TOKENS}) AS snippet "
+                f"FROM {fts} JOIN {table} t ON t.id = {fts}.rowid "
+                f"WHERE {fts} MATCH :query AND {scope} "
+                f"ORDER BY bm25({fts}, {weights}) LIMIT :limit"
+            )
+            match = fts5_query(terms)
+
+        stmt = text(sql).columns(created_at=DateTime) if "created_at" in columns else text(sql)
+        rows = (await db.execute(stmt, {
+            **params, "query": match, "limit": limit,
+            "start": _START, "stop": _STOP, "headline": HEADLINE_OPTIONS,
+        })).mappings().all()
+        return [{**row, "snippet": render_snippet(row["snippet"])} for row in rows]
+
+    async def search_library(
+        self, db: AsyncSession, user_id: int, query: str, limit: int = 20
+    ) -> List[dict]:
+        """The user's library entries best matching *query* (title, steps and code)."""
+        return await self._search(
+            db, "automation_library_entries",
+            ["id", "jira_ticket_key", "jira_ticket_url", "title", "jira_status", "created_at"],
+            "t.user_id = :user_id", {"user_id": user_id},
+            query, limit,
+        )
+
+    async def search_tasks(
+        self, db: AsyncSession, integration_id: int, query: str, limit: int = 20
+    ) -> List[dict]:
+        """Synced Jira tasks of an integration best matching *query* (summary and AC)."""
+        return await self._search(
+            db, "jira_tasks",
+            ["id", "task_key", "summary", "status", "status_category"],
+            "t.jira_integration_id = :integration_id", {"integration_id": integration_id},
+            query, limit,
+        )
+
+
+search_service = SearchService()
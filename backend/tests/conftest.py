@@ -2,16 +2,23 @@
 Shared pytest fixtures for all backend tests.
 
 Design decisions:
-- Uses an in-memory SQLite database so tests never touch testmate.db.
+- Uses an in-memory SQLite database (aiosqlite, one shared connection via
+  StaticPool) so tests never touch testmate.db. Tables are created fresh
+  for every test and dropped afterwards.
 - Overrides the `get_db` dependency on the FastAPI app so every route
   that calls Depends(get_db) gets the test session automatically.
+- The auth_service user caches are cleared around every test, since each
+  test recreates the tables and reuses the same user ids.
 - llama_service is NOT mocked here; individual test modules mock the
   specific methods they need so tests remain independent.
 """
+import asyncio
+
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
 from database import Base, get_db, User
 from main import app
@@ -19,33 +26,41 @@ from services.auth_service import auth_service
 
 # ── In-memory test database ───────────────────────────────────────────────────
 
-TEST_DATABASE_URL = "sqlite://"  # pure in-memory, discarded after each session
+TEST_DATABASE_URL = "sqlite+aiosqlite://"  # pure in-memory, discarded after each session
 
-engine = create_engine(
+engine = create_async_engine(
     TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = async_sessionmaker(
+    engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 @pytest.fixture(scope="session", autouse=True)
-def create_tables():
-    """Create all tables once for the entire test session."""
-    Base.metadata.create_all(bind=engine)
+def dispose_engine():
+    """Close the shared aiosqlite connection so its worker thread does not block exit."""
     yield
-    Base.metadata.drop_all(bind=engine)
+    asyncio.run(engine.dispose())
 
 
-@pytest.fixture()
-def db_session():
-    """Provide a transactional database session that rolls back after each test."""
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
-    yield session
-    session.close()
-    transaction.rollback()
-    connection.close()
+@pytest.fixture(autouse=True)
+def clear_auth_caches():
+    auth_service.clear_caches()
+    yield
+    auth_service.clear_caches()
+
+
+@pytest_asyncio.fixture()
+async def db_session():
+    """Provide a session on freshly created tables; everything is dropped after the test."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with TestingSessionLocal() as session:
+        yield session
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
 
 
 @pytest.fixture()
@@ -54,11 +69,8 @@ def client(db_session):
     FastAPI TestClient with the real app but with get_db overridden
     to use the rollback-safe test session.
     """
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass  # rollback handled by db_session fixture
+    async def override_get_db():
+        yield db_session  # tables are dropped by the db_session fixture
 
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as c:
@@ -68,8 +80,8 @@ def client(db_session):
 
 # ── Seed helpers ──────────────────────────────────────────────────────────────
 
-@pytest.fixture()
-def test_user(db_session):
+@pytest_asyncio.fixture()
+async def test_user(db_session):
     """
     Insert a minimal User row and return (user, jwt_token).
     The JWT is signed with the real auth_service so token-verify routes work.
@@ -84,7 +96,7 @@ def test_user(db_session):
         level1_completed=False,
     )
     db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
+    await db_session.commit()
+    await db_session.refresh(user)
     token = auth_service.create_jwt_token(user.id)
     return user, token
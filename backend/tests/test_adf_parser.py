@@ -0,0 +1,84 @@
+"""
+Tests for the ADF parser (Jira description → acceptance criteria).
+"""
+from services.adf_parser import adf_text, description_hash, extract_acceptance_criteria
+
+
+def _text(value: str) -> dict:
+    return {"type": "text", "text": value}
+
+
+def _para(*values: str) -> dict:
+    return {"type": "paragraph", "content": [_text(v) for v in values]}
+
+
+def _heading(value: str) -> dict:
+    return {"type": "heading", "attrs": {"level": 2}, "content": [_text(value)]}
+
+
+def _bullets(*items: str) -> dict:
+    return {"type": "bulletList", "content": [
+        {"type": "listItem", "content": [_para(item)]} for item in items
+    ]}
+
+
+def _doc(*blocks: dict) -> dict:
+    return {"type": "doc", "version": 1, "content": list(blocks)}
+
+
+class TestAdfText:
+
+    def test_blocks_and_hard_breaks_become_lines(self):
+        node = _doc(
+            _para("Hello ", "world"),
+            {"type": "paragraph", "content": [_text("a"), {"type": "hardBreak"}, _text("b")]},
+        )
+        assert adf_text(node).split() == ["Hello", "world", "a", "b"]
+        assert adf_text(node).splitlines()[:3] == ["Hello world", "a", "b"]
+
+    def test_inline_nodes_contribute_their_attr_text(self):
+        node = _para("ping ")
+        node["content"].append({"type": "mention", "attrs": {"text": "@ada"}})
+        assert adf_text(node).strip() == "ping @ada"
+
+    def test_deeply_nested_description_does_not_recurse(self):
+        node = _text("leaf")
+        for _ in range(5000):
+            node = {"type": "blockquote", "content": [node]}
+        assert adf_text(node).strip() == "leaf"
+
+
+class TestExtractAcceptanceCriteria:
+
+    def test_list_items_under_heading_become_criteria(self):
+        description = _doc(
+            _para("Background text"),
+            _heading("Acceptance Criteria"),
+            _bullets("User can log in", "Error shown on bad password"),
+            _para("- Session expires after 30 min"),
+            _heading("Notes"),
+            _para("Not a criterion"),
+        )
+        assert extract_acceptance_criteria(description) == [
+            "User can log in",
+            "Error shown on bad password",
+            "Session expires after 30 min",
+        ]
+
+    def test_bold_paragraph_counts_as_heading(self):
+        description = _doc(_para("Intro"), _para("Acceptance Criteria:"), _bullets("Works offline"))
+        assert extract_acceptance_criteria(description) == ["Works offline"]
+
+    def test_falls_back_to_all_text_without_heading(self):
+        description = _doc(_para("Do the thing"), _bullets("Step one"))
+        assert extract_acceptance_criteria(description) == ["Do the thing", "Step one"]
+
+    def test_missing_description(self):
+        assert extract_acceptance_criteria(None) == []
+
+
+class TestDescriptionHash:
+
+    def test_key_order_does_not_change_hash(self):
+        assert description_hash({"a": 1, "b": [1, 2]}) == description_hash({"b": [1, 2], "a": 1})
+        assert description_hash({"a": 1}) != description_hash({"a": 2})
@@ -4,12 +4,17 @@ Tests for authentication routes:
   POST /api/auth/verify
   GET  /api/auth/me
   POST /api/auth/logout
+  auth_service user resolution cache
 
 GitHub OAuth callback is NOT tested here — it requires live network calls
 to GitHub, which belong in integration/e2e tests. Everything else is testable
 with in-process JWT operations and the seeded test_user fixture.
 """
 import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, select
+
+from database import User
 from services.auth_service import auth_service
 
 
@@ -107,3 +112,89 @@ class TestLogout:
         """Logout is stateless on the server — no token needed."""
         response = client.post("/api/auth/logout")
         assert response.status_code == 200
+
+
+# ── auth_service.get_current_user cache ───────────────────────────────────────
+
+class TestUserCache:
+
+    @pytest.fixture()
+    def user_selects(self, db_session):
+        """Number of SELECTs on users run through the test session so far."""
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+                statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", record)
+        yield statements
+        event.remove(engine, "before_cursor_execute", record)
+
+    @pytest.mark.asyncio
+    async def test_repeat_lookup_skips_the_database(self, db_session, test_user, user_selects):
+        user, token = test_user
+        db_session.expunge_all()
+
+        first = await auth_service.get_current_user(db_session, token)
+        db_session.expunge_all()
+        second = await auth_service.get_current_user(db_session, token)
+
+        assert len(user_selects) == 1
+        assert second.id == first.id == user.id
+        assert second.username == "testuser"
+
+    @pytest.mark.asyncio
+    async def test_cached_user_changes_are_saved(self, db_session, test_user):
+        _, token = test_user
+        await auth_service.get_current_user(db_session, token)
+        db_session.expunge_all()
+
+        cached = await auth_service.get_current_user(db_session, token)
+        cached.level0_completed = True
+        await db_session.commit()
+        db_session.expunge_all()
+
+        assert await db_session.scalar(select(User.level0_completed)) is True
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads_the_row(self, db_session, test_user):
+        user, token = test_user
+        await auth_service.get_current_user(db_session, token)
+        user.jira_cloud_id = "cloud-1"
+        await db_session.commit()
+        db_session.expunge_all()
+
+        stale = await auth_service.get_current_user(db_session, token)
+        assert stale.jira_cloud_id is None
+        db_session.expunge_all()
+
+        auth_service.invalidate_user(user.id)
+        assert (await auth_service.get_current_user(db_session, token)).jira_cloud_id == "cloud-1"
+
+    @pytest.mark.asyncio
+    async def test_deleted_user_is_rejected_after_invalidate(self, db_session, test_user):
+        user, token = test_user
+        await auth_service.get_current_user(db_session, token)
+        await db_session.delete(user)
+        await db_session.commit()
+        auth_service.invalidate_user(user.id)
+
+        with pytest.raises(HTTPException) as exc:
+            await auth_service.get_current_user(db_session, token)
+        assert exc.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_jira_disconnect_invalidates(self, client, db_session, test_user):
+        user, token = test_user
+        user.jira_access_token = "jira-token"
+        user.jira_cloud_id = "cloud-1"
+        await db_session.commit()
+        headers = {"Authorization": f"Bearer {token}"}
+
+        assert client.get("/api/production/v2/jira/status", headers=headers).json()["oauth"] is True
+        client.delete("/api/production/v2/jira/disconnect", headers=headers)
+        db_session.expunge_all()
+
+        assert client.get("/api/production/v2/jira/status", headers=headers).json() == {"connected": False}
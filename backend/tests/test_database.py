@@ -0,0 +1,173 @@
+"""
+Tests for database.py engine configuration and bulk helpers.
+
+Covers:
+- async_database_url: plain URLs are mapped onto the async drivers
+- engine_options: SQLite thread sharing vs a sized, pre-pinged server pool
+- build_engine: every new SQLite connection gets the WAL/synchronous/busy
+  timeout/mmap/cache pragmas (and none when tuning is turned off)
+- bulk_upsert: chunked INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+- sessions: no connection until first use, released on commit,
+  release_connection and get_current_user hand it back early
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config.settings import settings
+from database import (
+    Base, JiraIntegration, JiraTask, User,
+    async_database_url, build_engine, bulk_upsert, engine_options, release_connection,
+)
+from services.auth_service import auth_service
+
+
+class TestEngineConfig:
+
+    def test_async_database_url_maps_drivers(self):
+        assert async_database_url("sqlite:///./testmate.db") == "sqlite+aiosqlite:///./testmate.db"
+        assert async_database_url("postgresql://u:p@db/tm") == "postgresql+asyncpg://u:p@db/tm"
+        assert async_database_url("postgresql+asyncpg://u:p@db/tm") == "postgresql+asyncpg://u:p@db/tm"
+
+    def test_sqlite_options_have_no_pool_sizing(self):
+        options = engine_options("sqlite:///./testmate.db")
+        assert options == {"connect_args": {"check_same_thread": False}}
+
+    def test_postgres_options_size_and_pre_ping_the_pool(self):
+        options = engine_options("postgresql://u:p@db/tm")
+        assert options["pool_pre_ping"] is True
+        assert options["pool_size"] == settings.DB_POOL_SIZE
+        assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+        assert options["pool_recycle"] == settings.DB_POOL_RECYCLE_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_sqlite_connections_get_pragmas(self, tmp_path):
+        engine = build_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+        try:
+            async with engine.connect() as conn:
+                assert (await conn.scalar(text("PRAGMA journal_mode"))) == "wal"
+                assert (await conn.scalar(text("PRAGMA synchronous"))) == 1  # NORMAL
+                assert (await conn.scalar(text("PRAGMA busy_timeout"))) == settings.SQLITE_BUSY_TIMEOUT_MS
+                assert (await conn.scalar(text("PRAGMA cache_size"))) == -settings.SQLITE_CACHE_SIZE_KB
+        finally:
+            await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_untuned_engine_keeps_sqlite_defaults(self, tmp_path):
+        engine = build_engine(f"sqlite:///{tmp_path / 'plain.db'}", tune_sqlite=False)
+        try:
+            async with engine.connect() as conn:
+                assert (await conn.scalar(text("PRAGMA journal_mode"))) == "delete"
+        finally:
+            await engine.dispose()
+
+
+class TestBulkUpsert:
+
+    @pytest.mark.asyncio
+    async def test_inserts_then_updates_across_chunks(self, db_session, test_user):
+        user, _ = test_user
+        integration = JiraIntegration(
+            user_id=user.id, instance_url="https://acme.atlassian.net", email="a@acme.io", api_token="t",
+        )
+        db_session.add(integration)
+        await db_session.flush()
+
+        def rows(summary):
+            return [
+                {"jira_integration_id": integration.id, "task_key": f"QA-{i}", "summary": summary}
+                for i in range(5)
+            ]
+
+        inserted = await bulk_upsert(
+            db_session, JiraTask, rows("old"),
+            conflict_columns=["jira_integration_id", "task_key"], update_columns=["summary"],
+            returning=True, chunk_size=2,
+        )
+        updated = await bulk_upsert(
+            db_session, JiraTask, rows("new"),
+            conflict_columns=["jira_integration_id", "task_key"], update_columns=["summary"],
+            returning=True, chunk_size=2,
+        )
+
+        assert len(inserted) == 5
+        assert {t.id for t in updated} == {t.id for t in inserted}
+        assert {t.summary for t in updated} == {"new"}
+        assert await db_session.scalar(select(func.count()).select_from(JiraTask)) == 5
+
+
+class TestConnectionCheckout:
+
+    @pytest_asyncio.fixture()
+    async def sessions(self, tmp_path):
+        engine = build_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as db:
+            db.add(User(github_id="1", username="octo", github_access_token="gh"))
+            await db.commit()
+
+        # File-based aiosqlite engines use NullPool, which keeps no checkout count
+        checked_out = []
+        event.listen(engine.sync_engine, "checkout", lambda *args: checked_out.append(args[0]))
+        event.listen(engine.sync_engine, "checkin", lambda *args: checked_out.pop())
+        yield (lambda: len(checked_out)), async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_unused_session_checks_out_nothing(self, sessions):
+        checked_out, make_session = sessions
+        async with make_session():
+            assert checked_out() == 0
+
+    @pytest.mark.asyncio
+    async def test_release_connection_keeps_loaded_objects(self, sessions):
+        checked_out, make_session = sessions
+        async with make_session() as db:
+            user = await db.scalar(select(User))
+            assert checked_out() == 1
+            await release_connection(db)
+            assert checked_out() == 0
+            assert user.username == "octo"
+
+    @pytest.mark.asyncio
+    async def test_release_connection_leaves_pending_changes(self, sessions):
+        checked_out, make_session = sessions
+        async with make_session() as db:
+            user = await db.scalar(select(User))
+            user.username = "changed"
+            await release_connection(db)
+            assert checked_out() == 1
+            await db.rollback()
+
+    @pytest.mark.asyncio
+    async def test_release_connection_leaves_flushed_and_executed_writes(self, sessions):
+        checked_out, make_session = sessions
+        async with make_session() as db:
+            user = await db.scalar(select(User))
+            user.username = "changed"
+            await db.flush()
+            await release_connection(db)
+            assert checked_out() == 1
+            await db.rollback()
+
+            await db.execute(update(User).values(username="changed"))
+            await release_connection(db)
+            assert checked_out() == 1
+            await db.rollback()
+
+            await db.scalar(select(User))
+            await release_connection(db)
+            assert checked_out() == 0
+            assert await db.scalar(select(User.username)) == "octo"
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_returns_its_connection(self, sessions):
+        checked_out, make_session = sessions
+        async with make_session() as db:
+            user_id = await db.scalar(select(User.id))
+            await db.commit()
+            user = await auth_service.get_current_user(db, auth_service.create_jwt_token(user_id))
+            assert checked_out() == 0
+            assert user.username == "octo"
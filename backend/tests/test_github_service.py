@@ -0,0 +1,268 @@
+"""
+Tests for GitHubService helpers that don't need a live GitHub:
+  _fetch_file_content  (raw media type, byte cap, binary detection)
+  github_scheduler     (AIMD window, rate-limit retries)
+  build_nested_tree    (nested tree from flat Git Trees entries)
+
+HTTP calls are served by httpx.MockTransport so no network is used.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from services.github_scheduler import SECONDARY_LIMIT_DEFAULT_WAIT, GitHubScheduler, RateLimitWindow
+from services.github_service import build_nested_tree, github_service
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+# ── _fetch_file_content ───────────────────────────────────────────────────────
+
+class TestFetchFileContent:
+
+    @pytest.mark.asyncio
+    async def test_requests_raw_media_type(self):
+        seen = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["accept"] = request.headers["accept"]
+            return httpx.Response(200, content=b"print('hi')\n")
+
+        async with _client(handler) as client:
+            content = await github_service._fetch_file_content(client, "tok", "o", "r", "a.py")
+        assert content == "print('hi')\n"
+        assert seen["accept"] == "application/vnd.github.raw+json"
+
+    @pytest.mark.asyncio
+    async def test_content_is_capped(self):
+        body = b"x" * 1000
+        async with _client(lambda r: httpx.Response(200, content=body)) as client:
+            content = await github_service._fetch_file_content(
+                client, "tok", "o", "r", "big.txt", max_bytes=100
+            )
+        assert content == "x" * 100
+
+    @pytest.mark.asyncio
+    async def test_multibyte_char_cut_by_cap_is_dropped(self):
+        body = "ab€".encode()  # € is 3 bytes
+        async with _client(lambda r: httpx.Response(200, content=body)) as client:
+            content = await github_service._fetch_file_content(
+                client, "tok", "o", "r", "f.txt", max_bytes=4
+            )
+        assert content == "ab"
+
+    @pytest.mark.asyncio
+    async def test_binary_file_returns_empty_string(self):
+        body = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+        async with _client(lambda r: httpx.Response(200, content=body)) as client:
+            content = await github_service._fetch_file_content(client, "tok", "o", "r", "logo.png")
+        assert content == ""
+
+    @pytest.mark.asyncio
+    async def test_read_reports_truncation_and_binary(self):
+        async with _client(lambda r: httpx.Response(200, content=b"x" * 100)) as client:
+            assert await github_service._read_file(client, "tok", "o", "r", "f.txt", 100) == ("x" * 100, False, False)
+            assert await github_service._read_file(client, "tok", "o", "r", "f.txt", 99) == ("x" * 99, True, False)
+        async with _client(lambda r: httpx.Response(200, content=b"\x00\x01")) as client:
+            assert await github_service._read_file(client, "tok", "o", "r", "a.bin", 100) == ("", False, True)
+
+    @pytest.mark.asyncio
+    async def test_non_200_raises_400(self):
+        async with _client(lambda r: httpx.Response(404, json={"message": "Not Found"})) as client:
+            with pytest.raises(HTTPException) as exc:
+                await github_service._fetch_file_content(client, "tok", "o", "r", "missing.py")
+        assert exc.value.status_code == 400
+        assert "Not Found" in exc.value.detail
+
+
+# ── github_scheduler ──────────────────────────────────────────────────────────
+
+class TestRateLimitWindow:
+
+    def test_success_grows_window(self):
+        window = RateLimitWindow(initial=4, maximum=8)
+        for _ in range(8):
+            assert window.observe(httpx.Response(200)) is None
+        assert window.limit > 4
+
+    def test_secondary_limit_halves_window_and_returns_delay(self):
+        window = RateLimitWindow(initial=8, maximum=32)
+        delay = window.observe(httpx.Response(403, headers={"Retry-After": "2"}))
+        assert delay == 2
+        assert window.limit == 4
+
+    def test_plain_403_is_not_retried(self):
+        window = RateLimitWindow(initial=8, maximum=32)
+        response = httpx.Response(403, headers={"X-RateLimit-Remaining": "4000"})
+        assert window.observe(response) is None
+        assert window.limit == 8
+
+    def test_secondary_limit_detected_from_body(self):
+        window = RateLimitWindow(initial=8, maximum=32)
+        response = httpx.Response(
+            403,
+            headers={"X-RateLimit-Remaining": "4000"},
+            json={"message": "You have exceeded a secondary rate limit. Please wait a few minutes."},
+        )
+        assert window.observe(response) == SECONDARY_LIMIT_DEFAULT_WAIT
+        assert window.limit == 4
+
+    @pytest.mark.asyncio
+    async def test_long_pause_fails_fast(self):
+        reset_at = str(int(time.time()) + 3000)
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(200, headers={"X-RateLimit-Remaining": "1", "X-RateLimit-Reset": reset_at})
+            return httpx.Response(403, headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset_at})
+
+        scheduler = GitHubScheduler()
+        async with _client(handler) as client:
+            await scheduler.send(client, "tok", "GET", "https://api.github.com/x")
+            response = await asyncio.wait_for(
+                scheduler.send(client, "tok", "GET", "https://api.github.com/x"), timeout=1,
+            )
+        assert response.status_code == 403
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_passes_its_wakeup_on(self):
+        window = RateLimitWindow(initial=1, maximum=1)
+        await window.acquire()
+        first = asyncio.create_task(window.acquire())
+        second = asyncio.create_task(window.acquire())
+        await asyncio.sleep(0)
+
+        window.release()   # wakes `first`...
+        first.cancel()     # ...which is cancelled before it runs
+        await asyncio.wait_for(second, timeout=1)
+
+        assert first.cancelled()
+        assert window.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_send_retries_after_secondary_limit(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(403, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={"ok": True})
+
+        scheduler = GitHubScheduler()
+        async with _client(handler) as client:
+            response = await scheduler.send(client, "tok", "GET", "https://api.github.com/x")
+        assert response.status_code == 200
+        assert len(calls) == 2
+
+
+# ── build_nested_tree / tree cache ────────────────────────────────────────────
+
+TREE_ITEMS = [
+    {"path": "README.md", "type": "blob", "size": 10},
+    {"path": "src",       "type": "tree", "size": 0},
+    {"path": "src/app.py", "type": "blob", "size": 120},
+    {"path": "src/utils", "type": "tree", "size": 0},
+    {"path": "src/utils/strings.py", "type": "blob", "size": 40},
+]
+
+
+class TestBuildNestedTree:
+
+    def test_full_tree_is_nested(self):
+        tree = build_nested_tree(TREE_ITEMS)
+        assert [n["name"] for n in tree] == ["README.md", "src"]
+        src = tree[1]
+        assert src["type"] == "dir"
+        assert [n["path"] for n in src["children"]] == ["src/app.py", "src/utils"]
+        assert src["children"][1]["children"][0]["size"] == 40
+
+    def test_path_subset(self):
+        tree = build_nested_tree(TREE_ITEMS, path="src/utils")
+        assert [n["path"] for n in tree] == ["src/utils/strings.py"]
+
+    def test_max_depth_stops_descending(self):
+        tree = build_nested_tree(TREE_ITEMS, max_depth=1)
+        assert [n["name"] for n in tree] == ["README.md", "src"]
+        assert "children" not in tree[1]
+
+    @pytest.mark.asyncio
+    async def test_tree_items_are_cached_per_sha(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, json={"tree": TREE_ITEMS, "truncated": False})
+
+        async with _client(handler) as client:
+            first = await github_service._get_tree_items(client, "tok", "o", "cached", "abc123")
+            second = await github_service._get_tree_items(client, "tok", "o", "cached", "abc123")
+        assert first == second
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_truncated_tree_is_completed_from_subtrees(self):
+        def handler(request: httpx.Request) -> httpx.Response:
+            sha = request.url.path.rsplit("/", 1)[-1]
+            recursive = request.url.params.get("recursive") == "1"
+            if sha == "root" and recursive:
+                return httpx.Response(200, json={"tree": TREE_ITEMS[:2], "truncated": True})
+            if sha == "root":
+                return httpx.Response(200, json={"truncated": False, "tree": [
+                    {"path": "README.md", "type": "blob", "size": 10, "sha": "r1"},
+                    {"path": "src", "type": "tree", "sha": "s1"},
+                ]})
+            if sha == "s1" and recursive:
+                return httpx.Response(200, json={"truncated": False, "tree": [
+                    {"path": "app.py", "type": "blob", "size": 120, "sha": "a1"},
+                    {"path": "utils", "type": "tree", "sha": "u1"},
+                    {"path": "utils/strings.py", "type": "blob", "size": 40, "sha": "x1"},
+                ]})
+            return httpx.Response(404)
+
+        async with _client(handler) as client:
+            items = await github_service._get_tree_items(client, "tok", "o", "mono", "root")
+        assert {i["path"] for i in items} == {i["path"] for i in TREE_ITEMS}
+
+
+# ── pagination ────────────────────────────────────────────────────────────────
+
+class TestGetAllPages:
+
+    @pytest.mark.asyncio
+    async def test_fetches_every_page_from_link_header(self):
+        requested_pages = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            page = int(request.url.params["page"])
+            requested_pages.append(page)
+            headers = {}
+            if page == 1:
+                headers["Link"] = (
+                    '<https://api.github.com/user/repos?per_page=100&page=2>; rel="next", '
+                    '<https://api.github.com/user/repos?per_page=100&page=3>; rel="last"'
+                )
+            return httpx.Response(200, json=[{"id": page}], headers=headers)
+
+        async with _client(handler) as client:
+            items = await github_service._get_all_pages(
+                client, "tok", "https://api.github.com/user/repos"
+            )
+        assert sorted(i["id"] for i in items) == [1, 2, 3]
+        assert sorted(requested_pages) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_single_page_without_link_header(self):
+        async with _client(lambda r: httpx.Response(200, json=[{"id": 1}])) as client:
+            items = await github_service._get_all_pages(
+                client, "tok", "https://api.github.com/user/repos"
+            )
+        assert items == [{"id": 1}]
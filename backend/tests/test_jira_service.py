@@ -0,0 +1,376 @@
+"""
+Tests for JiraService (Basic-auth Jira REST client) and the token
+management of JiraOAuthService.
+
+The pooled per-instance client is replaced with one backed by
+httpx.MockTransport, so no request ever leaves the process.
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from config.settings import settings
+from database import User
+from services.jira_service import JiraOAuthService, JiraService
+
+BASE = "https://acme.atlassian.net"
+
+
+@pytest.fixture()
+def jira(monkeypatch):
+    """Fresh JiraService whose pooled client for BASE is served by `handler`."""
+    monkeypatch.setattr(settings, "JIRA_BACKOFF_BASE_SECONDS", 0)
+    service = JiraService()
+
+    def install(handler):
+        service._transport._clients[BASE] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return service
+
+    return install
+
+
+# ── verify_connection ─────────────────────────────────────────────────────────
+
+class TestVerifyConnection:
+
+    @pytest.mark.asyncio
+    async def test_returns_myself_payload(self, jira):
+        service = jira(lambda r: httpx.Response(200, json={"accountId": "a1", "displayName": "Ada"}))
+        data = await service.verify_connection(f"{BASE}/jira/software", "ada@acme.io", "tok")
+        assert data["displayName"] == "Ada"
+
+    @pytest.mark.asyncio
+    async def test_401_maps_to_auth_error(self, jira):
+        service = jira(lambda r: httpx.Response(401))
+        with pytest.raises(HTTPException) as exc:
+            await service.verify_connection(BASE, "ada@acme.io", "bad")
+        assert exc.value.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_unreachable_instance_maps_to_400(self, jira):
+        def handler(request):
+            raise httpx.ConnectError("no route", request=request)
+
+        service = jira(handler)
+        with pytest.raises(HTTPException) as exc:
+            await service.verify_connection(BASE, "ada@acme.io", "tok")
+        assert exc.value.status_code == 400
+
+
+# ── get_issue_statuses ────────────────────────────────────────────────────────
+
+class TestGetIssueStatuses:
+
+    @pytest.mark.asyncio
+    async def test_keys_are_searched_in_chunks(self, jira):
+        searches = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            jql = request.url.params["jql"]
+            searches.append(jql)
+            keys = [k.strip(' "') for k in jql[len("key in ("):-1].split(",")]
+            return httpx.Response(200, json={"issues": [
+                {"key": k, "fields": {"status": {"name": "Done"}}} for k in keys
+            ]})
+
+        service = jira(handler)
+        keys = [f"QA-{n}" for n in range(5)]
+        statuses = await service.get_issue_statuses(BASE, "e", "t", keys, chunk_size=2)
+        assert statuses == {k: "Done" for k in keys}
+        assert len(searches) == 3
+
+    @pytest.mark.asyncio
+    async def test_rejected_chunk_falls_back_to_single_lookups(self, jira):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/search/jql"):
+                return httpx.Response(400, json={"errorMessages": ["QA-9 does not exist"]})
+            key = request.url.path.rsplit("/", 1)[-1]
+            if key == "QA-9":
+                return httpx.Response(404)
+            return httpx.Response(200, json={"fields": {"status": {"name": "In Progress"}}})
+
+        service = jira(handler)
+        statuses = await service.get_issue_statuses(BASE, "e", "t", ["QA-1", "QA-9"])
+        assert statuses == {"QA-1": "In Progress"}
+
+    @pytest.mark.asyncio
+    async def test_current_status_of_one_issue(self, jira):
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.endswith("/QA-9"):
+                return httpx.Response(404)
+            assert request.url.params["fields"] == "status"
+            return httpx.Response(200, json={"fields": {"status": {"name": "In Review"}}})
+
+        service = jira(handler)
+        assert await service.get_issue_current_status(BASE, "e", "t", "QA-1") == "In Review"
+        assert await service.get_issue_current_status(BASE, "e", "t", "QA-9") == "To Do"
+
+
+class TestGetIssueDescriptions:
+
+    @pytest.mark.asyncio
+    async def test_only_description_field_is_requested(self, jira):
+        requested = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requested.append(request.url.params["fields"])
+            return httpx.Response(200, json={"issues": [
+                {"key": "QA-1", "fields": {"description": {"type": "doc", "content": []}}},
+                {"key": "QA-2", "fields": {"description": None}},
+            ]})
+
+        service = jira(handler)
+        descriptions = await service.get_issue_descriptions(BASE, "e", "t", ["QA-1", "QA-2"])
+        assert descriptions == {"QA-1": {"type": "doc", "content": []}, "QA-2": None}
+        assert requested == ["description"]
+
+
+# ── create_issues_bulk ────────────────────────────────────────────────────────
+
+class TestCreateIssuesBulk:
+
+    @pytest.mark.asyncio
+    async def test_chunks_and_maps_failed_elements(self, jira):
+        sizes = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            updates = json.loads(request.content)["issueUpdates"]
+            sizes.append(len(updates))
+            summaries = [u["fields"]["summary"] for u in updates]
+            if "bad" in summaries:
+                bad = summaries.index("bad")
+                ok = [s for s in summaries if s != "bad"]
+                return httpx.Response(201, json={
+                    "issues": [{"id": s, "key": f"QA-{s}"} for s in ok],
+                    "errors": [{"status": 400, "failedElementNumber": bad,
+                                "elementErrors": {"errors": {"summary": "invalid"}}}],
+                })
+            return httpx.Response(201, json={"issues": [{"id": s, "key": f"QA-{s}"} for s in summaries]})
+
+        service = jira(handler)
+        items = [{"title": t, "manual_description": "", "generated_code": ""} for t in ["1", "bad", "3", "4"]]
+        results = await service.create_issues_bulk(BASE, "e", "t", "QA", items, chunk_size=3)
+
+        assert sorted(sizes) == [1, 3]
+        assert [r.get("key") for r in results] == ["QA-1", None, "QA-3", "QA-4"]
+        assert "summary: invalid" in results[1]["error"]
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_only_its_chunks(self, jira, mocker):
+        service = jira(lambda r: httpx.Response(201, json={"issues": [
+            {"id": "1", "key": "QA-1"}, {"id": "2", "key": "QA-2"},
+        ]}))
+        real_request = service._transport.request
+        calls = 0
+
+        async def request(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls > 1:
+                raise HTTPException(status_code=503, detail="Jira at acme is failing repeatedly")
+            return await real_request(*args, **kwargs)
+
+        mocker.patch.object(service._transport, "request", side_effect=request)
+        items = [{"title": str(n), "manual_description": "", "generated_code": ""} for n in range(4)]
+        results = await service.create_issues_bulk(BASE, "e", "t", "QA", items, chunk_size=2)
+
+        assert [r.get("key") for r in results] == ["QA-1", "QA-2", None, None]
+        assert "failing repeatedly" in results[2]["error"]
+
+
+# ── iter_project_issue_pages ──────────────────────────────────────────────────
+
+class TestIterProjectIssuePages:
+
+    @pytest.mark.asyncio
+    async def test_follows_next_page_token(self, jira):
+        tokens = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            token = request.url.params.get("nextPageToken")
+            tokens.append(token)
+            if token is None:
+                return httpx.Response(200, json={"issues": [{"key": "QA-1"}], "nextPageToken": "p2"})
+            return httpx.Response(200, json={"issues": [{"key": "QA-2"}], "isLast": True})
+
+        service = jira(handler)
+        pages = [
+            [i["key"] for i in page]
+            async for page in service.iter_project_issue_pages(BASE, "e", "t", "QA")
+        ]
+        assert pages == [["QA-1"], ["QA-2"]]
+        assert tokens == [None, "p2"]
+
+    @pytest.mark.asyncio
+    async def test_offset_pagination_fallback(self, jira):
+        def handler(request: httpx.Request) -> httpx.Response:
+            start = int(request.url.params.get("startAt", 0))
+            return httpx.Response(200, json={
+                "issues": [{"key": f"QA-{start + n}"} for n in range(2)],
+                "startAt": start, "total": 6,
+            })
+
+        service = jira(handler)
+        issues = await service.get_project_issues_async(BASE, "e", "t", "QA")
+        assert [i["key"] for i in issues] == [f"QA-{n}" for n in range(6)]
+
+
+# ── JiraOAuthService token management ─────────────────────────────────────────
+
+class TestOAuthTokens:
+
+    @pytest.fixture()
+    def oauth(self, mocker):
+        service = JiraOAuthService()
+        mocker.patch.object(service, "_persist_tokens")
+        return service
+
+    @staticmethod
+    def _user(expires_in_seconds):
+        expires_at = None
+        if expires_in_seconds is not None:
+            expires_at = datetime.utcnow() + timedelta(seconds=expires_in_seconds)
+        return User(
+            id=1, jira_access_token="old", jira_refresh_token="r1",
+            jira_cloud_id="cloud", jira_token_expires_at=expires_at,
+        )
+
+    @pytest.mark.asyncio
+    async def test_fresh_token_is_used_without_refresh(self, oauth, mocker):
+        refresh = mocker.patch.object(oauth, "refresh_access_token")
+        assert await oauth.get_valid_token(self._user(3600)) == "old"
+        refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_expired_token_is_refreshed_before_use(self, oauth, mocker):
+        mocker.patch.object(oauth, "refresh_access_token", return_value={
+            "access_token": "new", "refresh_token": "r2", "expires_in": 3600,
+        })
+        user = self._user(-10)
+
+        assert await oauth.get_valid_token(user) == "new"
+        assert user.jira_refresh_token == "r2"
+        assert user.jira_token_expires_at > datetime.utcnow()
+        oauth._persist_tokens.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_collapse_into_one(self, oauth, mocker):
+        async def slow_refresh(refresh_token):
+            await asyncio.sleep(0.01)
+            return {"access_token": "new", "expires_in": 3600}
+
+        refresh = mocker.patch.object(oauth, "refresh_access_token", side_effect=slow_refresh)
+        tokens = await asyncio.gather(*[oauth.get_valid_token(self._user(None)) for _ in range(5)])
+
+        assert tokens == ["new"] * 5
+        refresh.assert_called_once_with("r1")
+
+    @pytest.mark.asyncio
+    async def test_token_near_expiry_refreshes_in_background(self, oauth, mocker):
+        refresh = mocker.patch.object(oauth, "refresh_access_token", return_value={
+            "access_token": "new", "expires_in": 3600,
+        })
+        assert await oauth.get_valid_token(self._user(30)) == "old"
+
+        await asyncio.gather(*oauth._refreshes.values())
+        refresh.assert_called_once_with("r1")
+        oauth._persist_tokens.assert_called_once_with(1, {"access_token": "new", "expires_in": 3600})
+
+    @pytest.mark.asyncio
+    async def test_call_retries_once_after_unexpected_401(self, oauth, mocker):
+        mocker.patch.object(oauth, "refresh_access_token", return_value={
+            "access_token": "new", "expires_in": 3600,
+        })
+        seen = []
+
+        async def call(access_token):
+            seen.append(access_token)
+            if access_token == "old":
+                raise HTTPException(status_code=401, detail="revoked")
+            return "ok"
+
+        assert await oauth.call_with_token(self._user(3600), call) == "ok"
+        assert seen == ["old", "new"]
+
+
+# ── JiraOAuthService search and board cache ───────────────────────────────────
+
+class TestOAuthBoard:
+
+    CLOUD = "cloud-1"
+
+    @pytest.fixture()
+    def board(self):
+        """JiraOAuthService whose cloud-site client is served by `handler`."""
+        service = JiraOAuthService()
+
+        def install(handler):
+            base = f"{service._API_BASE}/{self.CLOUD}"
+            service._transport._clients[base] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            return service
+
+        return install
+
+    @staticmethod
+    def _search_handler(total: int, calls: list):
+        def handler(request: httpx.Request) -> httpx.Response:
+            start = int(request.url.params["startAt"])
+            calls.append(start)
+            return httpx.Response(200, json={"total": total, "issues": [
+                {"key": f"QA-{n}", "fields": {
+                    "summary": f"Issue {n}",
+                    "status": {"name": "In Review", "statusCategory": {"key": "indeterminate"}},
+                    "issuetype": {"name": "Task"},
+                }}
+                for n in range(start, min(start + 50, total))
+            ]})
+        return handler
+
+    @pytest.mark.asyncio
+    async def test_remaining_pages_fetched_after_first(self, board):
+        calls = []
+        service = board(self._search_handler(120, calls))
+
+        issues = await service.get_project_issues_flat("tok", self.CLOUD, "QA")
+
+        assert [i["key"] for i in issues] == [f"QA-{n}" for n in range(120)]
+        assert calls[0] == 0 and sorted(calls[1:]) == [50, 100]
+
+    @pytest.mark.asyncio
+    async def test_grouped_board_is_cached_until_invalidated(self, board):
+        calls = []
+        service = board(self._search_handler(3, calls))
+
+        first = await service.get_project_issues_grouped("tok", self.CLOUD, "QA", 1)
+        again = await service.get_project_issues_grouped("tok", self.CLOUD, "QA", 1)
+        assert len(first["in_review"]) == 3
+        assert again is first
+        assert len(calls) == 1
+
+        service.invalidate_project("QA")
+        await service.get_project_issues_grouped("tok", self.CLOUD, "QA", 1)
+        await service.get_project_issues_grouped("tok", self.CLOUD, "QA", 1, refresh=True)
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_grouped_board_is_cached_per_user(self, board):
+        calls = []
+        service = board(self._search_handler(3, calls))
+
+        await service.get_project_issues_grouped("tok-1", self.CLOUD, "QA", 1)
+        await service.get_project_issues_grouped("tok-2", self.CLOUD, "QA", 2)
+        assert len(calls) == 2
+
+        service.invalidate_project("QA")
+        await service.get_project_issues_grouped("tok-1", self.CLOUD, "QA", 1)
+        await service.get_project_issues_grouped("tok-2", self.CLOUD, "QA", 2)
+        assert len(calls) == 4
+
+        service.invalidate_viewer(1)
+        await service.get_project_issues_grouped("tok-1", self.CLOUD, "QA", 1)
+        await service.get_project_issues_grouped("tok-2", self.CLOUD, "QA", 2)
+        assert len(calls) == 5
@@ -0,0 +1,221 @@
+"""
+Tests for JiraSyncService — incremental Jira → JiraTask sync.
+
+jira_service.iter_project_issue_pages and get_issue_descriptions are
+mocked; rows go to the rollback-safe test session.
+"""
+import json
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, text
+
+from database import GapAffectedFile, GapTypeEnum, ImplementationGap, JiraIntegration, JiraTask, RepoFile
+from services.jira_sync_service import jira_sync_service
+
+
+def _issue(key: str, summary: str, updated: str, category: str = "new") -> dict:
+    return {
+        "key": key,
+        "fields": {
+            "summary": summary,
+            "status": {"name": "To Do", "statusCategory": {"key": category}},
+            "updated": updated,
+        },
+    }
+
+
+async def _sync(db_session, integration) -> List[JiraTask]:
+    """Run one sync through iter_sync_batches (as /gaps/analyze does) and collect its tasks."""
+    return [
+        task
+        async for batch in jira_sync_service.iter_sync_batches(db_session, integration)
+        for task in batch
+    ]
+
+
+@pytest.fixture()
+def fetch(mocker):
+    """
+    Patch the Jira page iterator; `fetch.pages` is what the next sync receives
+    and `fetch.descriptions` maps issue keys to their description ADF.
+    """
+    def pages(*args, **kwargs):
+        async def gen():
+            for page in fetch.pages:
+                yield page
+        return gen()
+
+    fetch = mocker.patch(
+        "services.jira_sync_service.jira_service.iter_project_issue_pages",
+        side_effect=pages,
+    )
+    fetch.pages = []
+    fetch.descriptions = {}
+    fetch.describe = mocker.patch(
+        "services.jira_sync_service.jira_service.get_issue_descriptions",
+        side_effect=lambda *args: {k: fetch.descriptions.get(k) for k in args[3]},
+    )
+    return fetch
+
+
+@pytest_asyncio.fixture()
+async def integration(db_session, test_user):
+    user, _ = test_user
+    row = JiraIntegration(
+        user_id=user.id,
+        instance_url="https://acme.atlassian.net",
+        email="ada@acme.io",
+        api_token="tok",
+        project_key="QA",
+    )
+    db_session.add(row)
+    await db_session.commit()
+    return row
+
+
+class TestIncrementalSync:
+
+    @pytest.mark.asyncio
+    async def test_first_sync_is_full_and_sets_watermark(self, db_session, integration, fetch):
+        fetch.pages = [[
+            _issue("QA-1", "Login form", "2024-05-01T10:15:30.000+0200"),
+            _issue("QA-2", "Logout button", "2024-05-02T08:00:00.000+0200"),
+        ]]
+        tasks = await _sync(db_session, integration)
+
+        assert fetch.call_args.kwargs["updated_since"] is None
+        assert [t.task_key for t in tasks] == ["QA-1", "QA-2"]
+        assert integration.sync_watermark == "2024-05-02 08:00"
+        assert integration.last_reconciled_at is not None
+
+    @pytest.mark.asyncio
+    async def test_later_sync_only_asks_for_changed_issues(self, db_session, integration, fetch):
+        fetch.pages = [[_issue("QA-1", "Login form", "2024-05-01T10:15:30.000+0200")]]
+        await _sync(db_session, integration)
+
+        fetch.pages = [[_issue("QA-1", "Login form v2", "2024-05-03T09:30:00.000+0200")]]
+        tasks = await _sync(db_session, integration)
+
+        assert fetch.call_args.kwargs["updated_since"] == "2024-05-01 10:15"
+        assert [t.summary for t in tasks] == ["Login form v2"]
+        assert integration.sync_watermark == "2024-05-03 09:30"
+
+    @pytest.mark.asyncio
+    async def test_reconcile_removes_deleted_issues(self, db_session, integration, fetch):
+        fetch.pages = [[
+            _issue("QA-1", "Login form", "2024-05-01T10:15:30.000+0200"),
+            _issue("QA-2", "Logout button", "2024-05-02T08:00:00.000+0200"),
+        ]]
+        await _sync(db_session, integration)
+
+        integration.last_reconciled_at = datetime.utcnow() - timedelta(days=2)
+        fetch.pages = [[_issue("QA-2", "Logout button", "2024-05-02T08:00:00.000+0200")]]
+        tasks = await _sync(db_session, integration)
+
+        assert fetch.call_args.kwargs["updated_since"] is None
+        assert [t.task_key for t in tasks] == ["QA-2"]
+        remaining = await db_session.scalars(select(JiraTask.task_key))
+        assert remaining.all() == ["QA-2"]
+
+    @pytest.mark.asyncio
+    async def test_reconcile_removes_affected_files_of_deleted_issues(self, db_session, integration, fetch):
+        fetch.pages = [[_issue("QA-1", "Login form", "2024-05-01T10:15:30.000+0200")]]
+        [task] = await _sync(db_session, integration)
+        gap = ImplementationGap(jira_task_id=task.id, gap_type=GapTypeEnum.untested)
+        repo_file = RepoFile(repo_owner="acme", repo_name="shop", path="src/login.py")
+        db_session.add_all([gap, repo_file])
+        await db_session.flush()
+        db_session.add(GapAffectedFile(gap_id=gap.id, file_id=repo_file.id, role="source"))
+        await db_session.commit()
+
+        await db_session.execute(text("PRAGMA foreign_keys=ON"))
+        try:
+            integration.last_reconciled_at = datetime.utcnow() - timedelta(days=2)
+            fetch.pages = [[]]
+            await _sync(db_session, integration)
+            await db_session.commit()
+        finally:
+            await db_session.execute(text("PRAGMA foreign_keys=OFF"))
+
+        assert await db_session.scalar(select(func.count()).select_from(GapAffectedFile)) == 0
+        assert await db_session.scalar(select(func.count()).select_from(ImplementationGap)) == 0
+
+    @pytest.mark.asyncio
+    async def test_resync_updates_rows_in_place(self, db_session, integration, fetch):
+        fetch.pages = [[_issue("QA-1", "Login form", "2024-05-01T10:15:30.000+0200")]]
+        [first] = await _sync(db_session, integration)
+
+        integration.last_reconciled_at = datetime.utcnow() - timedelta(days=2)
+        fetch.pages = [[_issue("QA-1", "Login form v2", "2024-05-03T09:30:00.000+0200")]]
+        [second] = await _sync(db_session, integration)
+
+        assert second.id == first.id
+        rows = (await db_session.execute(select(JiraTask.task_key, JiraTask.summary))).all()
+        assert rows == [("QA-1", "Login form v2")]
+
+
+class TestIterSyncBatches:
+
+    @pytest.mark.asyncio
+    async def test_pages_are_yielded_before_unchanged_tasks(self, db_session, integration, fetch):
+        fetch.pages = [[_issue("QA-1", "Login form", "2024-05-01T10:15:30.000+0200")]]
+        await _sync(db_session, integration)
+
+        fetch.pages = [
+            [_issue("QA-2", "Logout button", "2024-05-02T08:00:00.000+0200")],
+            [_issue("QA-3", "Reset password", "2024-05-02T09:00:00.000+0200")],
+        ]
+        batches = [
+            [t.task_key for t in batch]
+            async for batch in jira_sync_service.iter_sync_batches(db_session, integration)
+        ]
+
+        assert batches == [["QA-2"], ["QA-3"], ["QA-1"]]
+
+
+class TestAcceptanceCriteria:
+
+    @pytest.mark.asyncio
+    async def test_unchanged_description_is_not_reparsed(self, db_session, integration, fetch, mocker):
+        description = {"type": "doc", "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": "User can log in"}]},
+        ]}
+        fetch.pages = [[_issue("QA-1", "Login form", "2024-05-01T10:15:30.000+0200")]]
+        fetch.descriptions = {"QA-1": description}
+        parse = mocker.patch(
+            "services.jira_sync_service.extract_acceptance_criteria",
+            return_value=["User can log in"],
+        )
+
+        tasks = await _sync(db_session, integration)
+        assert tasks[0].acceptance_criteria == "User can log in"
+        assert json.loads(tasks[0].acceptance_criteria_list) == ["User can log in"]
+
+        fetch.pages = [[_issue("QA-1", "Login form", "2024-05-02T08:00:00.000+0200")]]
+        await _sync(db_session, integration)
+        assert parse.call_count == 1
+
+
+class TestTwoPhaseFetch:
+
+    @pytest.mark.asyncio
+    async def test_descriptions_only_for_new_or_changed_code_tasks(self, db_session, integration, fetch):
+        fetch.pages = [[
+            _issue("QA-1", "Login form", "2024-05-01T10:15:30.000+0200"),
+            _issue("QA-2", "Team meeting notes", "2024-05-01T11:00:00.000+0200"),
+        ]]
+        await _sync(db_session, integration)
+        assert fetch.describe.call_args.args[3] == ["QA-1"]
+        assert fetch.call_args.kwargs["fields"] == "summary,status,updated"
+
+        # Full reconcile: QA-1 unchanged, QA-3 is new
+        integration.last_reconciled_at = datetime.utcnow() - timedelta(days=2)
+        fetch.pages = [[
+            _issue("QA-1", "Login form", "2024-05-01T10:15:30.000+0200"),
+            _issue("QA-3", "Password reset", "2024-05-03T09:00:00.000+0200"),
+        ]]
+        await _sync(db_session, integration)
+        assert fetch.describe.call_args.args[3] == ["QA-3"]
@@ -0,0 +1,222 @@
+"""
+Tests for JiraTransport — per-instance pooling, retries (never repeating a
+POST Jira may have acted on) and circuit breaking.
+
+Clients are backed by httpx.MockTransport and asyncio.sleep is replaced, so
+backoff delays are recorded instead of waited out.
+"""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from config.settings import settings
+from services.jira_transport import JiraTransport
+
+BASE = "https://acme.atlassian.net"
+URL  = f"{BASE}/rest/api/3/myself"
+
+
+@pytest.fixture()
+def sleeps(mocker):
+    """Delays the transport slept for, in order."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    mocker.patch("services.jira_transport.asyncio.sleep", side_effect=fake_sleep)
+    return delays
+
+
+def _transport(handler) -> JiraTransport:
+    transport = JiraTransport()
+    transport._clients[BASE] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return transport
+
+
+class TestRequest:
+
+    def test_client_is_pooled_per_instance(self):
+        transport = JiraTransport()
+        assert transport.client(BASE) is transport.client(BASE)
+        assert transport.client(BASE) is not transport.client("https://other.atlassian.net")
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors_until_success(self, sleeps):
+        responses = iter([httpx.Response(503), httpx.Response(502), httpx.Response(200, json={})])
+        transport = _transport(lambda r: next(responses))
+
+        resp = await transport.request(BASE, "GET", URL)
+
+        assert resp.status_code == 200
+        assert len(sleeps) == 2
+        assert all(0 <= d <= settings.JIRA_BACKOFF_MAX_SECONDS for d in sleeps)
+
+    @pytest.mark.asyncio
+    async def test_honours_retry_after(self, sleeps):
+        responses = iter([httpx.Response(429, headers={"Retry-After": "7"}), httpx.Response(200)])
+        transport = _transport(lambda r: next(responses))
+
+        resp = await transport.request(BASE, "GET", URL)
+
+        assert resp.status_code == 200
+        assert sleeps == [7.0]
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, sleeps):
+        transport = _transport(lambda r: httpx.Response(400))
+        resp = await transport.request(BASE, "GET", URL)
+        assert resp.status_code == 400
+        assert sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_last_response_returned_when_retries_run_out(self, sleeps):
+        transport = _transport(lambda r: httpx.Response(503))
+        resp = await transport.request(BASE, "GET", URL, max_retries=2)
+        assert resp.status_code == 503
+        assert len(sleeps) == 2
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_repeated_after_server_error(self, sleeps):
+        calls = []
+        responses = iter([httpx.Response(503), httpx.Response(201)])
+
+        def handler(request):
+            calls.append(request)
+            return next(responses)
+
+        resp = await _transport(handler).request(BASE, "POST", URL, json={})
+
+        assert resp.status_code == 503
+        assert len(calls) == 1
+        assert sleeps == []
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_repeated_after_read_timeout(self, sleeps):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        with pytest.raises(httpx.ReadTimeout):
+            await _transport(handler).request(BASE, "POST", URL, json={})
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_post_is_retried_when_not_sent_or_throttled(self, sleeps):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            if len(calls) == 2:
+                return httpx.Response(429, headers={"Retry-After": "1"})
+            return httpx.Response(201)
+
+        resp = await _transport(handler).request(BASE, "POST", URL, json={})
+
+        assert resp.status_code == 201
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_idle_instances_are_closed(self, monkeypatch):
+        monkeypatch.setattr(settings, "JIRA_MAX_POOLED_INSTANCES", 2)
+        release = asyncio.Event()
+
+        async def handler(request):
+            if request.url.host == "busy.atlassian.net":
+                await release.wait()
+            return httpx.Response(200)
+
+        transport = JiraTransport()
+        bases = [f"https://{name}.atlassian.net" for name in ("busy", "a", "b", "c")]
+        clients = {b: httpx.AsyncClient(transport=httpx.MockTransport(handler)) for b in bases}
+        transport._clients.update(clients)
+
+        busy = asyncio.create_task(transport.request(bases[0], "GET", f"{bases[0]}/x"))
+        await asyncio.sleep(0)
+        for base in bases[1:]:
+            await transport.request(base, "GET", f"{base}/x")
+        await asyncio.sleep(0)
+
+        assert list(transport._clients) == [bases[0], bases[3]]
+        assert clients[bases[1]].is_closed and clients[bases[2]].is_closed
+        assert not clients[bases[0]].is_closed
+        release.set()
+        assert (await busy).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_capped_per_instance(self, monkeypatch):
+        monkeypatch.setattr(settings, "JIRA_MAX_CONCURRENCY", 2)
+        in_flight = peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        transport = _transport(handler)
+        await asyncio.gather(*[transport.request(BASE, "GET", URL) for _ in range(6)])
+        assert peak == 2
+
+
+class TestCircuitBreaker:
+
+    @pytest.mark.asyncio
+    async def test_opens_after_repeated_failures_and_fails_fast(self, sleeps, monkeypatch):
+        monkeypatch.setattr(settings, "JIRA_CIRCUIT_FAILURE_THRESHOLD", 3)
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        transport = _transport(handler)
+        with pytest.raises(HTTPException) as exc:
+            await transport.request(BASE, "GET", URL, max_retries=5)
+
+        assert exc.value.status_code == 503
+        assert len(calls) == 3
+        assert transport.breaker(BASE).is_open
+
+    @pytest.mark.asyncio
+    async def test_successful_probe_closes_breaker(self, sleeps, monkeypatch):
+        monkeypatch.setattr(settings, "JIRA_CIRCUIT_FAILURE_THRESHOLD", 1)
+        transport = _transport(lambda r: httpx.Response(200))
+        breaker = transport.breaker(BASE)
+        breaker.record_failure()
+        breaker.opened_at -= settings.JIRA_CIRCUIT_RESET_SECONDS
+
+        resp = await transport.request(BASE, "GET", URL)
+
+        assert resp.status_code == 200
+        assert not breaker.is_open
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_does_not_keep_breaker_open(self, monkeypatch):
+        monkeypatch.setattr(settings, "JIRA_CIRCUIT_FAILURE_THRESHOLD", 1)
+        started = asyncio.Event()
+
+        async def hang(request):
+            started.set()
+            await asyncio.Event().wait()
+
+        transport = _transport(hang)
+        breaker = transport.breaker(BASE)
+        breaker.record_failure()
+        breaker.opened_at -= settings.JIRA_CIRCUIT_RESET_SECONDS
+
+        probe = asyncio.create_task(transport.request(BASE, "GET", URL))
+        await started.wait()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        assert breaker.allow_request()
@@ -0,0 +1,210 @@
+"""
+Tests for Level 1 Jira routes:
+  POST /api/level1/jira/sync-status
+  POST /api/level1/jira/create-tickets
+  GET  /api/level1/jira/library
+  GET  /api/level1/jira/library/count
+  GET  /api/level1/jira/library/search
+
+jira_service calls are mocked so tests never reach a Jira instance.
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from database import AutomationLibraryEntry, JiraIntegration
+
+
+@pytest_asyncio.fixture()
+async def library(db_session, test_user):
+    """A Jira integration plus three automation-library entries for test_user."""
+    user, token = test_user
+    integration = JiraIntegration(
+        user_id=user.id,
+        instance_url="https://acme.atlassian.net",
+        email="ada@acme.io",
+        api_token="tok",
+        project_key="QA",
+    )
+    db_session.add(integration)
+    await db_session.flush()
+    entries = [
+        AutomationLibraryEntry(
+            user_id=user.id,
+            jira_integration_id=integration.id,
+            jira_ticket_key=f"QA-{n}",
+            jira_ticket_url=f"https://acme.atlassian.net/browse/QA-{n}",
+            title=f"Login test {n}",
+            jira_status="To Do",
+        )
+        for n in (1, 2, 3)
+    ]
+    db_session.add_all(entries)
+    await db_session.commit()
+    return {"Authorization": f"Bearer {token}"}, entries
+
+
+# ── POST /sync-status ─────────────────────────────────────────────────────────
+
+class TestSyncStatus:
+
+    def test_statuses_fetched_in_one_bulk_call(self, client, library, mocker):
+        headers, _ = library
+        bulk = mocker.patch(
+            "routes.level1_jira.jira_service.get_issue_statuses",
+            return_value={"QA-1": "Done", "QA-2": "In Progress", "QA-3": "To Do"},
+        )
+        response = client.post("/api/level1/jira/sync-status", headers=headers)
+        assert response.status_code == 200
+        assert bulk.call_count == 1
+        assert sorted(bulk.call_args.kwargs["issue_keys"]) == ["QA-1", "QA-2", "QA-3"]
+
+    @pytest.mark.asyncio
+    async def test_rows_are_updated(self, client, library, db_session, mocker):
+        headers, entries = library
+        mocker.patch(
+            "routes.level1_jira.jira_service.get_issue_statuses",
+            return_value={"QA-1": "Done", "QA-2": "In Progress"},
+        )
+        body = client.post("/api/level1/jira/sync-status", headers=headers).json()
+        by_key = {e["ticket_key"]: e["jira_status"] for e in body["entries"]}
+        assert by_key == {"QA-1": "Done", "QA-2": "In Progress", "QA-3": "To Do"}
+
+        db_session.expire_all()
+        stored = {
+            e.jira_ticket_key: e.jira_status
+            for e in await db_session.scalars(select(AutomationLibraryEntry))
+        }
+        assert stored["QA-1"] == "Done"
+        assert stored["QA-3"] == "To Do"
+
+    def test_without_integration_returns_400(self, client, test_user):
+        _, token = test_user
+        response = client.post(
+            "/api/level1/jira/sync-status", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 400
+
+
+# ── POST /create-tickets ──────────────────────────────────────────────────────
+
+class TestCreateTickets:
+
+    @pytest.mark.asyncio
+    async def test_created_tickets_persisted_with_per_item_results(self, client, library, db_session, mocker):
+        headers, _ = library
+        bulk = mocker.patch(
+            "routes.level1_jira.jira_service.create_issues_bulk",
+            return_value=[
+                {"key": "QA-10", "url": "https://acme.atlassian.net/browse/QA-10", "id": "10"},
+                {"error": "Jira issue creation failed: summary: too long"},
+                {"key": "QA-11", "url": "https://acme.atlassian.net/browse/QA-11", "id": "11"},
+            ],
+        )
+        tickets = [
+            {"title": f"Scenario {n}", "manual_description": "steps", "generated_code": "pass"}
+            for n in range(3)
+        ]
+        response = client.post(
+            "/api/level1/jira/create-tickets", json={"tickets": tickets}, headers=headers,
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert bulk.call_count == 1
+        assert (body["created"], body["failed"]) == (2, 1)
+        assert [r.get("ticket_key") for r in body["results"]] == ["QA-10", None, "QA-11"]
+        assert "too long" in body["results"][1]["error"]
+        keys = set(await db_session.scalars(select(AutomationLibraryEntry.jira_ticket_key)))
+        assert {"QA-10", "QA-11"} <= keys
+
+    def test_empty_batch_rejected(self, client, library):
+        headers, _ = library
+        response = client.post("/api/level1/jira/create-tickets", json={"tickets": []}, headers=headers)
+        assert response.status_code == 400
+
+
+# ── GET /library ──────────────────────────────────────────────────────────────
+
+class TestLibrary:
+
+    def test_cursor_walks_every_entry_newest_first(self, client, library):
+        headers, entries = library
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            body = client.get("/api/level1/jira/library", params=params, headers=headers).json()
+            seen.extend(e["ticket_key"] for e in body["entries"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == ["QA-3", "QA-2", "QA-1"]
+
+    def test_list_omits_generated_code(self, client, library):
+        headers, _ = library
+        entry = client.get("/api/level1/jira/library", headers=headers).json()["entries"][0]
+        assert "generated_code" not in entry and "manual_description" not in entry
+
+    @pytest.mark.asyncio
+    async def test_status_and_text_filters(self, client, library, db_session):
+        headers, entries = library
+        entries[0].jira_status = "Done"
+        entries[1].title = "Checkout 100% flow"
+        await db_session.commit()
+
+        done = client.get("/api/level1/jira/library", params={"status": "Done"}, headers=headers).json()
+        matched = client.get("/api/level1/jira/library", params={"q": "100%"}, headers=headers).json()
+
+        assert [e["ticket_key"] for e in done["entries"]] == ["QA-1"]
+        assert [e["ticket_key"] for e in matched["entries"]] == ["QA-2"]
+
+    def test_invalid_cursor_returns_400(self, client, library):
+        headers, _ = library
+        resp = client.get("/api/level1/jira/library", params={"cursor": "nope"}, headers=headers)
+        assert resp.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_count_by_status(self, client, library, db_session):
+        headers, entries = library
+        entries[0].jira_status = "Done"
+        await db_session.commit()
+
+        body = client.get("/api/level1/jira/library/count", headers=headers).json()
+        assert body == {"total": 3, "by_status": {"Done": 1, "To Do": 2}}
+
+
+# ── GET /library/search ───────────────────────────────────────────────────────
+
+class TestLibrarySearch:
+
+    def _search(self, client, headers, q):
+        resp = client.get("/api/level1/jira/library/search", params={"q": q}, headers=headers)
+        assert resp.status_code == 200
+        return resp.json()["results"]
+
+    @pytest.mark.asyncio
+    async def test_title_match_ranks_above_code_match(self, client, library, db_session):
+        headers, entries = library
+        entries[0].generated_code = "driver.get('/checkout')"
+        entries[2].title = "Checkout <b>total</b>"
+        await db_session.commit()
+
+        results = self._search(client, headers, "checkout")
+
+        assert [r["ticket_key"] for r in results] == ["QA-3", "QA-1"]
+        assert results[0]["snippet"] == "<mark>Checkout</mark> &lt;b&gt;total&lt;/b&gt;"
+
+    @pytest.mark.asyncio
+    async def test_index_follows_updates_and_deletes(self, client, library, db_session):
+        headers, entries = library
+        entries[0].title = "Password reset"
+        await db_session.delete(entries[1])
+        await db_session.commit()
+
+        assert [r["ticket_key"] for r in self._search(client, headers, "passw")] == ["QA-1"]
+        assert [r["ticket_key"] for r in self._search(client, headers, "login")] == ["QA-3"]
+
+    def test_operator_only_query_returns_nothing(self, client, library):
+        headers, _ = library
+        assert self._search(client, headers, '" * ()') == []
@@ -0,0 +1,165 @@
+"""
+Tests for the versioned migrations in backend/migrations.
+
+Covers:
+- a fresh database gets every migration once; re-running is a no-op
+- the migrated schema matches the one the models create (no drift)
+- a pre-migrations database (old columns, duplicate tasks) is upgraded
+  in place and gains the unique keys and a backfilled search index
+- query plans: the hot queries use an index instead of scanning or sorting
+"""
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import desc, inspect, select, text, tuple_
+
+from database import AutomationLibraryEntry, Base, GapAffectedFile, ImplementationGap, JiraTask, RepoFile, build_engine
+from migrations import discover, pending_migrations, upgrade
+
+
+@pytest_asyncio.fixture()
+async def engine(tmp_path):
+    engine = build_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    yield engine
+    await engine.dispose()
+
+
+def _schema(conn) -> dict:
+    """Tables → columns and index keys, with unique constraints counted as unique indexes."""
+    inspector = inspect(conn)
+    schema = {}
+    for table in inspector.get_table_names():
+        if table == "schema_migrations":
+            continue
+        indexes = {(tuple(i["column_names"]), bool(i["unique"])) for i in inspector.get_indexes(table)}
+        indexes |= {(tuple(u["column_names"]), True) for u in inspector.get_unique_constraints(table)}
+        schema[table] = {
+            "columns": {(c["name"], str(c["type"]), c["nullable"]) for c in inspector.get_columns(table)},
+            "indexes": indexes,
+            "foreign_keys": {
+                (tuple(fk["constrained_columns"]), fk["referred_table"])
+                for fk in inspector.get_foreign_keys(table)
+            },
+        }
+    triggers = conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+    schema["triggers"] = {row[0] for row in triggers}
+    return schema
+
+
+async def _query_plan(engine, stmt) -> str:
+    sql = str(stmt.compile(engine.sync_engine, compile_kwargs={"literal_binds": True}))
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+class TestUpgrade:
+
+    @pytest.mark.asyncio
+    async def test_fresh_database_applies_all_once(self, engine):
+        applied = await upgrade(engine)
+
+        assert [m.version for m in applied] == [m.version for m in discover()]
+        assert await pending_migrations(engine) == []
+        assert await upgrade(engine) == []
+
+    @pytest.mark.asyncio
+    async def test_migrated_schema_matches_models(self, engine, tmp_path):
+        await upgrade(engine)
+        model_engine = build_engine(f"sqlite:///{tmp_path / 'models.db'}")
+        try:
+            async with model_engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                expected = await conn.run_sync(_schema)
+        finally:
+            await model_engine.dispose()
+        async with engine.connect() as conn:
+            migrated = await conn.run_sync(_schema)
+
+        assert migrated == expected
+
+    @pytest.mark.asyncio
+    async def test_legacy_database_is_upgraded_in_place(self, engine):
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE jira_tasks (id INTEGER PRIMARY KEY, jira_integration_id INTEGER NOT NULL,"
+                " task_key VARCHAR NOT NULL, summary VARCHAR NOT NULL, status VARCHAR,"
+                " acceptance_criteria TEXT, updated_at DATETIME)"
+            ))
+            await conn.execute(text(
+                "INSERT INTO jira_tasks (jira_integration_id, task_key, summary)"
+                " VALUES (1, 'QA-1', 'old'), (1, 'QA-1', 'new'), (1, 'QA-2', 'other')"
+            ))
+
+        await upgrade(engine)
+
+        async with engine.connect() as conn:
+            rows = (await conn.execute(text("SELECT task_key, summary FROM jira_tasks ORDER BY task_key"))).all()
+            columns = {r[1] for r in await conn.execute(text("PRAGMA table_info(jira_tasks)"))}
+            with pytest.raises(Exception):
+                await conn.execute(text(
+                    "INSERT INTO jira_tasks (jira_integration_id, task_key, summary) VALUES (1, 'QA-2', 'dup')"
+                ))
+        assert rows == [("QA-1", "new"), ("QA-2", "other")]
+        async with engine.connect() as conn:
+            found = (await conn.execute(text(
+                "SELECT rowid FROM jira_tasks_fts WHERE jira_tasks_fts MATCH 'other'"
+            ))).all()
+        assert len(found) == 1  # existing rows are backfilled into the search index
+        assert {"description_hash", "jira_updated", "status_category"} <= columns
+
+
+class TestQueryPlans:
+
+    @pytest.mark.asyncio
+    async def test_task_lookup_by_integration_and_key_uses_index(self, engine):
+        await upgrade(engine)
+        plan = await _query_plan(engine, select(JiraTask).where(
+            JiraTask.jira_integration_id == 1, JiraTask.task_key == "QA-1",
+        ))
+        assert "SEARCH jira_tasks USING INDEX" in plan
+
+    @pytest.mark.asyncio
+    async def test_gaps_for_tasks_use_index(self, engine):
+        await upgrade(engine)
+        plan = await _query_plan(engine, select(ImplementationGap).where(
+            ImplementationGap.jira_task_id.in_([1, 2, 3]),
+        ))
+        assert "SEARCH implementation_gaps USING INDEX" in plan
+
+    @pytest.mark.asyncio
+    async def test_library_page_is_read_in_index_order(self, engine):
+        await upgrade(engine)
+        plan = await _query_plan(engine, select(AutomationLibraryEntry)
+            .where(
+                AutomationLibraryEntry.user_id == 1,
+                tuple_(AutomationLibraryEntry.created_at, AutomationLibraryEntry.id)
+                < tuple_(datetime(2024, 5, 1), 100),
+            )
+            .order_by(desc(AutomationLibraryEntry.created_at), desc(AutomationLibraryEntry.id))
+            .limit(50))
+        assert "USING INDEX ix_automation_library_entries_user_created_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.asyncio
+    async def test_library_status_page_is_read_in_index_order(self, engine):
+        await upgrade(engine)
+        plan = await _query_plan(engine, select(AutomationLibraryEntry)
+            .where(AutomationLibraryEntry.user_id == 1, AutomationLibraryEntry.jira_status == "Done")
+            .order_by(desc(AutomationLibraryEntry.created_at), desc(AutomationLibraryEntry.id))
+            .limit(50))
+        assert "USING INDEX ix_automation_library_entries_user_status_created_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.asyncio
+    async def test_files_under_prefix_use_indexes(self, engine):
+        await upgrade(engine)
+        plan = await _query_plan(engine, select(GapAffectedFile.gap_id)
+            .join(RepoFile, RepoFile.id == GapAffectedFile.file_id)
+            .where(
+                RepoFile.repo_owner == "acme", RepoFile.repo_name == "shop",
+                RepoFile.path >= "auth/", RepoFile.path < "auth/\U0010ffff",
+            ))
+        assert "SEARCH repo_files USING COVERING INDEX" in plan
+        assert "SEARCH gap_affected_files USING" in plan
@@ -0,0 +1,271 @@
+"""
+Tests for Production V2 routes:
+  POST /api/production/v2/gaps/analyze
+  GET  /api/production/v2/gaps/runs, /gaps/runs/{id}, /gaps/trend
+  GET  /api/production/v2/gaps/files
+  GET  /api/production/v2/tasks/search
+
+Jira pages and the GitHub repository context are mocked so tests never
+leave the process.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from database import GapAffectedFile, GapAnalysisRun, ImplementationGap, JiraIntegration, JiraTask, RepoFile
+from services.gap_history_service import pack_results, unpack_results
+
+
+def _issue(key: str, summary: str, updated: str, category: str = "done") -> dict:
+    return {
+        "key": key,
+        "fields": {
+            "summary": summary,
+            "status": {"name": "Done", "statusCategory": {"key": category}},
+            "updated": updated,
+        },
+    }
+
+
+@pytest_asyncio.fixture()
+async def auth_headers(db_session, test_user, mocker):
+    """test_user with a Jira integration for project QA (issue descriptions mocked as empty)."""
+    mocker.patch(
+        "services.jira_sync_service.jira_service.get_issue_descriptions",
+        side_effect=lambda *args: {k: None for k in args[3]},
+    )
+    user, token = test_user
+    db_session.add(JiraIntegration(
+        user_id=user.id,
+        instance_url="https://acme.atlassian.net",
+        email="ada@acme.io",
+        api_token="tok",
+        project_key="QA",
+    ))
+    await db_session.commit()
+    return {"Authorization": f"Bearer {token}"}
+
+
+class TestAnalyzeGaps:
+
+    @pytest.mark.asyncio
+    async def test_streamed_pages_are_classified_and_persisted(self, client, db_session, auth_headers, mocker):
+        async def pages(*args, **kwargs):
+            yield [_issue("QA-1", "Checkout payment flow", "2024-05-01T10:00:00.000+0000")]
+            yield [_issue("QA-2", "Invoice export", "2024-05-02T10:00:00.000+0000", "new")]
+
+        mocker.patch(
+            "services.jira_sync_service.jira_service.iter_project_issue_pages",
+            side_effect=pages,
+        )
+        mocker.patch(
+            "routes.production_v2._load_repo_context",
+            return_value=(["src/checkout/payment.py", "tests/test_payment.py"], {}),
+        )
+        mocker.patch("routes.production_v2.groq_service.check_availability", return_value=False)
+
+        resp = client.post(
+            "/api/production/v2/gaps/analyze",
+            json={"repo_owner": "acme", "repo_name": "shop"},
+            headers=auth_headers,
+        )
+
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [g["task_key"] for g in body["gaps"]] == ["QA-2", "QA-1"]
+        assert {g["task_key"]: g["gap_type"] for g in body["gaps"]} == {
+            "QA-1": "complete", "QA-2": "not_started",
+        }
+        assert body["stats"]["total"] == 2
+        assert await db_session.scalar(select(func.count()).select_from(ImplementationGap)) == 2
+
+    @pytest.mark.asyncio
+    async def test_reanalysis_updates_gaps_in_place(self, client, db_session, auth_headers, mocker):
+        pages_seen = [
+            [_issue("QA-1", "Checkout payment flow", "2024-05-01T10:00:00.000+0000")],
+        ]
+
+        async def pages(*args, **kwargs):
+            for page in pages_seen:
+                yield page
+
+        mocker.patch(
+            "services.jira_sync_service.jira_service.iter_project_issue_pages",
+            side_effect=pages,
+        )
+        repo = mocker.patch(
+            "routes.production_v2._load_repo_context",
+            return_value=(["src/checkout/payment.py", "tests/test_payment.py"], {}),
+        )
+        mocker.patch("routes.production_v2.groq_service.check_availability", return_value=False)
+
+        client.post("/api/production/v2/gaps/analyze", json={"repo_owner": "acme", "repo_name": "shop"}, headers=auth_headers)
+        repo.return_value = (["src/checkout/payment.py"], {})
+        resp = client.post("/api/production/v2/gaps/analyze", json={"repo_owner": "acme", "repo_name": "shop"}, headers=auth_headers)
+
+        assert resp.json()["gaps"][0]["gap_type"] == "untested"
+        gaps = (await db_session.scalars(select(ImplementationGap))).all()
+        assert [g.gap_type.value for g in gaps] == ["untested"]
+
+    def test_repo_failure_returns_500(self, client, auth_headers, mocker):
+        async def pages(*args, **kwargs):
+            yield [_issue("QA-1", "Checkout payment flow", "2024-05-01T10:00:00.000+0000")]
+
+        mocker.patch(
+            "services.jira_sync_service.jira_service.iter_project_issue_pages",
+            side_effect=pages,
+        )
+        mocker.patch("routes.production_v2._load_repo_context", side_effect=RuntimeError("boom"))
+
+        resp = client.post(
+            "/api/production/v2/gaps/analyze",
+            json={"repo_owner": "acme", "repo_name": "shop"},
+            headers=auth_headers,
+        )
+        assert resp.status_code == 500
+
+
+class TestSearchTasks:
+
+    @pytest.mark.asyncio
+    async def test_matches_summary_and_acceptance_criteria(self, client, db_session, auth_headers):
+        integration = await db_session.scalar(select(JiraIntegration))
+        db_session.add_all([
+            JiraTask(jira_integration_id=integration.id, task_key="QA-1", summary="Refund flow",
+                     acceptance_criteria="Refund is issued to the original card"),
+            JiraTask(jira_integration_id=integration.id, task_key="QA-2", summary="Card on file",
+                     acceptance_criteria="User can save a card"),
+        ])
+        await db_session.commit()
+
+        resp = client.get("/api/production/v2/tasks/search", params={"q": "refund"}, headers=auth_headers)
+        cards = client.get("/api/production/v2/tasks/search", params={"q": "card"}, headers=auth_headers)
+
+        assert [r["task_key"] for r in resp.json()["results"]] == ["QA-1"]
+        assert "<mark>Refund</mark>" in resp.json()["results"][0]["snippet"]
+        assert [r["task_key"] for r in cards.json()["results"]] == ["QA-2", "QA-1"]
+
+
+class TestGapHistory:
+
+    @pytest.mark.asyncio
+    async def test_each_analysis_is_recorded_as_a_run(self, client, db_session, auth_headers, mocker):
+        async def pages(*args, **kwargs):
+            yield [
+                _issue("QA-1", "Checkout payment flow", "2024-05-01T10:00:00.000+0000"),
+                _issue("QA-2", "Invoice export", "2024-05-02T10:00:00.000+0000", "new"),
+            ]
+
+        mocker.patch(
+            "services.jira_sync_service.jira_service.iter_project_issue_pages",
+            side_effect=pages,
+        )
+        mocker.patch(
+            "routes.production_v2._load_repo_context",
+            return_value=(["src/checkout/payment.py", "tests/test_payment.py"], {}),
+        )
+        mocker.patch("routes.production_v2.groq_service.check_availability", return_value=False)
+
+        analyzed = client.post(
+            "/api/production/v2/gaps/analyze",
+            json={"repo_owner": "acme", "repo_name": "shop"},
+            headers=auth_headers,
+        ).json()
+        runs = client.get("/api/production/v2/gaps/runs", headers=auth_headers).json()["runs"]
+        run = client.get(f"/api/production/v2/gaps/runs/{analyzed['run_id']}", headers=auth_headers).json()
+
+        assert [r["id"] for r in runs] == [analyzed["run_id"]]
+        assert runs[0]["stats"] == analyzed["stats"]
+        assert {g["task_key"]: g["gap_type"] for g in run["gaps"]} == {
+            "QA-1": "complete", "QA-2": "not_started",
+        }
+
+    @pytest.mark.asyncio
+    async def test_trend_uses_the_last_run_of_each_day(self, client, db_session, auth_headers):
+        integration = await db_session.scalar(select(JiraIntegration))
+        now = datetime.utcnow()
+        two_days_ago = (now - timedelta(days=2)).replace(hour=12)
+        for created_at, complete in [
+            (two_days_ago, 1),
+            (two_days_ago.replace(hour=13), 2),
+            (now, 3),
+            (now - timedelta(days=90), 0),  # outside the window
+        ]:
+            db_session.add(GapAnalysisRun(
+                jira_integration_id=integration.id, repo_owner="acme", repo_name="shop",
+                total=4, complete=complete, not_started=4 - complete, untested=0, non_code_task=0,
+                results=pack_results([]), created_at=created_at,
+            ))
+        await db_session.commit()
+
+        body = client.get(
+            "/api/production/v2/gaps/trend", params={"repo_name": "shop"}, headers=auth_headers,
+        ).json()
+
+        assert [(p["runs"], p["complete"]) for p in body["points"]] == [(2, 2), (1, 3)]
+        assert body["change"]["complete_pct"] == 25.0
+
+    def test_results_round_trip_through_compression(self):
+        gaps = [{"task_key": f"QA-{n}", "gap_type": "untested", "summary": "x" * 200} for n in range(500)]
+        blob = pack_results(gaps)
+        assert unpack_results(blob)[499] == {"task_key": "QA-499", "gap_type": "untested"}
+        assert len(blob) < 2000
+
+
+class TestAffectedFiles:
+
+    @pytest.fixture()
+    def analyze(self, client, auth_headers, mocker):
+        async def pages(*args, **kwargs):
+            yield [
+                _issue("QA-1", "Checkout payment flow", "2024-05-01T10:00:00.000+0000"),
+                _issue("QA-2", "Auth login session", "2024-05-02T10:00:00.000+0000"),
+            ]
+
+        mocker.patch(
+            "services.jira_sync_service.jira_service.iter_project_issue_pages",
+            side_effect=pages,
+        )
+        mocker.patch(
+            "routes.production_v2._load_repo_context",
+            return_value=([
+                "src/checkout/payment.py", "src/auth/login.py", "src/auth/session.py", "tests/test_payment.py",
+            ], {}),
+        )
+        mocker.patch("routes.production_v2.groq_service.check_availability", return_value=False)
+
+        def run():
+            resp = client.post(
+                "/api/production/v2/gaps/analyze",
+                json={"repo_owner": "acme", "repo_name": "shop"},
+                headers=auth_headers,
+            )
+            assert resp.status_code == 200
+            return resp.json()
+        return run
+
+    @pytest.mark.asyncio
+    async def test_paths_are_stored_once_and_links_replaced(self, analyze, db_session):
+        first = analyze()
+        analyze()
+
+        expected_links = sum(len(g["source_files"]) + len(g["test_files"]) for g in first["gaps"])
+        paths = (await db_session.scalars(select(RepoFile.path))).all()
+        assert len(paths) == len(set(paths))
+        assert await db_session.scalar(select(func.count()).select_from(GapAffectedFile)) == expected_links
+        assert await db_session.scalar(select(ImplementationGap.affected_files)) is None
+
+    def test_tasks_by_file_prefix(self, analyze, client, auth_headers):
+        analyze()
+
+        body = client.get(
+            "/api/production/v2/gaps/files",
+            params={"repo_owner": "acme", "repo_name": "shop", "prefix": "src/auth/"},
+            headers=auth_headers,
+        ).json()
+
+        assert [t["task_key"] for t in body["tasks"]] == ["QA-2"]
+        assert {f["path"] for f in body["tasks"][0]["files"]} <= {"src/auth/login.py", "src/auth/session.py"}
+        assert body["tasks"][0]["files"]
@@ -78,35 +78,57 @@ interface AutomationLibraryProps {
 
 const AutomationLibrary: React.FC<AutomationLibraryProps> = ({ onBack, refreshTrigger = 0 }) => {
     const [entries, setEntries]       = useState<AutomationLibraryEntry[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [counts, setCounts]         = useState<{ total: number; by_status: Record<string, number> }>({ total: 0, by_status: {} });
     const [loading, setLoading]       = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [syncing, setSyncing]       = useState(false);
     const [error, setError]           = useState<string | null>(null);
     const [activeFilter, setFilter]   = useState('All');
 
+    const statusParam = activeFilter === 'All' ? undefined : activeFilter;
+
+    // First page for the active filter, plus the per-status counts
     const fetchLibrary = useCallback(async () => {
         setLoading(true);
         setError(null);
         try {
-            const data = await apiService.getAutomationLibrary();
-            setEntries(data.entries);
+            const [page, totals] = await Promise.all([
+                apiService.getAutomationLibrary({ status: statusParam }),
+                apiService.getAutomationLibraryCount(),
+            ]);
+            setEntries(page.entries);
+            setNextCursor(page.next_cursor);
+            setCounts(totals);
         } catch (err: any) {
             setError(err.response?.data?.detail || err.message || 'Failed to load library.');
         } finally {
             setLoading(false);
         }
-    }, []);
+    }, [statusParam]);
 
     useEffect(() => { fetchLibrary(); }, [fetchLibrary, refreshTrigger]);
 
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const page = await apiService.getAutomationLibrary({ status: statusParam, cursor: nextCursor });
+            setEntries(prev => [...prev, ...page.entries]);
+            setNextCursor(page.next_cursor);
+        } catch (err: any) {
+            setError(err.response?.data?.detail || err.message || 'Failed to load library.');
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleSync = async () => {
         setSyncing(true);
         try {
-            const result = await apiService.syncLibraryStatuses();
-            // Merge updated statuses into local state
-            setEntries(prev => prev.map(e => {
-                const updated = result.entries.find(u => u.id === e.id);
-                return updated ? { ...e, jira_status: updated.jira_status } : e;
-            }));
+            await apiService.syncLibraryStatuses();
+            // Statuses changed server-side: reload the page and the counts
+            await fetchLibrary();
         } catch {
             // silent — not critical
         } finally {
@@ -114,12 +136,8 @@ const AutomationLibrary: React.FC<AutomationLibraryProps> = ({ onBack, refreshTr
         }
     };
 
-    const filtered = activeFilter === 'All'
-        ? entries
-        : entries.filter(e => e.jira_status === activeFilter);
-
     const countByStatus = STATUS_FILTERS.slice(1).reduce<Record<string, number>>((acc, s) => {
-        acc[s] = entries.filter(e => e.jira_status === s).length;
+        acc[s] = counts.by_status[s] ?? 0;
         return acc;
     }, {});
 
@@ -133,7 +151,7 @@ const AutomationLibrary: React.FC<AutomationLibraryProps> = ({ onBack, refreshTr
                     </p>
                     <h2 className="text-xl font-light text-white">Your Jira test tickets</h2>
                     <p className="text-slate-400 text-sm mt-0.5">
-                        {loading ? '…' : `${entries.length} test${entries.length !== 1 ? 's' : ''} converted to automation`}
+                        {loading ? '…' : `${counts.total} test${counts.total !== 1 ? 's' : ''} converted to automation`}
                     </p>
                 </div>
                 <div className="flex items-center gap-2 flex-shrink-0">
@@ -156,7 +174,7 @@ const AutomationLibrary: React.FC<AutomationLibraryProps> = ({ onBack, refreshTr
             </div>
 
             {/* ── Stats strip ──────────────────────────────────────────────── */}
-            {!loading && entries.length > 0 && (
+            {!loading && counts.total > 0 && (
                 <div className="grid grid-cols-2 sm:grid-cols-4 gap-3 mb-6">
                     {Object.entries(countByStatus).map(([status, count]) => (
                         <div
@@ -176,7 +194,7 @@ const AutomationLibrary: React.FC<AutomationLibraryProps> = ({ onBack, refreshTr
             )}
 
             {/* ── Filter tabs ───────────────────────────────────────────────── */}
-            {!loading && entries.length > 0 && (
+            {!loading && counts.total > 0 && (
                 <div className="flex items-center gap-1 mb-4 overflow-x-auto pb-1">
                     <Filter className="w-3.5 h-3.5 text-slate-600 flex-shrink-0 mr-1" />
                     {STATUS_FILTERS.map(f => (
@@ -218,7 +236,7 @@ const AutomationLibrary: React.FC<AutomationLibraryProps> = ({ onBack, refreshTr
                         </button>
                     </div>
                 </div>
-            ) : entries.length === 0 ? (
+            ) : counts.total === 0 ? (
                 <div className="flex flex-col items-center justify-center py-16 text-center">
                     <div className="w-14 h-14 rounded-2xl bg-white/5 border border-white/10 flex items-center justify-center mb-4">
                         <BookOpen className="w-6 h-6 text-slate-600" />
@@ -235,7 +253,7 @@ const AutomationLibrary: React.FC<AutomationLibraryProps> = ({ onBack, refreshTr
                         <ChevronRight className="w-4 h-4" />
                     </button>
                 </div>
-            ) : filtered.length === 0 ? (
+            ) : entries.length === 0 ? (
                 <div className="py-10 text-center">
                     <p className="text-slate-500 text-sm">
                         No tickets with status <strong className="text-slate-400">{activeFilter}</strong>.
@@ -245,11 +263,25 @@ const AutomationLibrary: React.FC<AutomationLibraryProps> = ({ onBack, refreshTr
                     </button>
                 </div>
             ) : (
-                <div className="grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-3">
-                    {filtered.map(entry => (
-                        <TicketCard key={entry.id} entry={entry} />
-                    ))}
-                </div>
+                <>
+                    <div className="grid grid-cols-1 md:grid-cols-2 xl:grid-cols-3 gap-3">
+                        {entries.map(entry => (
+                            <TicketCard key={entry.id} entry={entry} />
+                        ))}
+                    </div>
+                    {nextCursor && (
+                        <div className="flex justify-center mt-4">
+                            <button
+                                onClick={loadMore}
+                                disabled={loadingMore}
+                                className="flex items-center gap-1.5 px-4 py-2 rounded-lg bg-white/5 hover:bg-white/10 border border-white/10 text-xs text-slate-300 transition-colors disabled:opacity-40"
+                            >
+                                {loadingMore && <Loader2 className="w-3.5 h-3.5 animate-spin" />}
+                                Load more
+                            </button>
+                        </div>
+                    )}
+                </>
             )}
         </div>
     );
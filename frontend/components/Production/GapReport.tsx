@@ -61,10 +61,12 @@ interface GapReportProps {
 type SprintTab = 'todo' | 'in_progress' | 'done' | null;
 
 interface FilePreview {
-    path:    string;
-    content: string | null;
-    loading: boolean;
-    error:   string | null;
+    path:       string;
+    content:    string | null;
+    loading:    boolean;
+    error:      string | null;
+    truncated?: boolean;
+    binary?:    boolean;
 }
 
 const GAP_META = {
@@ -273,7 +275,15 @@ const CodePanel: React.FC<{
                         </div>
                     </div>
                 )}
-                {!preview.loading && !preview.error && preview.content !== null && (
+                {!preview.loading && !preview.error && preview.binary && (
+                    <p className="p-4 text-xs text-slate-500">Binary file — no preview available.</p>
+                )}
+                {!preview.loading && !preview.error && preview.truncated && (
+                    <p className="px-4 py-1.5 text-[10px] text-amber-300/80 border-b border-white/5 bg-amber-500/5">
+                        Large file — only the beginning is shown.
+                    </p>
+                )}
+                {!preview.loading && !preview.error && !preview.binary && preview.content !== null && (
                     <table className="w-full text-xs font-mono leading-5">
                         <tbody>
                             {lines.map((line, i) => (
@@ -522,7 +532,10 @@ const GapReport: React.FC<GapReportProps> = ({ repoOwner, repoName, onSkip, onEv
         try {
             const token = authUtils.getToken();
             const res   = await apiService.getFileContent(repoOwner, repoName, filePath, token!);
-            setFilePreview({ path: filePath, content: res.content, loading: false, error: null });
+            setFilePreview({
+                path: filePath, content: res.content, loading: false, error: null,
+                truncated: res.truncated, binary: res.binary,
+            });
         } catch (err: any) {
             const msg = err.response?.data?.detail || err.message || 'Failed to load file';
             setFilePreview({ path: filePath, content: null, loading: false, error: msg });
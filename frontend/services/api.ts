@@ -96,8 +96,17 @@ class ApiService {
         return (await apiClient.post('/api/level1/jira/create-ticket', payload)).data;
     }
 
-    async getAutomationLibrary(): Promise<{ entries: AutomationLibraryEntry[]; total: number }> {
-        return (await apiClient.get('/api/level1/jira/library')).data;
+    async getAutomationLibrary(params: {
+        cursor?: string | null;
+        status?: string;
+        q?: string;
+        limit?: number;
+    } = {}): Promise<{ entries: AutomationLibraryEntry[]; next_cursor: string | null }> {
+        return (await apiClient.get('/api/level1/jira/library', { params })).data;
+    }
+
+    async getAutomationLibraryCount(q?: string): Promise<{ total: number; by_status: Record<string, number> }> {
+        return (await apiClient.get('/api/level1/jira/library/count', { params: q ? { q } : {} })).data;
     }
 
     async syncLibraryStatuses(): Promise<{ synced: number; entries: { id: number; ticket_key: string; jira_status: string }[] }> {
@@ -144,7 +153,7 @@ class ApiService {
         return (await apiClient.get(`/api/production/repository/${owner}/${repo}/tree`, { params: { token } })).data;
     }
 
-    async getFileContent(owner: string, repo: string, path: string, token: string): Promise<{ content: string; path: string }> {
+    async getFileContent(owner: string, repo: string, path: string, token: string): Promise<{ content: string; path: string; truncated: boolean; binary: boolean }> {
         return (await apiClient.get(`/api/production/repository/${owner}/${repo}/file`, { params: { path, token } })).data;
     }
 